@@ -1,30 +1,37 @@
 from __future__ import annotations
 
-import json
+import importlib.util
 import os
+import sys
+import threading
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional
 
 ApprovalStatus = Literal["approved", "rejected"]
 
 
-def _utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
+def _load_sibling(module_name: str):
+    """Load a module that lives next to this file (the gateway is not a package)."""
+    qualified = f"approval_gateway_{module_name}"
+    module = sys.modules.get(qualified)
+    if module is not None:
+        return module
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"{module_name}.py")
+    spec = importlib.util.spec_from_file_location(qualified, path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"failed to load module: {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[qualified] = module
+    spec.loader.exec_module(module)
+    return module
 
 
-def _atomic_write_json(path: str, payload: Any) -> None:
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    tmp_path = f"{path}.tmp"
-    with open(tmp_path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2, sort_keys=True)
-    os.replace(tmp_path, path)
+_storage = _load_sibling("storage")
+ApprovalStore = _storage.ApprovalStore
 
 
-def _read_json_or_default(path: str, default: Any) -> Any:
-    if not os.path.exists(path):
-        return default
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
 
 
 class ApprovalGateway:
@@ -33,12 +40,20 @@ class ApprovalGateway:
     - Records approvals/rejections for proposed actions.
     - Stores metadata only (who/when/what).
     - No execution implied.
+    - Records live in an `ApprovalStore` (storage.py): by default a SQLite
+      database at data/approvals.sqlite3; a `storage_path` ending in `.json`
+      keeps the JSON file ledger, and `store` plugs in any other backend. A
+      legacy approvals.json next to the default database is migrated into it
+      on first use.
     """
 
-    def __init__(self, storage_path: Optional[str] = None) -> None:
+    _migration_lock = threading.Lock()
+
+    def __init__(self, storage_path: Optional[str] = None, *, store: Optional[ApprovalStore] = None) -> None:
         if storage_path is None:
-            storage_path = os.path.join(os.path.dirname(__file__), "data", "approvals.json")
+            storage_path = os.path.join(os.path.dirname(__file__), "data", "approvals.sqlite3")
         self._storage_path = storage_path
+        self._store = store
 
     def register_approval(self, incident_id: str, action_id: str, approver: str) -> Dict[str, Any]:
         return self._record(
@@ -57,13 +72,23 @@ class ApprovalGateway:
         )
 
     def list_approvals(self, incident_id: str) -> List[Dict[str, Any]]:
-        store = self._load_store()
-        entries = store.get(incident_id, [])
-        if not isinstance(entries, list):
-            raise ValueError("approval store corrupted: expected list")
         # Stable ordering: recorded_at asc
-        entries.sort(key=lambda e: e.get("recorded_at") or "")
-        return entries
+        return self.store().by_incident(incident_id)
+
+    def list_approved(self, action_ids: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Approved actions of every incident (only `action_ids`, when given), in the order they were recorded."""
+        return self.store().approved(action_ids)
+
+    def store(self) -> ApprovalStore:
+        """The ledger backend, after migrating a legacy approvals.json next to a SQLite database."""
+        if self._store is None:
+            store = _storage.open_store(self._storage_path)
+            legacy_path = os.path.join(os.path.dirname(self._storage_path), "approvals.json")
+            if isinstance(store, _storage.SqliteApprovalStore) and os.path.exists(legacy_path):
+                with self._migration_lock:
+                    _storage.migrate_json(legacy_path, store)
+            self._store = store
+        return self._store
 
     def _record(self, *, incident_id: str, action_id: str, approver: str, status: ApprovalStatus) -> Dict[str, Any]:
         if not incident_id or not isinstance(incident_id, str):
@@ -81,16 +106,5 @@ class ApprovalGateway:
             "status": status,
         }
 
-        store = self._load_store()
-        store.setdefault(incident_id, []).append(entry)
-        self._save_store(store)
+        self.store().append(entry)
         return entry
-
-    def _load_store(self) -> Dict[str, Any]:
-        payload = _read_json_or_default(self._storage_path, default={})
-        if not isinstance(payload, dict):
-            raise ValueError("approval store corrupted: expected dict")
-        return payload
-
-    def _save_store(self, store: Dict[str, Any]) -> None:
-        _atomic_write_json(self._storage_path, store)
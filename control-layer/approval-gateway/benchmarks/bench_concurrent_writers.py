@@ -0,0 +1,137 @@
+"""Concurrent writers on the JSON approval ledger: legacy rewrite vs `JsonLedger`.
+
+`--writers` threads (then as many processes) each record `--records`
+approvals at the same time into one `approvals.json`:
+
+- legacy: the former `ApprovalGateway._record` (load, append, rewrite through
+  a shared `<path>.tmp`).
+- ledger: `ApprovalGateway` on a `.json` path (`JsonApprovalStore`: locked,
+  group-committed `JsonLedger` writes).
+
+Reports writes/sec, failed writes and lost records (acknowledged but missing
+from the file afterwards, or the whole file when it no longer parses); the
+ledger must lose none.
+
+Usage: python bench_concurrent_writers.py [--writers 32] [--records 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from bench_storage import _load_gateway
+
+
+def _legacy_record(path: str, entry: dict) -> None:
+    store = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            store = json.load(f)
+    store.setdefault(entry["incident_id"], []).append(entry)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(store, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _write(mode: str, path: str, writer: int, records: int, start) -> int:
+    """Record `records` approvals as writer `writer`; returns how many were acknowledged."""
+    gateway = _load_gateway().ApprovalGateway(path) if mode == "ledger" else None
+    start.wait()
+    acknowledged = 0
+    for i in range(records):
+        incident_id, action_id = f"inc-{i % 10:03d}", f"w{writer:03d}-{i:05d}"
+        try:
+            if gateway is not None:
+                gateway.register_approval(incident_id, action_id, "bench")
+            else:
+                _legacy_record(
+                    path,
+                    {
+                        "incident_id": incident_id,
+                        "action_id": action_id,
+                        "approver": "bench",
+                        "recorded_at": time.time(),
+                        "status": "approved",
+                    },
+                )
+            acknowledged += 1
+        except (OSError, ValueError):
+            pass  # FileNotFoundError from a stolen tmp file, JSONDecodeError from a torn read
+    return acknowledged
+
+
+def _process_writer(mode: str, path: str, writer: int, records: int, start, results) -> None:
+    results.put(_write(mode, path, writer, records, start))
+
+
+def _run(mode: str, kind: str, path: str, writers: int, records: int):
+    if kind == "threads":
+        start = threading.Barrier(writers)
+        counts = [0] * writers
+
+        def worker(n: int) -> None:
+            counts[n] = _write(mode, path, n, records, start)
+
+        workers = [threading.Thread(target=worker, args=(n,)) for n in range(writers)]
+    else:
+        start = multiprocessing.Barrier(writers)
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(target=_process_writer, args=(mode, path, n, records, start, results))
+            for n in range(writers)
+        ]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    if kind == "processes":
+        counts = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            stored = sum(len(entries) for entries in json.load(f).values())
+    except ValueError:
+        stored = None  # writers interleaved inside the shared temp file: the ledger no longer parses
+    return sum(counts), stored, elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=32)
+    parser.add_argument("--records", type=int, default=50)
+    args = parser.parse_args()
+    _load_gateway()
+    storage = sys.modules["approval_gateway_storage"]
+    attempted = args.writers * args.records
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind in ("threads", "processes"):
+            for mode in ("legacy", "ledger"):
+                path = os.path.join(tmp, f"{kind}-{mode}", "approvals.json")
+                os.makedirs(os.path.dirname(path))
+                acknowledged, stored, elapsed = _run(mode, kind, path, args.writers, args.records)
+                lost = f"{acknowledged - stored} lost records" if stored is not None else "ledger file corrupted"
+                line = (
+                    f"{mode:<6} {kind:<9}: {args.writers} writers x {args.records} records in {elapsed:.2f}s "
+                    f"({acknowledged / elapsed:,.0f} writes/s); {attempted - acknowledged} failed writes, {lost}"
+                )
+                if mode == "ledger":
+                    assert acknowledged == stored == attempted, (acknowledged, stored, attempted)
+                    if kind == "threads":
+                        stats = storage.JsonLedger.shared(path).stats()
+                        line += f"; {stats['commits']} commits, {stats['fsyncs']} fsyncs, {stats['parses']} parses"
+                print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,124 @@
+"""Approval ledger storage: JSON file vs SQLite (WAL) at scale.
+
+Loads `--records` approvals (10 per incident, three actions in four approved)
+into a SQLite store and `--json-records` into a JSON ledger, then measures
+through `ApprovalGateway`:
+
+- insert: `register_approval` latency on the full ledger (p50/p99).
+- list: `list_approvals` latency for random incidents (p50/p99).
+- scan: `list_approved` for the orchestrator's actions (run_once's read).
+
+Finally migrates the JSON ledger into an empty database with `migrate_json`
+and checks every record arrived once. The JSON ledger is smaller because each
+of its inserts rewrites the whole file.
+
+Usage: python bench_storage.py [--records 1000000] [--json-records 20000] [--samples 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+ACTIONS = ("revoke_sessions", "disable_identity", "remove_role", "notify_owner")
+SUPPORTED = ("revoke_sessions", "disable_identity", "remove_role")
+
+
+def _load_gateway():
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "approval_gateway.py")
+    spec = importlib.util.spec_from_file_location("approval_gateway", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["approval_gateway"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _entries(count: int, start: int = 0):
+    epoch = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(start, start + count):
+        yield {
+            "incident_id": f"inc-{i // 10:07d}",
+            "action_id": ACTIONS[i % len(ACTIONS)],
+            "approver": f"opaque://identity/approver-{i % 7}",
+            "recorded_at": (epoch + timedelta(milliseconds=i)).isoformat(),
+            "status": "rejected" if i % 4 == 3 else "approved",
+        }
+
+
+def _load(store, count: int, chunk: int = 10_000) -> float:
+    started = time.perf_counter()
+    entries = _entries(count)
+    while True:
+        batch = [entry for _, entry in zip(range(chunk), entries)]
+        if not batch:
+            break
+        store.append_many(batch)
+    return time.perf_counter() - started
+
+
+def _latencies(call, samples: int):
+    timings = []
+    for n in range(samples):
+        started = time.perf_counter()
+        call(n)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return statistics.median(timings), timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+
+
+def _measure(name: str, gateway, records: int, samples: int) -> None:
+    incidents = records // 10
+    rng = random.Random(7)
+    p50, p99 = _latencies(lambda n: gateway.register_approval(f"inc-new-{n}", "revoke_sessions", "bench"), samples)
+    print(f"{name:<7} insert : p50 {p50 * 1e3:8.3f} ms, p99 {p99 * 1e3:8.3f} ms ({records:,} records)")
+    p50, p99 = _latencies(lambda n: gateway.list_approvals(f"inc-{rng.randrange(incidents):07d}"), samples)
+    print(f"{name:<7} list   : p50 {p50 * 1e3:8.3f} ms, p99 {p99 * 1e3:8.3f} ms")
+    started = time.perf_counter()
+    approved = sum(1 for _ in gateway.list_approved(SUPPORTED))
+    print(f"{name:<7} scan   : {approved:,} approved actions in {time.perf_counter() - started:.2f}s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--json-records", type=int, default=20_000)
+    parser.add_argument("--samples", type=int, default=2000)
+    args = parser.parse_args()
+    mod = _load_gateway()
+    storage = sys.modules["approval_gateway_storage"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = storage.SqliteApprovalStore(os.path.join(tmp, "sqlite", "approvals.sqlite3"))
+        elapsed = _load(store, args.records)
+        print(f"sqlite  load   : {args.records:,} records in {elapsed:.1f}s ({args.records / elapsed:,.0f}/s)")
+        _measure("sqlite", mod.ApprovalGateway(store=store), args.records, args.samples)
+        store.close()
+
+        json_path = os.path.join(tmp, "json", "approvals.json")
+        store = storage.JsonApprovalStore(json_path)
+        elapsed = _load(store, args.json_records, chunk=args.json_records)
+        print(f"json    load   : {args.json_records:,} records in {elapsed:.1f}s")
+        _measure("json", mod.ApprovalGateway(json_path), args.json_records, max(1, args.samples // 10))
+
+        total = args.json_records + max(1, args.samples // 10)
+        started = time.perf_counter()
+        gateway = mod.ApprovalGateway(os.path.join(tmp, "json", "approvals.sqlite3"))
+        migrated = len(gateway.store())
+        elapsed = time.perf_counter() - started
+        assert migrated == total and not os.path.exists(json_path), (migrated, total)
+        assert storage.migrate_json(json_path, gateway.store()) == 0
+        assert len(gateway.list_approvals("inc-0000001")) == 10
+        print(f"migrate        : {migrated:,} JSON records into SQLite in {elapsed:.2f}s, rerun is a no-op")
+        gateway.store().close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,477 @@
+"""Storage backends for the approval ledger.
+
+`ApprovalGateway` keeps its records in an `ApprovalStore`:
+
+- `SqliteApprovalStore` (default, `data/approvals.sqlite3`): one row per
+  approval in a SQLite database in WAL mode, so readers never block the
+  writer and a record costs one small transaction instead of a rewrite of the
+  whole ledger. Indexes on `(incident_id, recorded_at)` serve
+  `list_approvals` in order and `(status, action_id)` serves the
+  orchestrator's scan for approved actions.
+- `JsonApprovalStore` (`storage_path` ending in `.json`): the original
+  `{incident_id: [entry, ...]}` file, rewritten through a `JsonLedger`:
+  group-committed, locked across processes, with a private temp file per
+  commit, so concurrent writers neither lose records nor clobber each other.
+
+`migrate_json(json_path, store)` copies a JSON ledger into a store once; the
+gateway runs it on first use when a legacy `approvals.json` sits next to the
+database, and `python storage.py` runs it by hand.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: ledger commits and migrations are not serialized across processes
+    fcntl = None
+
+T = TypeVar("T")
+
+
+def _load_incident_coordinator():
+    """The incident coordinator module, whose atomic-rewrite helpers the JSON ledger shares."""
+    module = sys.modules.get("incident_coordinator")
+    if module is not None:
+        return module
+    control_layer = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    path = os.path.join(control_layer, "incident-coordinator", "incident_coordinator.py")
+    spec = importlib.util.spec_from_file_location("incident_coordinator", path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"failed to load module: {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["incident_coordinator"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+_coordinator = _load_incident_coordinator()
+
+FIELDS = ("incident_id", "action_id", "approver", "recorded_at", "status")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS approvals (
+    id INTEGER PRIMARY KEY,
+    incident_id TEXT NOT NULL,
+    action_id TEXT NOT NULL,
+    approver TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS approvals_incident_recorded ON approvals (incident_id, recorded_at);
+CREATE INDEX IF NOT EXISTS approvals_status_action ON approvals (status, action_id);
+CREATE TABLE IF NOT EXISTS migrations (
+    source TEXT PRIMARY KEY,
+    records INTEGER NOT NULL
+);
+"""
+
+
+class ApprovalStore:
+    """Interface of an approval ledger backend (records are dicts with `FIELDS`)."""
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        self.append_many([entry])
+
+    def append_many(self, entries: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def by_incident(self, incident_id: str) -> List[Dict[str, Any]]:
+        """Records of `incident_id`, oldest `recorded_at` first."""
+        raise NotImplementedError
+
+    def approved(self, action_ids: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Records with status `approved` (of `action_ids`, when given), in the order they were recorded."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class JsonApprovalStore(ApprovalStore):
+    """`{incident_id: [entry, ...]}` in one JSON file, written through a `JsonLedger`."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._ledger = JsonLedger.shared(path)
+
+    def append_many(self, entries: List[Dict[str, Any]]) -> None:
+        entries = [dict(entry) for entry in entries]
+
+        def append(store: Dict[str, Any]) -> None:
+            for entry in entries:
+                incident_entries = store.setdefault(entry["incident_id"], [])
+                if not isinstance(incident_entries, list):
+                    raise ValueError("approval store corrupted: expected list")
+                incident_entries.append(entry)
+
+        self._ledger.update(append)
+
+    def by_incident(self, incident_id: str) -> List[Dict[str, Any]]:
+        def copy(store: Dict[str, Any]) -> List[Dict[str, Any]]:
+            entries = store.get(incident_id, [])
+            if not isinstance(entries, list):
+                raise ValueError("approval store corrupted: expected list")
+            return [dict(entry) for entry in entries]
+
+        entries = self._ledger.read(copy)
+        # Stable ordering: recorded_at asc
+        entries.sort(key=lambda e: e.get("recorded_at") or "")
+        return entries
+
+    def approved(self, action_ids: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        wanted = set(action_ids) if action_ids is not None else None
+
+        def select(store: Dict[str, Any]) -> List[Dict[str, Any]]:
+            return [
+                dict(entry)
+                for entries in store.values()
+                if isinstance(entries, list)
+                for entry in entries
+                if isinstance(entry, dict)
+                and entry.get("status") == "approved"
+                and (wanted is None or entry.get("action_id") in wanted)
+            ]
+
+        return iter(self._ledger.read(select))
+
+
+class JsonLedger:
+    """One JSON document updated by many threads and processes without lost updates.
+
+    - `update(change)` queues `change(document)` and returns once it is on
+      disk. Changes are group-committed: the writer that finds no commit in
+      progress applies every change queued so far and writes the document
+      once, so concurrent updates share one write and one fsync. While the
+      previous commit carried more than one change, it first waits
+      `commit_delay` seconds for company; a writer that is alone in its
+      process commits at once. A change that raises fails only its own
+      `update`; the rest of the group is still written.
+    - A commit holds an advisory lock on `<path>.lock` (`fcntl`) from reading
+      the document to replacing it, so writers in other processes never
+      overwrite each other's changes.
+    - The document is written to a temp file of its own, fsync'ed and renamed
+      over `path`, so readers see the old or the new document, never a torn
+      one, and no two writers share a temp file.
+    - The parsed document is cached and reused while the file is unchanged
+      (same inode, size and mtime), so commits and `read` skip the parse when
+      no other process wrote in between.
+
+    Use `JsonLedger.shared(path)` so every user of `path` in the process joins
+    the same group commits.
+    """
+
+    _registry: Dict[str, "JsonLedger"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, path: str, *, fsync: bool = True, commit_delay: float = 0.002) -> None:
+        self.path = path
+        self.fsync = fsync
+        self.commit_delay = commit_delay
+        self._commit = threading.Condition(threading.Lock())
+        self._pending: List[Callable[[Any], None]] = []
+        self._enqueued = 0
+        self._committed = 0
+        self._committing = False
+        self._last_batch = 0
+        self._failures: Dict[int, BaseException] = {}
+        self._cache_lock = threading.Lock()
+        self._document: Any = None
+        self._identity: Optional[Tuple[int, int, int]] = None
+        self._stats = {"updates": 0, "commits": 0, "fsyncs": 0, "parses": 0}
+
+    @classmethod
+    def shared(cls, path: str) -> "JsonLedger":
+        """The process-wide ledger for `path` (created on first use)."""
+        key = os.path.abspath(path)
+        with cls._registry_lock:
+            ledger = cls._registry.get(key)
+            if ledger is None:
+                ledger = cls._registry[key] = cls(path)
+            return ledger
+
+    def update(self, change: Callable[[Any], None]) -> None:
+        """Apply `change` to the document (a dict) and persist it; raises if the commit failed."""
+        with self._commit:
+            self._pending.append(change)
+            self._enqueued += 1
+            ticket = self._enqueued
+            while self._committed < ticket:
+                if not self._committing:
+                    self._write_pending()
+                else:
+                    self._commit.wait()
+            failure = self._failures.pop(ticket, None)
+        if failure is not None:
+            raise failure
+
+    def read(self, view: Callable[[Any], T]) -> T:
+        """`view(document)` on the current document; `view` must copy what it keeps."""
+        with self._cache_lock:
+            return view(self._current())
+
+    def stats(self) -> Dict[str, int]:
+        with self._commit:
+            return dict(self._stats)
+
+    def _write_pending(self) -> None:
+        # Called with `_commit` held; releases it while waiting for company and during I/O.
+        self._committing = True
+        if self.commit_delay and self._last_batch > 1:
+            # Writers arrived together last time: give them a moment to join this commit.
+            self._commit.release()
+            time.sleep(self.commit_delay)
+            self._commit.acquire()
+        batch, self._pending = self._pending, []
+        first, last = self._committed + 1, self._enqueued
+        self._commit.release()
+        failure: Optional[BaseException] = None
+        rejected: Dict[int, BaseException] = {}
+        try:
+            rejected = self._apply(batch)
+        except BaseException as exc:
+            failure = exc
+        finally:
+            self._commit.acquire()
+            self._committing = False
+            self._committed = last
+            if failure is not None:
+                for ticket in range(first, last + 1):
+                    self._failures[ticket] = failure
+            for position, exc in rejected.items():
+                self._failures[first + position] = exc
+            self._last_batch = len(batch)
+            self._stats["updates"] += len(batch)
+            self._stats["commits"] += 1
+            self._commit.notify_all()
+
+    def _apply(self, batch: List[Callable[[Any], None]]) -> Dict[int, BaseException]:
+        """Commit `batch`; returns the error of each change that raised, by position."""
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with open(f"{self.path}.lock", "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)  # released when the lock file is closed
+            with self._cache_lock:
+                return self._replace(batch, directory)
+
+    def _replace(self, batch: List[Callable[[Any], None]], directory: str) -> Dict[int, BaseException]:
+        # Called with the file lock and `_cache_lock` held.
+        fd, tmp_path = _coordinator.open_temp_file(self.path)
+        try:
+            document = self._current()
+            self._document = self._identity = None  # changed in place below; re-cached once written
+            applied: List[Callable[[Any], None]] = []
+            rejected: Dict[int, BaseException] = {}
+            for position, change in enumerate(batch):
+                try:
+                    change(document)
+                except Exception as exc:
+                    # Only this update fails. It may have changed the document
+                    # before raising, so rebuild it from the file and the
+                    # changes that did apply.
+                    rejected[position] = exc
+                    document = self._current()
+                    self._document = self._identity = None
+                    for done in applied:
+                        done(document)
+                else:
+                    applied.append(change)
+            if not applied:
+                return rejected
+            data = json.dumps(document, sort_keys=True, separators=(",", ":")).encode("utf-8")
+            with os.fdopen(fd, "wb") as f:
+                fd = -1
+                f.write(data)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            if self.fsync and hasattr(os, "O_DIRECTORY"):
+                dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+            self._stats["fsyncs"] += 1 if self.fsync else 0
+            self._document, self._identity = document, _identity(os.stat(self.path))
+            return rejected
+        finally:
+            if fd >= 0:
+                os.close(fd)
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def _current(self) -> Any:
+        # Called with `_cache_lock` held.
+        try:
+            identity = _identity(os.stat(self.path))
+        except FileNotFoundError:
+            return {}
+        if identity != self._identity or self._document is None:
+            self._document, self._identity = _read_document(self.path), identity
+            self._stats["parses"] += 1
+        return self._document
+
+
+class SqliteApprovalStore(ApprovalStore):
+    """Approvals in a SQLite database (WAL), over a pool of connections shared by threads.
+
+    `synchronous=NORMAL`: a commit survives a crash of the process; only an OS
+    crash or power loss can drop the last transactions.
+    """
+
+    _INSERT = "INSERT INTO approvals (incident_id, action_id, approver, recorded_at, status) VALUES (?, ?, ?, ?, ?)"
+    _COLUMNS = "SELECT incident_id, action_id, approver, recorded_at, status FROM approvals"
+
+    def __init__(self, path: str, *, busy_timeout: float = 30.0) -> None:
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._idle: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    def append_many(self, entries: List[Dict[str, Any]]) -> None:
+        if not entries:
+            return
+        with self._connection() as conn, conn:
+            conn.executemany(self._INSERT, [tuple(entry[field] for field in FIELDS) for entry in entries])
+
+    def by_incident(self, incident_id: str) -> List[Dict[str, Any]]:
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"{self._COLUMNS} WHERE incident_id = ? ORDER BY recorded_at, id", (incident_id,)
+            ).fetchall()
+        return [dict(zip(FIELDS, row)) for row in rows]
+
+    def approved(self, action_ids: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        query = f"{self._COLUMNS} WHERE status = 'approved'"
+        params: List[str] = []
+        if action_ids is not None:
+            params = sorted(set(action_ids))
+            if not params:
+                return
+            query += f" AND action_id IN ({', '.join('?' * len(params))})"
+        with self._connection() as conn:
+            for row in conn.execute(f"{query} ORDER BY id", params):
+                yield dict(zip(FIELDS, row))
+
+    def import_entries(self, source: str, entries: List[Dict[str, Any]]) -> int:
+        """Insert `entries` and mark `source` as migrated, in one transaction (no-op if already marked)."""
+        with self._connection() as conn, conn:
+            if conn.execute("SELECT 1 FROM migrations WHERE source = ?", (source,)).fetchone() is not None:
+                return 0
+            conn.executemany(self._INSERT, [tuple(entry[field] for field in FIELDS) for entry in entries])
+            conn.execute("INSERT INTO migrations (source, records) VALUES (?, ?)", (source, len(entries)))
+        return len(entries)
+
+    def __len__(self) -> int:
+        with self._connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM approvals").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    @contextlib.contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                self._idle.append(conn)
+
+
+def open_store(path: str) -> ApprovalStore:
+    """`JsonApprovalStore` for `*.json` paths, `SqliteApprovalStore` otherwise."""
+    if path.endswith(".json"):
+        return JsonApprovalStore(path)
+    return SqliteApprovalStore(path)
+
+
+def migrate_json(json_path: str, store: ApprovalStore) -> int:
+    """Copy the JSON ledger at `json_path` into `store`; returns the number of records copied.
+
+    One-shot: the JSON file is renamed to `<json_path>.migrated` afterwards, so
+    running it again (or from another process) is a no-op. Into a SQLite
+    store, the copy and its migration mark commit together, so an interrupted
+    migration neither loses nor duplicates records.
+    """
+    if not os.path.exists(json_path):
+        return 0
+    with open(f"{json_path}.lock", "a") as lock:
+        # Serializes migrations across processes; the loser finds the file gone.
+        if fcntl is not None:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        if not os.path.exists(json_path):
+            return 0
+        entries: List[Dict[str, Any]] = []
+        for incident_id, incident_entries in _read_document(json_path).items():
+            if not isinstance(incident_entries, list):
+                continue
+            ordered = sorted(
+                (e for e in incident_entries if isinstance(e, dict)), key=lambda e: e.get("recorded_at") or ""
+            )
+            for entry in ordered:
+                entries.append({field: str(entry.get(field) or "") for field in FIELDS})
+                entries[-1]["incident_id"] = incident_id
+        if isinstance(store, SqliteApprovalStore):
+            copied = store.import_entries(os.path.abspath(json_path), entries)
+        else:
+            store.append_many(entries)
+            copied = len(entries)
+        os.replace(json_path, f"{json_path}.migrated")
+        return copied
+
+
+def _read_document(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    if not isinstance(payload, dict):
+        raise ValueError("approval store corrupted: expected dict")
+    return payload
+
+
+def _identity(stat: os.stat_result) -> Tuple[int, int, int]:
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Migrate approvals.json into the SQLite approval store")
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+    parser.add_argument("--legacy", default=os.path.join(data_dir, "approvals.json"))
+    parser.add_argument("--db", default=os.path.join(data_dir, "approvals.sqlite3"))
+    args = parser.parse_args()
+    store = SqliteApprovalStore(args.db)
+    try:
+        copied = migrate_json(args.legacy, store)
+        print(json.dumps({"migrated": copied, "db": args.db, "records": len(store)}))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""`JsonLedger` and the JSON approval store: no update is lost, whoever writes."""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from bench_storage import _load_gateway  # noqa: E402
+
+gateway = _load_gateway()
+storage = gateway._storage
+
+
+def _append(key, value):
+    def change(document):
+        document.setdefault(key, []).append(value)
+
+    return change
+
+
+def _update_from_process(path, writer, count, start):
+    ledger = storage.JsonLedger.shared(path)
+    start.wait()
+    for n in range(count):
+        ledger.update(_append("records", f"p{writer}-{n}"))
+
+
+def _approve_from_process(path, writer, count, start):
+    approvals = gateway.ApprovalGateway(path)
+    start.wait()
+    for n in range(count):
+        approvals.register_approval(f"inc-{n % 3}", f"w{writer}-{n}", "tester")
+
+
+def _run_processes(target, path, processes, count):
+    start = multiprocessing.Barrier(processes)
+    workers = [multiprocessing.Process(target=target, args=(path, n, count, start)) for n in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+
+def _document(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_concurrent_threads_lose_no_update(tmp_path):
+    path = str(tmp_path / "ledger.json")
+    ledger = storage.JsonLedger(path)
+    threads, per_thread = 16, 20
+    start = threading.Barrier(threads)
+
+    def write(writer):
+        start.wait()
+        for n in range(per_thread):
+            ledger.update(_append("records", f"t{writer}-{n}"))
+
+    workers = [threading.Thread(target=write, args=(n,)) for n in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    expected = {f"t{w}-{n}" for w in range(threads) for n in range(per_thread)}
+    assert sorted(_document(path)["records"]) == sorted(expected)
+    stats = ledger.stats()
+    assert stats["updates"] == len(expected) and stats["commits"] < len(expected)  # group-committed
+
+
+def test_concurrent_processes_lose_no_update(tmp_path):
+    path = str(tmp_path / "ledger.json")
+    _run_processes(_update_from_process, path, processes=4, count=25)
+
+    records = _document(path)["records"]
+    assert sorted(records) == sorted(f"p{w}-{n}" for w in range(4) for n in range(25))
+    assert not [name for name in os.listdir(tmp_path) if name not in ("ledger.json", "ledger.json.lock")]
+
+
+def test_json_approval_store_across_processes(tmp_path):
+    path = str(tmp_path / "approvals.json")
+    _run_processes(_approve_from_process, path, processes=4, count=15)
+
+    approvals = gateway.ApprovalGateway(path)
+    recorded = [entry["action_id"] for n in range(3) for entry in approvals.list_approvals(f"inc-{n}")]
+    assert sorted(recorded) == sorted(f"w{w}-{n}" for w in range(4) for n in range(15))
+
+
+def test_failing_change_fails_only_its_own_update(tmp_path):
+    path = str(tmp_path / "ledger.json")
+    ledger = storage.JsonLedger(path, commit_delay=0.05)
+    ledger.update(_append("records", "first"))
+    ledger.update(_append("records", "second"))  # the next commit waits for company
+    start = threading.Barrier(3)
+    errors = {}
+
+    def broken(document):
+        document["records"].append("half-applied")
+        raise ValueError("rejected")
+
+    def write(name, change):
+        start.wait()
+        try:
+            ledger.update(change)
+        except ValueError as exc:
+            errors[name] = exc
+
+    workers = [
+        threading.Thread(target=write, args=("ok-1", _append("records", "third"))),
+        threading.Thread(target=write, args=("broken", broken)),
+        threading.Thread(target=write, args=("ok-2", _append("records", "fourth"))),
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert list(errors) == ["broken"]
+    assert sorted(_document(path)["records"]) == ["first", "fourth", "second", "third"]
+    assert ledger.read(lambda document: sorted(document["records"])) == ["first", "fourth", "second", "third"]
+
+
+def test_lone_writer_does_not_wait_for_company(tmp_path):
+    ledger = storage.JsonLedger(str(tmp_path / "ledger.json"), commit_delay=1.0)
+    started = time.monotonic()
+    for n in range(5):
+        ledger.update(_append("records", n))
+    assert time.monotonic() - started < 1.0
+
+
+@pytest.mark.skipif(not hasattr(os, "fchmod"), reason="POSIX file modes")
+def test_rewrite_keeps_the_file_mode(tmp_path):
+    path = str(tmp_path / "ledger.json")
+    ledger = storage.JsonLedger(path)
+    ledger.update(_append("records", 1))
+    os.chmod(path, 0o640)
+
+    ledger.update(_append("records", 2))
+    assert os.stat(path).st_mode & 0o777 == 0o640
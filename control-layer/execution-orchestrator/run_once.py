@@ -3,6 +3,7 @@ from __future__ import annotations
 import importlib.util
 import json
 import os
+import sys
 from typing import Any, Dict, List, Optional
 
 
@@ -22,6 +23,19 @@ def _load_adapter(adapter_path: str):
     return module
 
 
+def _load_approval_gateway(gateway_path: str):
+    module = sys.modules.get("approval_gateway")
+    if module is not None:
+        return module
+    spec = importlib.util.spec_from_file_location("approval_gateway", gateway_path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError("failed to load approval gateway")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["approval_gateway"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
 def execute_approved_actions_once(
     *,
     midpoint_base_url: str,
@@ -31,17 +45,18 @@ def execute_approved_actions_once(
     """One-way orchestration path: approval -> execution.
 
     - Execution happens only after approval.
-    - No retries/no loops beyond processing the current ledger snapshot.
+    - No retries/no loops beyond processing the current ledger snapshot
+      (transient midPoint failures are retried by the adapter's transport).
     - No background jobs.
     """
 
     repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 
-    approvals_path = os.path.join(repo_root, "control-layer", "approval-gateway", "data", "approvals.json")
+    gateway_path = os.path.join(repo_root, "control-layer", "approval-gateway", "approval_gateway.py")
     incidents_path = os.path.join(repo_root, "control-layer", "incident-coordinator", "data", "incidents.json")
     adapter_path = os.path.join(repo_root, "integrations", "identity-governance-adapter", "client.py")
 
-    approvals_by_incident = _load_json(approvals_path, default={})
+    approvals = _load_approval_gateway(gateway_path).ApprovalGateway()
     incidents_by_id = _load_json(incidents_path, default={})
 
     adapter_module = _load_adapter(adapter_path)
@@ -49,15 +64,14 @@ def execute_approved_actions_once(
         base_url=midpoint_base_url,
         username=midpoint_username,
         password=midpoint_password,
-        max_attempts=1,
     )
 
     supported = {"revoke_sessions", "disable_identity", "remove_role"}
-    results: List[Dict[str, Any]] = []
+    requests: List[Dict[str, Any]] = []
 
-    for incident_id, entries in approvals_by_incident.items():
-        if not isinstance(entries, list):
-            continue
+    # Approved, supported actions only, read through the ledger's (status, action_id) index.
+    for entry in approvals.list_approved(sorted(supported)):
+        incident_id = entry["incident_id"]
         incident = incidents_by_id.get(incident_id)
         if not isinstance(incident, dict):
             continue
@@ -65,31 +79,25 @@ def execute_approved_actions_once(
         if not isinstance(identity_ref, str) or not identity_ref:
             continue
 
-        for entry in entries:
-            if not isinstance(entry, dict):
-                continue
-            if entry.get("status") != "approved":
-                continue
-
-            action_id = entry.get("action_id")
-            if action_id not in supported:
-                continue
-
-            exec_result = adapter.execute(
-                incident_id=incident_id,
-                action_id=action_id,
-                identity_ref=identity_ref,
-                parameters={},
-            )
-            results.append(
-                {
-                    "incident_id": incident_id,
-                    "action_id": action_id,
-                    "execution": exec_result,
-                }
-            )
-
-    return results
+        requests.append(
+            {
+                "incident_id": incident_id,
+                "action_id": entry["action_id"],
+                "identity_ref": identity_ref,
+                "parameters": {},
+            }
+        )
+
+    # Identities are contained in parallel; actions on one identity keep ledger order.
+    results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+    for done in adapter.execute_many(requests):
+        results[done["index"]] = {
+            "incident_id": done["incident_id"],
+            "action_id": done["action_id"],
+            "execution": done["result"],
+        }
+
+    return [result for result in results if result is not None]
 
 
 if __name__ == "__main__":
@@ -4,22 +4,51 @@ import json
 import os
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
 IncidentSource = Literal["manual", "api", "soc_tool"]
 IncidentStatus = Literal["open"]
 
-
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
-def _atomic_write_json(path: str, payload: Any) -> None:
+def write_json_atomic(path: str, payload: Any) -> None:
+    """Replace `path` with `payload` as indented JSON, atomically and durably."""
+    # A temp file per write (not a shared `<path>.tmp`): concurrent writers of the
+    # same record, in threads or processes, cannot clobber or steal each other's.
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    tmp_path = f"{path}.tmp"
-    with open(tmp_path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2, sort_keys=True)
-    os.replace(tmp_path, path)
+    fd, tmp_path = open_temp_file(path)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def open_temp_file(path: str) -> Tuple[int, str]:
+    """Create a private temp file next to `path` to rewrite it atomically; returns `(fd, tmp_path)`.
+
+    The temp file gets the permissions of the current `path`, or, when there is
+    none yet, those `open` would give a new file (the umask applies).
+    """
+    tmp_path = os.path.join(os.path.dirname(path), f"{os.path.basename(path)}.{uuid.uuid4().hex}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        if hasattr(os, "fchmod"):
+            os.fchmod(fd, os.stat(path).st_mode & 0o777)
+    except FileNotFoundError:
+        pass
+    except BaseException:
+        os.close(fd)
+        os.unlink(tmp_path)
+        raise
+    return fd, tmp_path
 
 
 def _read_json(path: str) -> Any:
@@ -80,7 +109,7 @@ class IncidentCoordinator:
             "status": "open",
             "created_at": _utc_now_iso(),
         }
-        _atomic_write_json(self._incident_path(incident_id), record)
+        write_json_atomic(self._incident_path(incident_id), record)
         return incident_id
 
     def get_incident(self, incident_id: str) -> Dict[str, Any]:
@@ -111,9 +140,35 @@ class IncidentCoordinator:
         incidents.sort(key=lambda r: r.get("created_at", ""))
         return incidents
 
+    def save_blast_radius(self, incident_id: str, report: Dict[str, Any], *, epoch: Optional[str]) -> None:
+        """Store the access-graph report for an incident, tagged with the graph ingestion epoch."""
+        if not os.path.exists(self._incident_path(incident_id)):
+            raise IncidentNotFound()
+        record = {
+            "incident_id": incident_id,
+            "ingestion_epoch": epoch,
+            "evaluated_at": _utc_now_iso(),
+            "report": report,
+        }
+        write_json_atomic(self._report_path(incident_id), record)
+
+    def get_blast_radius(self, incident_id: str) -> Optional[Dict[str, Any]]:
+        """Last stored report record for an incident, or None if it was never evaluated."""
+        path = self._report_path(incident_id)
+        if not os.path.exists(path):
+            return None
+        raw = _read_json(path)
+        if not isinstance(raw, dict):
+            raise IncidentError("blast radius record corrupted")
+        return raw
+
     def _incident_path(self, incident_id: str) -> str:
         return os.path.join(self._storage_dir, f"{incident_id}.json")
 
+    def _report_path(self, incident_id: str) -> str:
+        # Kept in a subdirectory so list_incidents() never reads reports as incidents.
+        return os.path.join(self._storage_dir, "reports", f"{incident_id}.json")
+
     @staticmethod
     def _normalize_record(raw: Dict[str, Any]) -> Dict[str, Any]:
         return {
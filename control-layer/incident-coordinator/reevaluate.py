@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Set
+
+
+def _load_sibling(module_name: str):
+    """Load a module that lives next to this file (the component is not an importable package)."""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"{module_name}.py")
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"failed to load module: {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+_coordinator = _load_sibling("incident_coordinator")
+IncidentCoordinator = _coordinator.IncidentCoordinator
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _load_access_graph_client(repo_root: str):
+    """The access-graph adapter's client, imported from the adapter loaded as the `access_graph_adapter` package."""
+    if "access_graph_adapter" not in sys.modules:
+        directory = os.path.join(repo_root, "integrations", "access-graph-adapter")
+        spec = importlib.util.spec_from_file_location(
+            "access_graph_adapter", os.path.join(directory, "__init__.py"), submodule_search_locations=[directory]
+        )
+        if spec is None or spec.loader is None:
+            raise RuntimeError("failed to load access-graph adapter")
+        package = importlib.util.module_from_spec(spec)
+        sys.modules["access_graph_adapter"] = package
+        spec.loader.exec_module(package)
+    return importlib.import_module("access_graph_adapter.client")
+
+
+class IncidentReevaluator:
+    """Refresh the blast radius of every open incident after a graph re-ingestion.
+
+    - A run is triggered when the access-graph ingestion epoch differs from the
+      epoch of the last completed run (or when forced).
+    - Reports are rebuilt on a worker pool of `max_workers` threads; at most
+      `max_workers` BloodHound report builds are in flight, and at most
+      `max_queue` more incidents wait in the submission queue.
+    - Each refreshed report is stored next to its incident
+      (`IncidentCoordinator.save_blast_radius`).
+    - Per-run metrics (timings, queue depth, outcomes) are appended to
+      `metrics_path` as JSON lines and returned.
+    """
+
+    def __init__(
+        self,
+        coordinator: IncidentCoordinator,
+        client: Any,
+        *,
+        state_path: str,
+        metrics_path: str,
+        max_workers: int = 4,
+        max_queue: int = 64,
+        tier_zero: bool = True,
+        critical_target_id: Optional[str] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must be >= 0")
+        self._coordinator = coordinator
+        self._client = client
+        self._state_path = state_path
+        self._metrics_path = metrics_path
+        self._max_workers = max_workers
+        self._max_queue = max_queue
+        self._tier_zero = tier_zero
+        self._critical_target_id = critical_target_id
+        self._clock = clock
+        self._stop = threading.Event()
+
+    def last_epoch(self) -> Optional[str]:
+        if not os.path.exists(self._state_path):
+            return None
+        with open(self._state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        return state.get("epoch") if isinstance(state, dict) else None
+
+    def run_once(self, *, force: bool = False) -> Optional[Dict[str, Any]]:
+        """Re-evaluate open incidents if the graph was re-ingested; returns run metrics or None."""
+        epoch = self._client.get_ingestion_epoch()
+        if not force and epoch is not None and epoch == self.last_epoch():
+            return None
+
+        previous_epoch = self.last_epoch()
+        incidents = [i for i in self._coordinator.list_incidents() if i.get("status") == "open"]
+        started_at = _utc_now_iso()
+        started = self._clock()
+        durations: List[float] = []
+        failures: List[Dict[str, str]] = []
+        unresolved: List[str] = []
+        max_queue_depth = 0
+        pending: Dict[Future, str] = {}
+        lock = threading.Lock()
+        queued = 0
+        in_flight = 0
+        max_in_flight = 0
+
+        def evaluate(incident: Dict[str, Any]) -> None:
+            nonlocal queued, in_flight, max_in_flight
+            with lock:
+                queued -= 1
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            call_started = self._clock()
+            try:
+                report = self._client.build_identity_report(
+                    {"id": incident["identity_ref"]},
+                    self._critical_target_id,
+                    tier_zero=self._tier_zero,
+                )
+                self._coordinator.save_blast_radius(incident["incident_id"], report, epoch=epoch)
+            except LookupError:
+                # Identity unknown to the graph: nothing to refresh, and retrying will not help.
+                with lock:
+                    unresolved.append(incident["incident_id"])
+            finally:
+                with lock:
+                    in_flight -= 1
+                    durations.append(self._clock() - call_started)
+
+        def collect(done: Set[Future]) -> None:
+            for future in done:
+                incident_id = pending.pop(future)
+                exc = future.exception()
+                if exc is not None:
+                    failures.append({"incident_id": incident_id, "error": str(exc)})
+
+        with ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="reevaluate") as pool:
+            for incident in incidents:
+                if self._stop.is_set():
+                    break
+                # Bounded submission: never more than max_workers running plus max_queue waiting.
+                while len(pending) >= self._max_workers + self._max_queue:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                with lock:
+                    queued += 1
+                    max_queue_depth = max(max_queue_depth, queued)
+                pending[pool.submit(evaluate, incident)] = incident["incident_id"]
+            done, _ = wait(pending)
+            collect(done)
+
+        elapsed = self._clock() - started
+        ordered = sorted(durations)
+        metrics: Dict[str, Any] = {
+            "started_at": started_at,
+            "finished_at": _utc_now_iso(),
+            "ingestion_epoch": epoch,
+            "previous_epoch": previous_epoch,
+            "incidents": len(incidents),
+            "refreshed": len(durations) - len(failures) - len(unresolved),
+            "unresolved": len(unresolved),
+            "failed": len(failures),
+            "failures": failures[:20],
+            "elapsed_seconds": round(elapsed, 3),
+            "throughput_per_second": round(len(durations) / elapsed, 2) if elapsed > 0 else None,
+            "report_seconds_p50": round(_percentile(ordered, 0.50), 4),
+            "report_seconds_p95": round(_percentile(ordered, 0.95), 4),
+            "report_seconds_max": round(ordered[-1], 4) if ordered else 0.0,
+            "max_workers": self._max_workers,
+            "max_in_flight": max_in_flight,
+            "max_queue_depth": max_queue_depth,
+        }
+        metrics["complete"] = not failures and len(durations) == len(incidents)
+        self._publish(metrics)
+        if metrics["complete"]:
+            # Failed or interrupted runs are retried on the next poll, even without a new ingestion.
+            _coordinator.write_json_atomic(self._state_path, {"epoch": epoch, "completed_at": metrics["finished_at"]})
+        return metrics
+
+    def run_forever(self, *, poll_interval: float = 300.0) -> None:
+        """Poll the ingestion epoch every `poll_interval` seconds until `stop()`."""
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as exc:
+                # BloodHound unreachable or mid-ingestion: try again next poll.
+                # Logged to stderr so stdout stays a stream of run results.
+                print(json.dumps({"reevaluation_error": str(exc), "at": _utc_now_iso()}), file=sys.stderr)
+            self._stop.wait(poll_interval)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _publish(self, metrics: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(self._metrics_path), exist_ok=True)
+        with open(self._metrics_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(metrics, sort_keys=True) + "\n")
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Re-evaluate open incidents after a BloodHound re-ingestion")
+    parser.add_argument("--once", action="store_true", help="run one check and exit")
+    parser.add_argument("--force", action="store_true", help="re-evaluate even if the epoch did not change")
+    parser.add_argument("--interval", type=float, default=300.0, help="poll interval in seconds")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent report builds against BloodHound")
+    args = parser.parse_args()
+
+    repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    data_dir = os.path.join(os.path.dirname(__file__), "data")
+    adapter = _load_access_graph_client(repo_root)
+    client = adapter.BloodHoundClient(
+        os.environ.get("BLOODHOUND_BASE_URL", "http://localhost:8080"),
+        os.environ.get("BLOODHOUND_USERNAME", "admin"),
+        os.environ.get("BLOODHOUND_PASSWORD", ""),
+        pool_size=args.workers,
+    )
+    reevaluator = IncidentReevaluator(
+        IncidentCoordinator(),
+        client,
+        state_path=os.path.join(data_dir, "reevaluation", "state.json"),
+        metrics_path=os.path.join(data_dir, "reevaluation", "metrics.jsonl"),
+        max_workers=args.workers,
+    )
+    with client:
+        if args.once:
+            print(json.dumps(reevaluator.run_once(force=args.force), indent=2))
+        else:
+            reevaluator.run_forever(poll_interval=args.interval)
+
+
+if __name__ == "__main__":
+    main()
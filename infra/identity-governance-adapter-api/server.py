@@ -7,6 +7,10 @@ import sys
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Any, Dict
 
+# /verify polls inside the request; keep it well below common HTTP client timeouts
+# (30-60s). Executions still unobserved fail with reason `timeout` and can be sent again.
+VERIFY_MAX_TIMEOUT_SECONDS = float(os.environ.get("VERIFY_MAX_TIMEOUT_SECONDS", "20"))
+
 
 def _json_response(handler: BaseHTTPRequestHandler, *, status: int, payload: Dict[str, Any]) -> None:
     body = json.dumps(payload).encode("utf-8")
@@ -27,6 +31,11 @@ def _read_json_body(handler: BaseHTTPRequestHandler) -> Dict[str, Any]:
 
 
 def _load_adapter(adapter_path: str):
+    # Load once per process: the adapter's per-midPoint concurrency cap, circuit
+    # breaker and metrics live on the module's classes.
+    module = sys.modules.get("identity_governance_adapter")
+    if module is not None:
+        return module
     spec = importlib.util.spec_from_file_location("identity_governance_adapter", adapter_path)
     if spec is None or spec.loader is None:
         raise RuntimeError("failed to load adapter")
@@ -36,6 +45,17 @@ def _load_adapter(adapter_path: str):
     return module
 
 
+def _adapter():
+    adapter_module = _load_adapter(os.environ.get("ADAPTER_PATH", "/app/client.py"))
+    return adapter_module.IdentityGovernanceAdapter(
+        base_url=os.environ.get("MIDPOINT_BASE_URL", "http://midpoint:8080"),
+        username=os.environ.get("MIDPOINT_USERNAME", "administrator"),
+        password=os.environ.get("MIDPOINT_PASSWORD", "5ecr3t"),
+        max_attempts=int(os.environ.get("MIDPOINT_MAX_ATTEMPTS", "4")),
+        deadline_seconds=float(os.environ.get("MIDPOINT_DEADLINE_SECONDS", "120")),
+    )
+
+
 class Handler(BaseHTTPRequestHandler):
     def do_POST(self) -> None:  # noqa: N802
         if self.path.rstrip("/") == "/execute":
@@ -55,15 +75,7 @@ class Handler(BaseHTTPRequestHandler):
                 if not isinstance(parameters, dict):
                     raise ValueError("parameters must be an object")
 
-                adapter_path = os.environ.get("ADAPTER_PATH", "/app/client.py")
-                adapter_module = _load_adapter(adapter_path)
-                adapter = adapter_module.IdentityGovernanceAdapter(
-                    base_url=os.environ.get("MIDPOINT_BASE_URL", "http://midpoint:8080"),
-                    username=os.environ.get("MIDPOINT_USERNAME", "administrator"),
-                    password=os.environ.get("MIDPOINT_PASSWORD", "5ecr3t"),
-                    max_attempts=1,
-                )
-
+                adapter = _adapter()
                 result = adapter.execute(
                     incident_id=incident_id,
                     action_id=action_id,
@@ -75,12 +87,42 @@ class Handler(BaseHTTPRequestHandler):
                 _json_response(self, status=400, payload={"error": str(exc)})
             return
 
+        if self.path.rstrip("/") == "/revert":
+            try:
+                payload = _read_json_body(self)
+                execution_id = payload.get("execution_id")
+                if not isinstance(execution_id, str) or not execution_id:
+                    raise ValueError("execution_id must be a non-empty string")
+                _json_response(self, status=200, payload=_adapter().revert_execution(execution_id))
+            except Exception as exc:
+                _json_response(self, status=400, payload={"error": str(exc)})
+            return
+
+        if self.path.rstrip("/") == "/verify":
+            try:
+                payload = _read_json_body(self)
+                execution_ids = payload.get("execution_ids")
+                if not isinstance(execution_ids, list) or not all(isinstance(e, str) and e for e in execution_ids):
+                    raise ValueError("execution_ids must be a list of non-empty strings")
+                timeout = float(payload.get("timeout_seconds") or VERIFY_MAX_TIMEOUT_SECONDS)
+                timeout = min(timeout, VERIFY_MAX_TIMEOUT_SECONDS)
+                verifications = [None] * len(execution_ids)
+                for item in _adapter().verify_executions(execution_ids, timeout=timeout):
+                    verifications[item["index"]] = item["verification"]
+                _json_response(self, status=200, payload={"verifications": verifications})
+            except Exception as exc:
+                _json_response(self, status=400, payload={"error": str(exc)})
+            return
+
         _json_response(self, status=404, payload={"error": "not found"})
 
     def do_GET(self) -> None:  # noqa: N802
         if self.path.rstrip("/") == "/health":
             _json_response(self, status=200, payload={"status": "ok"})
             return
+        if self.path.rstrip("/") == "/metrics":
+            _json_response(self, status=200, payload=_adapter().metrics())
+            return
         _json_response(self, status=404, payload={"error": "not found"})
 
     def log_message(self, format: str, *args: Any) -> None:  # noqa: A003
@@ -102,6 +102,11 @@ class Platform:
             os.path.join(repo_root, "control-layer", "approval-gateway", "approval_gateway.py"),
         )
 
+        self._journal_mod = _load_module(
+            "identity_governance_adapter_journal",
+            os.path.join(repo_root, "integrations", "identity-governance-adapter", "journal.py"),
+        )
+
         self.incidents = self._incident_mod.IncidentCoordinator()
         self.approvals = self._approval_mod.ApprovalGateway()
 
@@ -124,23 +129,11 @@ class Platform:
         return self.approvals.reject_action(incident_id, action_id, approver)
 
     def list_executions(self, incident_id: str) -> List[Dict[str, Any]]:
-        path = os.path.join(
-            self.repo_root,
-            "integrations",
-            "identity-governance-adapter",
-            "data",
-            "executions.json",
-        )
-        if not os.path.exists(path):
-            return []
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if not isinstance(data, dict):
-            return []
-        entries = data.get(incident_id, [])
-        if not isinstance(entries, list):
-            return []
-        return entries
+        data_dir = os.path.join(self.repo_root, "integrations", "identity-governance-adapter", "data")
+        journal = self._journal_mod.ExecutionJournal.shared(os.path.join(data_dir, "executions.jsonl"))
+        # Executions recorded before the journal existed live in executions.json until migrated.
+        self._journal_mod.migrate_legacy_json(os.path.join(data_dir, "executions.json"), journal)
+        return journal.by_incident(incident_id)
 
 
 class Handler(BaseHTTPRequestHandler):
@@ -0,0 +1,7 @@
+"""BloodHound access graph adapter.
+
+The directory name is not a module name, so callers outside it load it by
+path as the package `access_graph_adapter` and import its modules from there;
+the modules import each other relatively. Run from this directory as scripts
+(`python graph_engine.py ...`), they import each other as top-level modules.
+"""
@@ -0,0 +1,341 @@
+"""asyncio front end for the BloodHound access graph adapter.
+
+`AsyncBloodHoundClient` exposes the same methods as `BloodHoundClient` as
+coroutines. Blocking HTTP calls run on a dedicated worker pool sized to the
+concurrency limit, so independent sub-queries of a report (reachable assets
+and every critical path) overlap instead of running back to back.
+
+Standard library only; reuses the synchronous client for transport, auth,
+caching and normalization. Concurrent sub-queries share the client's session,
+so at most one login is in flight.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+if __package__:
+    from . import client as _client
+else:  # a script in this directory (python graph_engine.py ...), not the package
+    import client as _client
+
+
+class AsyncBloodHoundClient:
+    """Coroutine API over `BloodHoundClient` with bounded fan-out.
+
+    - At most `max_concurrency` API calls are in flight per client; the
+      keep-alive pool is sized to match so calls never queue on connections.
+    - `deadline` (seconds) on a method bounds the whole call. When it passes the
+      awaiting coroutine is cancelled and `asyncio.TimeoutError` is raised;
+      calls already on the wire are abandoned and finish within the transport's
+      per-request `timeout`.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        username: str,
+        password: str,
+        *,
+        max_concurrency: int = 8,
+        timeout: float = 30.0,
+        idle_timeout: float = 60.0,
+        transport: Optional[Any] = None,
+        cache: Optional[Any] = None,
+        client: Optional[Any] = None,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        if client is None:
+            client = _client.BloodHoundClient(
+                base_url,
+                username,
+                password,
+                timeout=timeout,
+                pool_size=max_concurrency,
+                idle_timeout=idle_timeout,
+                transport=transport,
+                cache=cache,
+            )
+        self.sync = client
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="bloodhound")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def session_token(self) -> Optional[str]:
+        return self.sync.session_token
+
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        return self.sync.cache_stats()
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.sync.close()
+
+    async def __aenter__(self) -> "AsyncBloodHoundClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def login(self, *, deadline: Optional[float] = None) -> str:
+        return await self._call(self.sync.login, deadline=deadline)
+
+    async def get_ingestion_epoch(self, *, deadline: Optional[float] = None) -> Optional[str]:
+        return await self._call(self.sync.get_ingestion_epoch, deadline=deadline)
+
+    async def get_identity(self, query: str, node_type: str = "user", *, deadline: Optional[float] = None) -> Dict:
+        return await self._call(self.sync.get_identity, query, node_type, deadline=deadline)
+
+    async def get_reachable_assets(
+        self, object_id: str, limit: int = 100, *, deadline: Optional[float] = None
+    ) -> List[Dict]:
+        return await self._call(self.sync.get_reachable_assets, object_id, limit, deadline=deadline)
+
+    async def iter_reachable_assets(
+        self,
+        object_id: str,
+        *,
+        page_size: int = _client.DEFAULT_PAGE_SIZE,
+        cursor: Optional[Sequence[str]] = None,
+        deadline: Optional[float] = None,
+    ) -> AsyncIterator[Dict]:
+        """Async generator over every directly reachable asset (see
+        `BloodHoundClient.iter_reachable_assets`). `deadline` bounds each page
+        fetch; the next page is requested only when the caller asks for it."""
+        async for assets, _ in self.iter_reachable_asset_pages(
+            object_id, page_size=page_size, cursor=cursor, deadline=deadline
+        ):
+            for asset in assets:
+                yield asset
+
+    async def iter_reachable_asset_pages(
+        self,
+        object_id: str,
+        *,
+        page_size: int = _client.DEFAULT_PAGE_SIZE,
+        cursor: Optional[Sequence[str]] = None,
+        deadline: Optional[float] = None,
+    ) -> AsyncIterator[Tuple[List[Dict], Optional[Tuple[str, str]]]]:
+        """Yields `(assets, next_cursor)` as `BloodHoundClient.iter_reachable_asset_pages`."""
+        if page_size < 1:
+            raise ValueError("page_size must be >= 1")
+        after = _client._page_cursor(cursor)
+        while True:
+            rows = await self._call(self.sync._query_reachable_page, object_id, after, page_size, deadline=deadline)
+            if not rows:
+                return
+            after = (rows[-1].get("id") or "", rows[-1].get("via") or "")
+            next_cursor = after if len(rows) == page_size else None
+            yield [_client._normalize_asset(row) for row in rows], next_cursor
+            if next_cursor is None:
+                return
+
+    async def get_blast_radius(
+        self,
+        object_id: str,
+        *,
+        max_depth: int = _client.DEFAULT_MAX_DEPTH,
+        edge_kinds: Optional[Sequence[str]] = None,
+        frontier_batch: int = 500,
+        page_size: int = 5000,
+        deadline: Optional[float] = None,
+    ) -> List[Dict]:
+        return await self._call(
+            functools.partial(
+                self.sync.get_blast_radius,
+                object_id,
+                max_depth=max_depth,
+                edge_kinds=edge_kinds,
+                frontier_batch=frontier_batch,
+                page_size=page_size,
+            ),
+            deadline=deadline,
+        )
+
+    async def iter_blast_radius(
+        self,
+        object_id: str,
+        *,
+        max_depth: int = _client.DEFAULT_MAX_DEPTH,
+        edge_kinds: Optional[Sequence[str]] = None,
+        frontier_batch: int = 500,
+        page_size: int = 5000,
+        deadline: Optional[float] = None,
+    ) -> AsyncIterator[Dict]:
+        """Async generator over the transitive closure (see
+        `BloodHoundClient.iter_blast_radius`). `deadline` bounds each page
+        fetch; the next page is requested only when the caller asks for it."""
+        _client._check_expansion_limits(max_depth, frontier_batch, page_size)
+        kinds = list(edge_kinds or [])
+        seen = {object_id}
+        frontier = [object_id]
+        for depth in range(1, max_depth + 1):
+            next_frontier = []
+            for batch in _client._batches(frontier, frontier_batch):
+                after = ""
+                while True:
+                    rows = await self._call(
+                        self.sync._query_expansion_page, batch, kinds, after, page_size, deadline=deadline
+                    )
+                    for row in rows:
+                        asset_id = row.get("id")
+                        if not asset_id or asset_id in seen:
+                            continue
+                        seen.add(asset_id)
+                        next_frontier.append(asset_id)
+                        asset = _client._normalize_asset(row)
+                        asset["depth"] = depth
+                        yield asset
+                    if len(rows) < page_size:
+                        break
+                    after = rows[-1].get("id") or ""
+            if not next_frontier:
+                return
+            frontier = next_frontier
+
+    async def get_critical_path(
+        self, start_id: str, target_id: str, *, deadline: Optional[float] = None
+    ) -> Optional[Dict]:
+        return await self._call(self.sync.get_critical_path, start_id, target_id, deadline=deadline)
+
+    async def get_tier_zero_paths(
+        self,
+        start_id: str,
+        *,
+        max_length: int = _client.DEFAULT_MAX_PATH_LENGTH,
+        max_paths: int = _client.DEFAULT_MAX_PATHS,
+        deadline: Optional[float] = None,
+    ) -> List[Dict]:
+        return await self._call(
+            functools.partial(self.sync.get_tier_zero_paths, start_id, max_length=max_length, max_paths=max_paths),
+            deadline=deadline,
+        )
+
+    async def use_tier_zero_index(
+        self, index: Optional[Any], *, check_epoch: bool = True, deadline: Optional[float] = None
+    ) -> None:
+        await self._call(
+            functools.partial(self.sync.use_tier_zero_index, index, check_epoch=check_epoch), deadline=deadline
+        )
+
+    async def get_nearest_tier_zero_path(self, start_id: str, *, deadline: Optional[float] = None) -> Optional[Dict]:
+        index = self.sync.tier_zero_index
+        if index is not None:
+            return index.path(start_id)  # local lookup, no need for a worker thread
+        return await self._call(self.sync.get_nearest_tier_zero_path, start_id, deadline=deadline)
+
+    async def iter_tier_zero_nodes(
+        self, *, page_size: int = 5000, deadline: Optional[float] = None
+    ) -> AsyncIterator[Dict]:
+        """`{id, kind}` of every Tier Zero node, paged as `BloodHoundClient.iter_tier_zero_nodes`."""
+        after = ""
+        while True:
+            rows = await self._call(self.sync._query_tier_zero_page, after, page_size, deadline=deadline)
+            for row in rows:
+                yield row
+            if len(rows) < page_size:
+                return
+            after = rows[-1].get("id") or ""
+
+    async def build_identity_reports(
+        self,
+        identity_refs: List[Dict],
+        critical_target_id: Optional[str] = None,
+        *,
+        batch_size: int = 200,
+        limit: int = 100,
+        tier_zero: bool = False,
+        max_path_length: int = _client.DEFAULT_MAX_PATH_LENGTH,
+        max_paths: int = _client.DEFAULT_MAX_PATHS,
+        deadline: Optional[float] = None,
+        compact: bool = False,
+    ) -> List[Optional[Dict]]:
+        return await self._call(
+            functools.partial(
+                self.sync.build_identity_reports,
+                identity_refs,
+                critical_target_id,
+                batch_size=batch_size,
+                limit=limit,
+                tier_zero=tier_zero,
+                max_path_length=max_path_length,
+                max_paths=max_paths,
+                compact=compact,
+            ),
+            deadline=deadline,
+        )
+
+    async def build_identity_report(
+        self,
+        identity_ref: Dict,
+        critical_target_id: Optional[str] = None,
+        *,
+        critical_target_ids: Sequence[str] = (),
+        tier_zero: bool = False,
+        max_path_length: int = _client.DEFAULT_MAX_PATH_LENGTH,
+        max_paths: int = _client.DEFAULT_MAX_PATHS,
+        deadline: Optional[float] = None,
+        compact: bool = False,
+    ) -> Dict:
+        """Contract-compliant report with sub-queries issued concurrently.
+
+        The identity is resolved first; reachable assets, the paths to
+        `critical_target_id` plus every entry of `critical_target_ids`, and
+        (with `tier_zero=True`) the Tier Zero paths are then fetched at once.
+        Latency is roughly resolve + the slowest sub-query. `compact` returns a
+        columnar `CompactReport`, as in `BloodHoundClient.build_identity_report`.
+        """
+        tier_zero_limits = (max_path_length, max_paths) if tier_zero else None
+        coro = self._build_identity_report(
+            identity_ref, [critical_target_id, *critical_target_ids], tier_zero_limits, compact
+        )
+        if deadline is None:
+            return await coro
+        return await asyncio.wait_for(coro, timeout=deadline)
+
+    async def _build_identity_report(
+        self,
+        identity_ref: Dict,
+        targets: List[Optional[str]],
+        tier_zero_limits: Optional[Tuple[int, int]],
+        compact: bool = False,
+    ) -> Dict:
+        resolved = await self.get_identity(identity_ref.get("id") or identity_ref.get("upn") or "")
+        oid = _client._object_id(resolved)
+        targets = [t for t in dict.fromkeys(targets) if t]
+        sub_queries = [self.get_reachable_assets(oid)]
+        sub_queries.extend(self.get_critical_path(oid, target) for target in targets)
+        index = self.sync.tier_zero_index
+        if tier_zero_limits is not None and index is None:
+            max_length, max_paths = tier_zero_limits
+            sub_queries.append(self.get_tier_zero_paths(oid, max_length=max_length, max_paths=max_paths))
+        reachable, *results = await asyncio.gather(*sub_queries)
+        critical = [path for path in results[: len(targets)] if path]
+        if tier_zero_limits is not None:
+            # With a Tier Zero index the nearest path is a local lookup.
+            paths = _client._indexed_paths(index, oid, tier_zero_limits[0]) if index is not None else results[-1]
+            critical = _client._merge_paths(critical, paths)
+        return _client._assemble_report(resolved, reachable, critical, compact)
+
+    async def _call(self, fn: Callable[..., T], *args: Any, deadline: Optional[float] = None) -> T:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        coro = self._run_limited(fn, *args)
+        if deadline is None:
+            return await coro
+        # The deadline covers queueing on the semaphore as well as the call.
+        return await asyncio.wait_for(coro, timeout=deadline)
+
+    async def _run_limited(self, fn: Callable[..., T], *args: Any) -> T:
+        assert self._semaphore is not None
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(fn, *args))
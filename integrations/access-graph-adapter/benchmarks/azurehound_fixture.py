@@ -0,0 +1,94 @@
+"""Synthetic AzureHound collector output for the adapter benchmarks.
+
+Writes a tenant with users, nested groups, directory roles (including Tier
+Zero roles), apps/service principals with owners and subscription RBAC, in the
+`{"meta": ..., "data": [{"kind": ..., "data": ...}]}` layout AzureHound emits.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+from typing import Any, Dict, Iterator, List
+
+TENANT_ID = "6C12B0B0-0000-4000-8000-000000000001"
+GLOBAL_ADMIN = "62E90394-69F5-4237-9190-012177145E10"
+PRIV_ROLE_ADMIN = "E8611AB8-C189-46E8-94E1-60213AB1F814"
+
+
+def _guid(prefix: int, index: int) -> str:
+    return f"{prefix:08X}-0000-4000-8000-{index:012X}"
+
+
+def user_id(index: int) -> str:
+    return _guid(1, index)
+
+
+def iter_items(users: int = 10_000, groups: int = 1_000, apps: int = 500, seed: int = 7) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    yield {"kind": "AZTenant", "data": {"tenantId": TENANT_ID, "displayName": "Example Tenant"}}
+    for index in range(users):
+        yield {
+            "kind": "AZUser",
+            "data": {
+                "id": user_id(index),
+                "displayName": f"User {index}",
+                "userPrincipalName": f"user{index}@example.test",
+                "tenantId": TENANT_ID,
+            },
+        }
+    roles = [(GLOBAL_ADMIN, "Global Administrator"), (PRIV_ROLE_ADMIN, "Privileged Role Administrator")]
+    roles += [(_guid(3, i), f"Custom Role {i}") for i in range(20)]
+    for role_id, name in roles:
+        yield {"kind": "AZRole", "data": {"id": role_id, "templateId": role_id, "displayName": name}}
+    for index in range(groups):
+        yield {"kind": "AZGroup", "data": {"id": _guid(2, index), "displayName": f"Group {index}"}}
+    for index in range(groups):
+        members: List[Dict[str, Any]] = [
+            {"member": {"id": user_id(rng.randrange(users)), "@odata.type": "#microsoft.graph.user"}}
+            for _ in range(max(1, users // groups * 3))
+        ]
+        if index:
+            # Nest groups into lower-numbered ones to build membership chains.
+            members.append({"member": {"id": _guid(2, rng.randrange(index)), "@odata.type": "#microsoft.graph.group"}})
+        yield {"kind": "AZGroupMember", "data": {"groupId": _guid(2, index), "members": members}}
+    assignments = [
+        {"principalId": _guid(2, rng.randrange(groups)), "roleDefinitionId": roles[rng.randrange(len(roles))][0]}
+        for _ in range(groups // 10 + 1)
+    ]
+    for role_id, _ in roles:
+        yield {
+            "kind": "AZRoleAssignment",
+            "data": {
+                "roleDefinitionId": role_id,
+                "tenantId": TENANT_ID,
+                "roleAssignments": [a for a in assignments if a["roleDefinitionId"] == role_id],
+            },
+        }
+    for index in range(apps):
+        app_id = _guid(5, index)
+        yield {"kind": "AZApp", "data": {"id": _guid(4, index), "appId": app_id, "displayName": f"App {index}"}}
+        yield {"kind": "AZServicePrincipal", "data": {"id": _guid(6, index), "appId": app_id, "displayName": f"App {index}"}}
+        yield {
+            "kind": "AZAppOwner",
+            "data": {"appId": _guid(4, index), "owners": [{"owner": {"id": user_id(rng.randrange(users))}}]},
+        }
+    subscription = _guid(7, 0)
+    yield {"kind": "AZSubscription", "data": {"id": subscription, "displayName": "Production"}}
+    yield {
+        "kind": "AZSubscriptionOwner",
+        "data": {
+            "subscriptionId": subscription,
+            "owners": [{"owner": {"properties": {"principalId": _guid(6, i)}}} for i in range(min(apps, 5))],
+        },
+    }
+
+
+def write(directory: str, **kwargs: Any) -> str:
+    os.makedirs(directory, exist_ok=True)
+    items = list(iter_items(**kwargs))
+    path = os.path.join(directory, "azurehound.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": {"type": "azure", "version": 5, "count": len(items)}, "data": items}, f)
+    return path
@@ -0,0 +1,78 @@
+"""Report latency: blocking client (sequential sub-queries) vs asyncio client.
+
+Each report resolves the identity, expands reachable assets and computes
+paths to `--targets` critical targets.
+
+Usage: python bench_async.py [--reports 20] [--targets 4] [--latency 0.02] [--concurrency 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from bench_keepalive import _load_client, _load_module
+from stub_server import StubBloodHound, SyntheticGraph
+
+
+def _load_async_client():
+    return _load_module("async_client")
+
+
+async def _run_async(mod, base_url: str, graph: SyntheticGraph, reports: int, targets, concurrency: int):
+    async with mod.AsyncBloodHoundClient(base_url, "admin", "pw", max_concurrency=concurrency) as client:
+        await client.login()
+        started = time.perf_counter()
+        for index in range(reports):
+            await client.build_identity_report({"id": graph.identity_id(index)}, critical_target_ids=targets)
+        sequential = time.perf_counter() - started
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                client.build_identity_report({"id": graph.identity_id(index)}, critical_target_ids=targets)
+                for index in range(reports)
+            )
+        )
+        overlapped = time.perf_counter() - started
+    return sequential, overlapped
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reports", type=int, default=20)
+    parser.add_argument("--targets", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated server latency per call (s)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    sync_mod = _load_client()
+    async_mod = _load_async_client()
+    graph = SyntheticGraph(identities=args.reports, fanout=25)
+    targets = [f"tier-zero-{i}" for i in range(args.targets)]
+    with StubBloodHound(graph, latency=args.latency) as server:
+        client = sync_mod.BloodHoundClient(server.base_url, "admin", "pw")
+        client.login()
+        started = time.perf_counter()
+        for index in range(args.reports):
+            resolved = client.get_identity(graph.identity_id(index))
+            client.get_reachable_assets(resolved["objectid"])
+            for target in targets:
+                client.get_critical_path(resolved["objectid"], target)
+        blocking = time.perf_counter() - started
+        client.close()
+
+        sequential, overlapped = asyncio.run(
+            _run_async(async_mod, server.base_url, graph, args.reports, targets, args.concurrency)
+        )
+
+    per = 1e3 / args.reports
+    print(f"blocking client        : {blocking * per:.1f} ms/report")
+    print(f"async, one at a time   : {sequential * per:.1f} ms/report (sub-queries overlapped)")
+    print(f"async, reports gathered: {overlapped * per:.1f} ms/report (wall / reports)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+"""Transitive blast radius of one identity with a 100k+ node closure.
+
+Expands nested group trees level by level and reports the closure size, API
+calls, the largest single response and the slowest single call, which is what
+has to stay under the API timeout. The closure is checked against a
+breadth-first walk of the synthetic graph itself.
+
+Usage: python bench_blast_radius.py [--fanout 100] [--nested-fanout 10] [--nested-depth 3] [--max-depth 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import time
+
+from bench_keepalive import _load_client
+from stub_server import StubBloodHound, SyntheticGraph
+
+
+def _expected_depths(graph: SyntheticGraph, start: str, max_depth: int) -> collections.Counter:
+    seen, frontier, by_depth = {start}, [start], collections.Counter()
+    for depth in range(1, max_depth + 1):
+        frontier = [row["id"] for oid in frontier for row in graph.neighbors(oid) if row["id"] not in seen]
+        frontier = list(dict.fromkeys(frontier))
+        seen.update(frontier)
+        by_depth[depth] = len(frontier)
+    return +by_depth
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fanout", type=int, default=100)
+    parser.add_argument("--nested-fanout", type=int, default=10)
+    parser.add_argument("--nested-depth", type=int, default=3)
+    parser.add_argument("--max-depth", type=int, default=4)
+    parser.add_argument("--frontier-batch", type=int, default=500)
+    parser.add_argument("--page-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    mod = _load_client()
+    graph = SyntheticGraph(
+        identities=1, fanout=args.fanout, nested_fanout=args.nested_fanout, nested_depth=args.nested_depth
+    )
+    with StubBloodHound(graph) as server:
+        client = mod.BloodHoundClient(server.base_url, "admin", "pw")
+        client.login()
+        calls = []
+        query_page = client._query_expansion_page
+
+        def timed_page(*page_args):
+            started = time.perf_counter()
+            rows = query_page(*page_args)
+            calls.append((time.perf_counter() - started, len(rows)))
+            return rows
+
+        client._query_expansion_page = timed_page
+        started = time.perf_counter()
+        by_depth = collections.Counter(
+            asset["depth"]
+            for asset in client.iter_blast_radius(
+                graph.identity_id(0),
+                max_depth=args.max_depth,
+                frontier_batch=args.frontier_batch,
+                page_size=args.page_size,
+            )
+        )
+        wall = time.perf_counter() - started
+        client.close()
+
+    expected = _expected_depths(graph, graph.identity_id(0), args.max_depth)
+    assert by_depth == expected, (dict(by_depth), dict(expected))
+    print(f"closure           : {sum(by_depth.values())} assets {dict(sorted(by_depth.items()))}")
+    print(f"wall              : {wall:.2f}s over {len(calls)} cypher calls")
+    print(f"largest response  : {max(rows for _, rows in calls)} rows")
+    print(f"slowest call      : {max(elapsed for elapsed, _ in calls) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
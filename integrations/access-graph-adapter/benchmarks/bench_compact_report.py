@@ -0,0 +1,87 @@
+"""Contract (dict per asset) vs columnar identity reports at high fan-out.
+
+For each asset count, builds the same report both ways and reports retained
+memory (tracemalloc, after the intermediate asset rows are freed), build time,
+`json.dumps` time and size, and the cost of converting the columnar report
+back to the contract shape.
+
+Usage: python bench_compact_report.py [--assets 10000 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from bench_keepalive import _load_client
+
+_KINDS = ("azkeyvault", "azvm", "azgroup", "azapp", "azsubscription", "azresourcegroup")
+_VIAS = ("azcontributor", "azowner", "azmemberof", "azuseraccessadministrator", "azkeyvaultcontributor")
+
+
+def _rows(count: int):
+    for i in range(count):
+        yield {
+            "id": f"/subscriptions/0000/resourceGroups/rg-{i % 97:02d}/providers/asset-{i:07d}",
+            "name": f"{'admin-' if i % 10 == 0 else ''}asset-{i:07d}",
+            "kind": _KINDS[i % len(_KINDS)],
+            "via": _VIAS[i % len(_VIAS)],
+            "confidence": "graph",
+        }
+
+
+def _build(mod, count: int, compact: bool):
+    resolved = {"objectid": "sp-0001", "name": "ci-deployer", "type": "AZServicePrincipal"}
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    report = mod._assemble_report(resolved, list(_rows(count)), [], compact)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return report, elapsed, retained / (1024 * 1024), peak / (1024 * 1024)
+
+
+def _dumps(payload):
+    started = time.perf_counter()
+    text = json.dumps(payload)
+    return time.perf_counter() - started, len(text) / (1024 * 1024)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    mod = _load_client()
+    for count in args.assets:
+        report, dict_build, dict_mem, dict_peak = _build(mod, count, compact=False)
+        dict_dump, dict_size = _dumps(report)
+        del report
+        compact, compact_build, compact_mem, compact_peak = _build(mod, count, compact=True)
+        compact_dump, compact_size = _dumps(compact.to_compact())
+        started = time.perf_counter()
+        contract = compact.to_dict()
+        convert = time.perf_counter() - started
+        assert len(contract["reachable_assets"]) == len(contract["privilege_classification"]) == count
+        assert contract == mod._assemble_report(
+            {"objectid": "sp-0001", "name": "ci-deployer", "type": "AZServicePrincipal"}, list(_rows(count)), []
+        )
+        print(f"{count:>7} assets")
+        print(
+            f"  contract dicts : retained {dict_mem:6.1f} MB (peak {dict_peak:6.1f})  build {dict_build:.3f}s  "
+            f"json.dumps {dict_dump:.3f}s / {dict_size:5.1f} MB"
+        )
+        print(
+            f"  columnar       : retained {compact_mem:6.1f} MB (peak {compact_peak:6.1f})  build {compact_build:.3f}s  "
+            f"json.dumps {compact_dump:.3f}s / {compact_size:5.1f} MB  to_dict {convert:.3f}s"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
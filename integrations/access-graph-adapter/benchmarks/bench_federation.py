@@ -0,0 +1,63 @@
+"""Federated report over N BloodHound instances: sequential loop vs parallel fan-out.
+
+Each stub instance answers with a different latency; one extra instance is
+unreachable and one is slower than its per-instance timeout. The federated
+report arrives after max(slowest answer, timeout) instead of the sum.
+
+Usage: python bench_federation.py [--instances 4] [--latency 0.02] [--timeout 0.5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import time
+
+from bench_keepalive import _load_client, _load_module
+from stub_server import StubBloodHound, SyntheticGraph
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--instances", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.02, help="base per-call latency; instance i uses (i+1)x")
+    parser.add_argument("--timeout", type=float, default=0.5, help="per-instance deadline (s)")
+    args = parser.parse_args()
+
+    mod = _load_client()
+    federation = _load_module("federation")
+    graph = SyntheticGraph(identities=10, fanout=25)
+    ref = {"id": graph.identity_id(3)}
+    with contextlib.ExitStack() as stack:
+        servers = [
+            stack.enter_context(StubBloodHound(graph, latency=args.latency * (i + 1))) for i in range(args.instances)
+        ]
+        slow = stack.enter_context(StubBloodHound(graph, latency=args.timeout * 2))
+        config = [
+            {"name": f"tenant-{i}", "base_url": server.base_url, "username": "admin", "password": "pw"}
+            for i, server in enumerate(servers)
+        ]
+        config.append({"name": "unreachable", "base_url": "http://127.0.0.1:9", "username": "a", "password": "b"})
+        config.append({"name": "slow", "base_url": slow.base_url, "username": "admin", "password": "pw"})
+
+        with federation.FederatedClient.from_config(config, default_timeout=args.timeout) as fed:
+            started = time.perf_counter()
+            for client in list(fed.instances.values())[: args.instances]:
+                client.build_identity_report(ref)
+            sequential = time.perf_counter() - started
+
+            started = time.perf_counter()
+            result = fed.build_federated_report(ref)
+            parallel = time.perf_counter() - started
+
+    slowest = max(o["elapsed_ms"] for o in result["instances"].values() if o["status"] == "ok")
+    print(f"sequential, {args.instances} healthy instances : {sequential * 1000:8.1f} ms")
+    print(f"federated, all {len(config)} instances      : {parallel * 1000:8.1f} ms (slowest ok instance {slowest} ms)")
+    for name, outcome in result["instances"].items():
+        print(f"  {name:<12} {outcome['status']:<8} {outcome.get('elapsed_ms', '')}")
+    print(f"merged reachable assets: {len(result['report']['reachable_assets'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
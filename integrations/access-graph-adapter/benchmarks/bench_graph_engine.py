@@ -0,0 +1,82 @@
+"""Offline graph engine vs BloodHound API path.
+
+Builds a local graph from synthetic AzureHound output, saves a snapshot,
+times snapshot open (mmap) and serves reachable-asset / critical-path lookups
+locally; compares per-lookup latency to the same calls through the HTTP API
+against the stub server.
+
+Usage: python bench_graph_engine.py [--users 50000] [--groups 5000] [--lookups 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+import azurehound_fixture
+from bench_keepalive import _load_client, _load_module
+from stub_server import StubBloodHound, SyntheticGraph
+
+
+def _load_engine():
+    return _load_module("graph_engine")
+
+
+def _per_call(fn, count: int) -> float:
+    started = time.perf_counter()
+    for index in range(count):
+        fn(index)
+    return (time.perf_counter() - started) / count * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--groups", type=int, default=5_000)
+    parser.add_argument("--lookups", type=int, default=2_000)
+    args = parser.parse_args()
+
+    client_mod = _load_client()
+    engine = _load_engine()
+    with tempfile.TemporaryDirectory() as tmp:
+        source = azurehound_fixture.write(os.path.join(tmp, "collect"), users=args.users, groups=args.groups)
+        started = time.perf_counter()
+        graph = engine.LocalGraph.from_azurehound([source])
+        build = time.perf_counter() - started
+        snapshot = os.path.join(tmp, "graph.snapshot")
+        graph.save(snapshot)
+        print(
+            f"graph: nodes={graph.node_count} edges={graph.edge_count} build={build:.2f}s "
+            f"snapshot={os.path.getsize(snapshot) / 1e6:.1f}MB"
+        )
+
+        started = time.perf_counter()
+        local = client_mod.create_client(backend="local", snapshot_path=snapshot)
+        print(f"snapshot open (mmap): {(time.perf_counter() - started) * 1e3:.2f} ms")
+
+        users = [azurehound_fixture.user_id(i % args.users) for i in range(args.lookups)]
+        reach = _per_call(lambda i: local.get_reachable_assets(users[i]), args.lookups)
+        tz = _per_call(lambda i: local.get_tier_zero_paths(users[i], max_paths=5), args.lookups)
+        path = _per_call(lambda i: local.get_critical_path(users[i], azurehound_fixture.GLOBAL_ADMIN), args.lookups)
+        print(f"local  get_reachable_assets: {reach:9.1f} us/call")
+        print(f"local  get_tier_zero_paths : {tz:9.1f} us/call")
+        print(f"local  get_critical_path   : {path:9.1f} us/call")
+        local.close()
+
+    stub_graph = SyntheticGraph(identities=100, fanout=25)
+    with StubBloodHound(stub_graph) as server:
+        api = client_mod.BloodHoundClient(server.base_url, "admin", "pw")
+        api.login()
+        count = min(args.lookups, 500)
+        reach = _per_call(lambda i: api.get_reachable_assets(stub_graph.identity_id(i % 100)), count)
+        path = _per_call(lambda i: api.get_critical_path(stub_graph.identity_id(i % 100), "t"), count)
+        print(f"api    get_reachable_assets: {reach:9.1f} us/call (local stub, no graph work)")
+        print(f"api    get_critical_path   : {path:9.1f} us/call (local stub, no graph work)")
+        api.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
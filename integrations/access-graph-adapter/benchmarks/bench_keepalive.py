@@ -0,0 +1,87 @@
+"""Per-report latency: pooled keep-alive transport vs one connection per call.
+
+Usage: python bench_keepalive.py [--reports 300] [--workers 1] [--latency 0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import importlib.util
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from stub_server import StubBloodHound, SyntheticGraph
+
+
+def _load_module(module_name: str):
+    """Import `access_graph_adapter.<module_name>`, loading the adapter package from `..` first."""
+    if "access_graph_adapter" not in sys.modules:
+        directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+        spec = importlib.util.spec_from_file_location(
+            "access_graph_adapter", os.path.join(directory, "__init__.py"), submodule_search_locations=[directory]
+        )
+        if spec is None or spec.loader is None:
+            raise RuntimeError("failed to load the access-graph adapter")
+        package = importlib.util.module_from_spec(spec)
+        sys.modules["access_graph_adapter"] = package
+        spec.loader.exec_module(package)
+    return importlib.import_module(f"access_graph_adapter.{module_name}")
+
+
+def _load_client():
+    return _load_module("client")
+
+
+def _run(client, graph: SyntheticGraph, reports: int, workers: int) -> List[float]:
+    client.login()
+
+    def one(index: int) -> float:
+        started = time.perf_counter()
+        client.build_identity_report({"id": graph.identity_id(index % graph.identities)}, "tier-zero-role")
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(one, range(reports)))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reports", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated server latency per call (s)")
+    args = parser.parse_args()
+
+    mod = _load_client()
+    graph = SyntheticGraph(identities=50, fanout=25)
+    with StubBloodHound(graph, latency=args.latency) as server:
+        variants = {
+            "urllib (per-call connection)": mod.BloodHoundClient(
+                server.base_url, "admin", "pw", transport=mod.UrllibTransport(server.base_url)
+            ),
+            "keep-alive pool": mod.BloodHoundClient(server.base_url, "admin", "pw", pool_size=max(1, args.workers)),
+        }
+        for label, client in variants.items():
+            _run(client, graph, min(20, args.reports), args.workers)  # warm-up
+            started = time.perf_counter()
+            samples = _run(client, graph, args.reports, args.workers)
+            wall = time.perf_counter() - started
+            samples.sort()
+            opened = getattr(client.transport, "connections_opened", None)
+            print(
+                f"{label:30s} reports={args.reports} wall={wall:.3f}s "
+                f"mean={statistics.mean(samples) * 1e3:.3f}ms "
+                f"p50={samples[len(samples) // 2] * 1e3:.3f}ms "
+                f"p99={samples[int(len(samples) * 0.99) - 1] * 1e3:.3f}ms"
+                + (f" connections={opened}" if opened is not None else "")
+            )
+            client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
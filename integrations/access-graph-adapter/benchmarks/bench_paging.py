@@ -0,0 +1,56 @@
+"""High fan-out identities: one `get_reachable_assets` call vs cursor-paged streaming.
+
+Reports wall time and peak Python heap (tracemalloc) of consuming every
+reachable asset of one identity, for growing edge counts.
+
+Usage: python bench_paging.py [--edges 1000 10000 100000] [--page-size 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+from bench_keepalive import _load_client
+from stub_server import StubBloodHound, SyntheticGraph
+
+
+def _measure(fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    count = fn()
+    wall = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, wall, peak / (1024 * 1024)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--edges", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--page-size", type=int, default=500)
+    args = parser.parse_args()
+
+    mod = _load_client()
+    for edges in args.edges:
+        graph = SyntheticGraph(identities=1, fanout=edges)
+        oid = graph.identity_id(0)
+        with StubBloodHound(graph) as server:
+            client = mod.BloodHoundClient(server.base_url, "admin", "pw")
+            client.login()
+            one_count, one_wall, one_peak = _measure(lambda: len(client.get_reachable_assets(oid, limit=edges)))
+            paged_count, paged_wall, paged_peak = _measure(
+                lambda: sum(1 for _ in client.iter_reachable_assets(oid, page_size=args.page_size))
+            )
+            client.close()
+        assert one_count == paged_count == edges, (one_count, paged_count, edges)
+        print(
+            f"{edges:>7} edges  single call: {one_wall:.3f}s peak {one_peak:7.1f} MB   "
+            f"paged ({args.page_size}/page): {paged_wall:.3f}s peak {paged_peak:5.1f} MB"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
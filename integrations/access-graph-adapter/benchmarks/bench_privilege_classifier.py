@@ -0,0 +1,98 @@
+"""Privilege classification of a large asset batch: per-asset name scan vs table-driven classifier.
+
+The old rule (`"admin" in name.lower()` per asset) is timed against
+`PrivilegeClassifier.classify` (codes, as used by compact reports) and the
+full `privilege_classification` dicts built from it. Also prints how the two
+label the same batch.
+
+Usage: python bench_privilege_classifier.py [--assets 100000] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections import Counter
+
+from bench_keepalive import _load_client
+
+_ASSET_MIX = (
+    ("azkeyvault", "azkeyvaultcontributor", "kv-prod-{i}"),
+    ("azkeyvault", "azgetsecrets", "kv-admin-secrets-{i}"),
+    ("azsubscription", "azowner", "sub-{i}"),
+    ("azresourcegroup", "azcontributor", "rg-admin-tools-{i}"),
+    ("azvm", "azexecutecommand", "vm-{i}"),
+    ("azvm", "azvmadminlogin", "vm-jump-{i}"),
+    ("azgroup", "azmemberof", "Helpdesk Operators {i}"),
+    ("azgroup", "azmemberof", "All Staff {i}"),
+    ("azgroup", "azowns", "Team Admins {i}"),
+    ("azrole", "azhasrole", "Global Administrator"),
+    ("azrole", "azhasrole", "Directory Readers"),
+    ("azapp", "azowns", "billing-app-{i}"),
+    ("group", "memberof", "DOMAIN ADMINS@CORP.LOCAL"),
+    ("computer", "canrdp", "WS-{i}.CORP.LOCAL"),
+    ("azautomationaccount", "azautomationcontributor", "aa-{i}"),
+)
+
+
+def _assets(count: int):
+    rows = []
+    for i in range(count):
+        kind, via, name = _ASSET_MIX[i % len(_ASSET_MIX)]
+        rows.append({"id": f"asset-{i:07d}", "name": name.format(i=i), "kind": kind, "via": via, "confidence": "graph"})
+    return rows
+
+
+def _old_rule(assets):
+    return [
+        {
+            "target_id": asset.get("id"),
+            "privilege": "admin" if "admin" in (asset.get("name") or "").lower() else "read",
+            "evidence": "graph_edge",
+            "source": "bloodhound",
+        }
+        for asset in assets
+    ]
+
+
+def _best(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    mod = _load_client()
+    classifier = mod.PrivilegeClassifier()
+    assets = _assets(args.assets)
+    classifier.classify(assets[:1000])  # compile the rule codes for this mix
+
+    old = _best(lambda: _old_rule(assets), args.repeat)
+    codes = _best(lambda: classifier.classify(assets), args.repeat)
+    dicts = _best(lambda: mod._classify_privileges(assets), args.repeat)
+    print(f"{args.assets} assets (best of {args.repeat})")
+    print(f"  name scan per asset (old)   : {old * 1000:7.1f} ms")
+    print(f"  table classifier, codes     : {codes * 1000:7.1f} ms")
+    print(f"  table classifier, dicts     : {dicts * 1000:7.1f} ms")
+
+    before = Counter(entry["privilege"] for entry in _old_rule(assets))
+    after = Counter(privilege for privilege, _ in classifier.labels(assets))
+    print(f"  old labels: {dict(sorted(before.items()))}")
+    print(f"  new labels: {dict(sorted(after.items()))}")
+    for kind, via, name in _ASSET_MIX:
+        row = [{"kind": kind, "via": via, "name": name.format(i=0)}]
+        privilege, evidence = next(classifier.labels(row))
+        print(f"    {kind:<20} {via:<24} {name.format(i=0):<26} -> {privilege:<7} ({evidence})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
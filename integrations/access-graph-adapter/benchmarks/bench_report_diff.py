@@ -0,0 +1,84 @@
+"""Re-ingestion: full report recompute vs incremental snapshot refresh.
+
+Builds two local graphs from synthetic AzureHound output, the second with a
+few group memberships added and removed, stores Tier Zero reports for every
+identity at the first epoch, then refreshes them for the second epoch twice:
+recomputing every identity, and recomputing only identities whose
+neighborhood changed. Both must produce the same diffs.
+
+Usage: python bench_report_diff.py [--users 20000] [--groups 2000] [--changes 25]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import azurehound_fixture
+from bench_graph_engine import _load_engine
+from bench_keepalive import _load_module
+
+
+def _write(directory: str, items) -> str:
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, "azurehound.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": {"type": "azure", "version": 5, "count": len(items)}, "data": items}, f)
+    return path
+
+
+def _mutate(items, users: int, changes: int, seed: int = 11):
+    rng = random.Random(seed)
+    memberships = [item for item in items if item["kind"] == "AZGroupMember"]
+    for _ in range(changes):
+        group = rng.choice(memberships)["data"]
+        if group["members"] and rng.random() < 0.5:
+            group["members"].pop(rng.randrange(len(group["members"])))
+        else:
+            user = azurehound_fixture.user_id(rng.randrange(users))
+            group["members"].append({"member": {"id": user, "@odata.type": "#microsoft.graph.user"}})
+    return items
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--groups", type=int, default=2_000)
+    parser.add_argument("--changes", type=int, default=25)
+    args = parser.parse_args()
+
+    engine = _load_engine()
+    snapshots = _load_module("report_snapshots")
+    with tempfile.TemporaryDirectory() as tmp:
+        items = list(azurehound_fixture.iter_items(users=args.users, groups=args.groups))
+        old_graph = engine.LocalGraph.from_azurehound([_write(os.path.join(tmp, "old"), items)], epoch="epoch-1")
+        mutated = _mutate(items, args.users, args.changes)
+        new_graph = engine.LocalGraph.from_azurehound([_write(os.path.join(tmp, "new"), mutated)], epoch="epoch-2")
+        refs = [{"id": azurehound_fixture.user_id(i)} for i in range(args.users)]
+
+        results = {}
+        for mode in ("full", "incremental"):
+            store = snapshots.SnapshotStore(os.path.join(tmp, mode))
+            snapshots.refresh(engine.LocalGraphClient(old_graph), store, refs, tier_zero=True)
+            started = time.perf_counter()
+            graphs = {"old_graph": old_graph, "new_graph": new_graph} if mode == "incremental" else {}
+            result = snapshots.refresh(engine.LocalGraphClient(new_graph), store, refs, tier_zero=True, **graphs)
+            elapsed = time.perf_counter() - started
+            size = os.path.getsize(store.path_for("epoch-2")) / 1e6
+            results[mode] = result
+            print(
+                f"{mode:<11}: {elapsed:.2f}s recomputed={result['recomputed']} reused={result['reused']} "
+                f"changed={len(result['diffs'])} snapshot={size:.2f}MB"
+            )
+        key = lambda diffs: sorted(json.dumps(d, sort_keys=True) for d in diffs)  # noqa: E731
+        assert key(results["full"]["diffs"]) == key(results["incremental"]["diffs"]), "diffs differ"
+        print("diffs identical")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
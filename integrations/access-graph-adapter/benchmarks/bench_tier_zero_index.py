@@ -0,0 +1,78 @@
+"""Tier Zero distance index: build cost and lookup latency.
+
+Builds the index over a local graph from synthetic AzureHound output (reverse
+multi-source BFS from every Tier Zero node), reports build time, peak memory
+and index size, then compares nearest-Tier-Zero lookups from the index with
+the per-identity shortest-path search and counts API calls per report against
+the stub server with and without the index. Blast radius expansion must return
+the same closure with the index in use.
+
+Usage: python bench_tier_zero_index.py [--users 50000] [--groups 5000] [--lookups 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+
+import azurehound_fixture
+from bench_graph_engine import _load_engine, _per_call
+from bench_keepalive import _load_client, _load_module
+from stub_server import StubBloodHound, SyntheticGraph
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--groups", type=int, default=5_000)
+    parser.add_argument("--lookups", type=int, default=2_000)
+    args = parser.parse_args()
+
+    client_mod = _load_client()
+    engine = _load_engine()
+    tz_index = _load_module("tier_zero_index")
+    with tempfile.TemporaryDirectory() as tmp:
+        source = azurehound_fixture.write(os.path.join(tmp, "collect"), users=args.users, groups=args.groups)
+        local = engine.LocalGraphClient(engine.LocalGraph.from_azurehound([source]))
+        index = tz_index.TierZeroIndex.build(local)
+        path = os.path.join(tmp, "tier0.idx")
+        index.save(path)
+        stats = index.stats
+        print(
+            f"index: nodes={stats['nodes']} tier_zero={stats['tier_zero']} build={stats['build_seconds']:.2f}s "
+            f"process_peak_rss={stats['peak_rss_mb']}MB size={os.path.getsize(path) / 1e6:.2f}MB"
+        )
+        loaded = tz_index.TierZeroIndex.load(path)
+
+        users = [azurehound_fixture.user_id(i % args.users) for i in range(args.lookups)]
+        indexed = _per_call(lambda i: loaded.path(users[i]), args.lookups)
+        searched = _per_call(lambda i: local.get_tier_zero_paths(users[i], max_length=8, max_paths=1), args.lookups)
+        print(f"nearest Tier Zero path, index lookup : {indexed:9.1f} us/call")
+        print(f"nearest Tier Zero path, BFS per call : {searched:9.1f} us/call")
+        loaded.close()
+        local.close()
+
+    stub_graph = SyntheticGraph(identities=100, fanout=25, nested_fanout=3, nested_depth=2)
+    with StubBloodHound(stub_graph) as server:
+        api = client_mod.BloodHoundClient(server.base_url, "admin", "pw")
+        api.login()
+        refs = [{"id": stub_graph.identity_id(i)} for i in range(100)]
+        closure = list(api.iter_blast_radius(stub_graph.identity_id(0)))
+        before = server.requests
+        for ref in refs:
+            api.build_identity_report(ref, tier_zero=True)
+        without = (server.requests - before) / len(refs)
+        api.use_tier_zero_index(tz_index.TierZeroIndex.build(api))
+        before = server.requests
+        for ref in refs:
+            api.build_identity_report(ref, tier_zero=True)
+        with_index = (server.requests - before) / len(refs)
+        assert list(api.iter_blast_radius(stub_graph.identity_id(0))) == closure, "closure changed with the index"
+        print(f"API calls per tier_zero report: {without:.0f} without index, {with_index:.0f} with index")
+        api.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,333 @@
+"""Local stand-in for the BloodHound CE API used by the adapter benchmarks.
+
+Serves a synthetic graph over HTTP/1.1 keep-alive so benchmarks measure the
+adapter's own overhead (connections, round trips, parsing) rather than a real
+graph database. Only the endpoints and query shapes the adapter issues are
+implemented.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+class SyntheticGraph:
+    """Deterministic identity -> asset graph: `identities` users, each with `fanout` edges.
+
+    With `nested_depth > 0` every asset is also the root of a group tree
+    `nested_depth` levels deep with `nested_fanout` children per node (ids
+    `<parent>/<nnn>`); each first child links back to `asset-000000`, so
+    transitive expansions see cycles and nodes reachable more than one way.
+    """
+
+    EDGE_KINDS = ("MemberOf", "HasRole", "Owns", "AZContributor")
+    NODE_KINDS = ("Group", "Role", "Application", "Subscription")
+
+    def __init__(
+        self, identities: int = 100, fanout: int = 25, *, nested_fanout: int = 0, nested_depth: int = 0
+    ) -> None:
+        self.identities = identities
+        self.fanout = fanout
+        self.nested_fanout = nested_fanout
+        self.nested_depth = nested_depth
+
+    def identity_id(self, index: int) -> str:
+        return f"00000000-0000-0000-0000-{index:012d}"
+
+    def identity(self, query: str) -> Optional[Dict[str, Any]]:
+        query = query.lower()
+        if query.startswith("user") and query.endswith("@example.test"):
+            index = query[len("user") : -len("@example.test")]
+        elif query.startswith("00000000-0000-0000-0000-"):
+            index = query.rsplit("-", 1)[-1]
+        else:
+            return None
+        if not index.isdigit() or int(index) >= self.identities:
+            return None
+        upn = f"user{int(index)}@example.test"
+        return {
+            "objectid": self.identity_id(int(index)),
+            "name": upn.upper(),
+            "type": "User",
+            "properties": {"userprincipalname": upn},
+        }
+
+    def neighbors(self, oid: str, start: int = 0, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Edges `start..stop` of `oid`, already in (id, via) order."""
+        if oid.startswith("asset-"):
+            return self.nested(oid)[start:stop]
+        rows = []
+        for i in range(start, min(self.fanout, stop) if stop is not None else self.fanout):
+            kind = self.NODE_KINDS[i % len(self.NODE_KINDS)]
+            rows.append(
+                {
+                    "id": f"asset-{i:06d}",
+                    "kind": kind,
+                    "name": f"{kind.upper()}-{i}" + ("-ADMINS" if i % 7 == 0 else ""),
+                    "via": self.EDGE_KINDS[i % len(self.EDGE_KINDS)],
+                }
+            )
+        return rows
+
+    def nested(self, oid: str) -> List[Dict[str, Any]]:
+        if oid.count("/") >= self.nested_depth:
+            return []
+        rows = [
+            {"id": f"{oid}/{j:03d}", "kind": "Group", "name": f"GROUP-{oid}/{j}", "via": self.EDGE_KINDS[j % 2]}
+            for j in range(self.nested_fanout)
+        ]
+        if rows and oid != "asset-000000":
+            rows.insert(0, {"id": "asset-000000", "kind": "Group", "name": "GROUP-0-ADMINS", "via": "MemberOf"})
+        return rows
+
+    def tier_zero_nodes(self) -> List[Dict[str, Any]]:
+        """Tier Zero seeds for the reverse index: the shared `asset-000000` group."""
+        return [{"id": "asset-000000", "kind": "Group"}] if self.fanout else []
+
+    def predecessors(self, oid: str) -> List[Dict[str, Any]]:
+        """Edges into `oid` as `{id, kind, via}` rows (the reverse of `neighbors`/`nested`)."""
+        rows: List[Dict[str, Any]] = []
+        if "/" in oid:
+            parent, child = oid.rsplit("/", 1)
+            rows.append({"id": parent, "kind": "Group", "via": self.EDGE_KINDS[int(child) % 2]})
+        elif oid.startswith("asset-") and int(oid[len("asset-") :]) < self.fanout:
+            i = int(oid[len("asset-") :])
+            via = self.EDGE_KINDS[i % len(self.EDGE_KINDS)]
+            rows.extend({"id": self.identity_id(n), "kind": "User", "via": via} for n in range(self.identities))
+        if oid == "asset-000000" and self.nested_fanout:
+            rows.extend(
+                {"id": node, "kind": "Group", "via": "MemberOf"}
+                for node in self._nested_nodes()
+                if node.endswith("/000") and not node.startswith("asset-000000/")
+            )
+        return rows
+
+    def _nested_nodes(self):
+        level = [f"asset-{i:06d}" for i in range(self.fanout)]
+        for _ in range(self.nested_depth):
+            level = [f"{node}/{j:03d}" for node in level for j in range(self.nested_fanout)]
+            yield from level
+
+    def tier_zero_paths(self, start: str, max_paths: int) -> List[Dict[str, Any]]:
+        rows = []
+        for i in range(min(max_paths, 30)):
+            target = f"tier-zero-{i:03d}"
+            hops = self.path(start, target)["path"]
+            rows.append(
+                {
+                    "target": target,
+                    "nodes": [{"objectid": h["objectid"], "type": h["type"]} for h in hops],
+                    "edges": [h["relationship"] for h in hops[:-1]],
+                }
+            )
+        return rows
+
+    def path(self, start: str, end: str) -> Dict[str, Any]:
+        return {
+            "path": [
+                {"objectid": start, "type": "User", "relationship": "MemberOf"},
+                {"objectid": "asset-000000", "type": "Group", "relationship": "HasRole"},
+                {"objectid": end, "type": "Role", "relationship": None},
+            ]
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "StubBloodHound"
+
+    def setup(self) -> None:
+        super().setup()
+        # Like Go's net/http (BloodHound's server), disable Nagle so headers and
+        # body written separately do not stall on delayed ACKs.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:  # noqa: N802
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or "0")
+        raw = self.rfile.read(length) if length else b""
+        body = json.loads(raw.decode("utf-8")) if raw else {}
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        status, payload = self.server.handle(method, self.path, body, dict(self.headers))
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A003
+        return
+
+
+class StubBloodHound(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self, graph: Optional[SyntheticGraph] = None, *, latency: float = 0.0, token_ttl: Optional[float] = None
+    ) -> None:
+        """`token_ttl` (seconds) makes login issue expiring JWT-style tokens and
+        answer 401 to requests without a valid one; by default auth is not checked."""
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.graph = graph or SyntheticGraph()
+        self.latency = latency
+        self.token_ttl = token_ttl
+        self.requests = 0
+        self.logins = 0
+        self.unauthorized = 0
+        self.revoked: set = set()
+        self.epoch = "2026-01-01T00:00:00Z"
+        self.uploads: Dict[int, List[int]] = {}
+        self.closed_jobs: List[int] = []
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubBloodHound":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def handle(self, method: str, raw_path: str, body: Dict[str, Any], headers: Dict[str, str]) -> Tuple[int, Any]:
+        self.requests += 1
+        parsed = urlparse(raw_path)
+        path = parsed.path
+        if path == "/api/v2/login":
+            self.logins += 1
+            return 200, {"data": {"session_token": self._issue_token(), "user_id": "stub"}}
+        if self.token_ttl is not None and not self._token_valid(headers.get("Authorization", "")):
+            self.unauthorized += 1
+            return 401, {"errors": [{"message": "unauthorized"}]}
+        if path == "/api/v2/file-upload/start":
+            job_id = len(self.uploads) + 1
+            self.uploads[job_id] = []
+            return 201, {"data": {"id": job_id}}
+        if path.startswith("/api/v2/file-upload/"):
+            job_id = int(path.split("/")[4])
+            if job_id not in self.uploads:
+                return 404, {"errors": [{"message": "job not found"}]}
+            if job_id in self.closed_jobs:
+                return 409, {"errors": [{"message": "job is not running"}]}
+            if path.endswith("/end"):
+                self.closed_jobs.append(job_id)
+                return 200, {}
+            self.uploads[job_id].append(int((body.get("meta") or {}).get("count", 0)))
+            return 202, {}
+        if path == "/api/v2/datapipe/status":
+            return 200, {"data": {"status": "idle", "last_complete_analysis_at": self.epoch}}
+        if path == "/api/v2/graph-search":
+            query = parse_qs(parsed.query).get("query", [""])[0]
+            found = self.graph.identity(query)
+            return 200, {"data": [found] if found else []}
+        if path == "/api/v2/graphs/cypher":
+            return 200, {"data": self._cypher(body.get("parameters") or {})}
+        if path == "/api/v2/pathfinding":
+            return 200, {"data": self.graph.path(body.get("start_node", ""), body.get("end_node", ""))}
+        return 404, {"errors": [{"message": "not found"}]}
+
+    def _issue_token(self) -> str:
+        if self.token_ttl is None:
+            return "stub-token"
+        claims = {"exp": time.time() + self.token_ttl, "jti": self.logins}
+        payload = base64.urlsafe_b64encode(json.dumps(claims).encode("utf-8")).decode("ascii").rstrip("=")
+        return f"stub.{payload}.sig"
+
+    def _token_valid(self, authorization: str) -> bool:
+        token = authorization[len("Bearer ") :] if authorization.startswith("Bearer ") else ""
+        if token.count(".") != 2 or token in self.revoked:
+            return False
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return claims["exp"] > time.time()
+
+    def _cypher(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Answer the adapter's cypher shapes, told apart by their parameters."""
+        limit = int(params.get("limit", 100))
+        if "refs" in params:
+            rows = []
+            for ref in params["refs"]:
+                found = self.graph.identity(ref)
+                if found:
+                    rows.append(
+                        {
+                            "ref": ref,
+                            "objectid": found["objectid"],
+                            "name": found["name"],
+                            "type": found["type"],
+                            "upn": found["properties"]["userprincipalname"],
+                        }
+                    )
+            return rows
+        if "max_paths" in params:
+            if "oids" in params:
+                return [
+                    dict(row, source=oid)
+                    for oid in params["oids"]
+                    for row in self.graph.tier_zero_paths(oid, int(params["max_paths"]))
+                ]
+            return self.graph.tier_zero_paths(params.get("oid", ""), int(params["max_paths"]))
+        if "oids" in params and "target" in params:
+            return [
+                {
+                    "source": oid,
+                    "nodes": [
+                        {"objectid": hop["objectid"], "type": hop["type"]}
+                        for hop in self.graph.path(oid, params["target"])["path"]
+                    ],
+                    "edges": [hop["relationship"] for hop in self.graph.path(oid, params["target"])["path"][:-1]],
+                }
+                for oid in params["oids"]
+            ]
+        if "targets" in params:
+            hops: Dict[str, Dict[str, Any]] = {}
+            for tid in params["targets"]:
+                for row in self.graph.predecessors(tid):
+                    if row["id"] <= params["after_id"]:
+                        continue
+                    best = hops.get(row["id"])
+                    if best is None or (tid, row["via"]) < (best["next_hop"], best["via"]):
+                        hops[row["id"]] = dict(row, next_hop=tid)
+            return [hops[i] for i in sorted(hops)[: int(params["page_size"])]]
+        if "frontier" in params:
+            kinds = set(params["edge_kinds"])
+            targets: Dict[str, Dict[str, Any]] = {}
+            for fid in params["frontier"]:
+                for row in self.graph.neighbors(fid):
+                    if kinds and row["via"] not in kinds:
+                        continue
+                    if row["id"] not in targets or row["via"] < targets[row["id"]]["via"]:
+                        targets[row["id"]] = row
+            ids = sorted(i for i in targets if i > params["after_id"])[: int(params["page_size"])]
+            return [targets[i] for i in ids]
+        if set(params) == {"after_id", "page_size"}:
+            # iter_tier_zero_nodes: the only shape with nothing but the cursor.
+            return [row for row in self.graph.tier_zero_nodes() if row["id"] > params["after_id"]]
+        if "after_id" in params:
+            # Asset ids are unique and zero-padded, so the cursor maps to an offset.
+            start = int(params["after_id"].rsplit("-", 1)[-1]) + 1 if params["after_id"] else 0
+            return self.graph.neighbors(params.get("oid", ""), start, start + int(params["page_size"]))
+        if "oids" in params:
+            return [
+                dict(row, source=oid) for oid in params["oids"] for row in self.graph.neighbors(oid)[:limit]
+            ]
+        return self.graph.neighbors(params.get("oid", ""))[:limit]
@@ -0,0 +1,134 @@
+"""Opt-in lookup cache for the BloodHound access graph adapter.
+
+Size-bounded LRU with a per-entry TTL. Entries are keyed by their source (the
+BloodHound instance, e.g. its base URL), that source's ingestion epoch, and the
+query shape and arguments. A new AzureHound import (a new epoch) makes the
+source's older entries unreachable; they are dropped when the epoch change is
+observed. Each source has its own epoch and check time, so one cache can serve
+clients of several instances without one instance's import evicting another's
+entries.
+
+The adapter does not cache unless a `GraphCache` is passed to it explicitly.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+class GraphCache:
+    """Thread-safe LRU + TTL cache with hit/miss counters.
+
+    - `max_entries`: LRU capacity; the least recently used entry is evicted.
+    - `ttl_seconds`: maximum age of an entry, independent of the epoch.
+    - `epoch_check_interval`: how often (seconds) the adapter re-reads a
+      source's ingestion epoch from BloodHound; between checks the last epoch
+      is trusted.
+
+    The epoch methods and `get`/`put` take the entry's `source` (default None,
+    for a cache used with a single instance).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 10_000,
+        ttl_seconds: float = 900.0,
+        epoch_check_interval: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.epoch_check_interval = epoch_check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[Hashable, Any, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._epochs: Dict[Hashable, Optional[str]] = {}
+        self._epoch_checked_at: Dict[Hashable, float] = {}
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def epoch_of(self, source: Hashable = None) -> Optional[str]:
+        with self._lock:
+            return self._epochs.get(source)
+
+    def epoch_is_stale(self, source: Hashable = None) -> bool:
+        """True when the adapter should ask `source` for its current epoch."""
+        with self._lock:
+            checked_at = self._epoch_checked_at.get(source)
+            if checked_at is None:
+                return True
+            return self._clock() - checked_at >= self.epoch_check_interval
+
+    def observe_epoch(self, epoch: Optional[str], source: Hashable = None) -> bool:
+        """Record the current ingestion epoch of `source`; returns True if it changed.
+
+        A change drops the entries of `source`; other sources keep theirs.
+        """
+        with self._lock:
+            first = source not in self._epoch_checked_at
+            self._epoch_checked_at[source] = self._clock()
+            if not first and epoch == self._epochs.get(source):
+                return False
+            changed = not first and self._epochs.get(source) is not None
+            self._epochs[source] = epoch
+            stale = [full_key for full_key in self._entries if full_key[0] == source]
+            for full_key in stale:
+                del self._entries[full_key]
+            if changed:
+                self._counters["invalidations"] += 1
+            return changed
+
+    def get(self, key: Hashable, source: Hashable = None) -> Any:
+        """Return a copy of the cached value, or `_MISSING`."""
+        now = self._clock()
+        with self._lock:
+            full_key = (source, self._epochs.get(source), key)
+            entry = self._entries.get(full_key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return _MISSING
+            stored_at, value = entry
+            if now - stored_at > self.ttl_seconds:
+                del self._entries[full_key]
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return _MISSING
+            self._entries.move_to_end(full_key)
+            self._counters["hits"] += 1
+        return copy.deepcopy(value)
+
+    def put(self, key: Hashable, value: Any, source: Hashable = None) -> None:
+        stored = copy.deepcopy(value)
+        with self._lock:
+            full_key = (source, self._epochs.get(source), key)
+            self._entries[full_key] = (self._clock(), stored)
+            self._entries.move_to_end(full_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "size": len(self._entries),
+                "hit_ratio": (self._counters["hits"] / lookups) if lookups else 0.0,
+                "epochs": dict(self._epochs),
+            }
+
+
+def is_missing(value: Any) -> bool:
+    return value is _MISSING
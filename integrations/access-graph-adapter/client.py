@@ -4,36 +4,142 @@ Connects to the BloodHound HTTP API, retrieves identities and reachable assets,
 computes critical paths via the API, and returns normalized dictionaries that
 match docs/contracts/access-graph-adapter.md.
 
-No Neo4j/Postgres access. No caching. No business logic.
+No Neo4j/Postgres access. No business logic. No caching unless a
+`GraphCache` (see cache.py) is passed in explicitly.
+
+HTTP calls go through a pooled keep-alive transport (see transport.py) so a
+report reuses one connection instead of reconnecting for every API call.
+Session tokens come from a process-wide `SessionManager` (see session.py):
+clients log in on first use, refresh before expiry and retry once on 401.
 """
 
 import json
-import urllib.error
 import urllib.parse
-import urllib.request
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+if __package__:
+    from . import (
+        transport as _transport,
+        cache as _cache,
+        session as _session,
+        privilege_classifier as _classifier,
+        compact_report as _compact,
+    )
+else:  # a script in this directory (python graph_engine.py ...), not the package
+    import transport as _transport
+    import cache as _cache
+    import session as _session
+    import privilege_classifier as _classifier
+    import compact_report as _compact
+
+KeepAliveTransport = _transport.KeepAliveTransport
+TransportError = _transport.TransportError
+UrllibTransport = _transport.UrllibTransport
+GraphCache = _cache.GraphCache
+SessionManager = _session.SessionManager
+PrivilegeClassifier = _classifier.PrivilegeClassifier
+CompactReport = _compact.CompactReport
+
+
+DEFAULT_MAX_PATH_LENGTH = 6
+DEFAULT_MAX_PATHS = 25
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_MAX_DEPTH = 3
+
+# BloodHound CE marks Tier Zero with the `admin_tier_0` system tag; older
+# imports only carry the legacy `highvalue` flag.
+_TIER_ZERO_PREDICATE = "(t.highvalue = true OR coalesce(t.system_tags, '') CONTAINS 'admin_tier_0')"
+
+
+class BloodHoundAPIError(RuntimeError):
+    """BloodHound answered with an error status or could not be reached.
+
+    `status` is the HTTP status code, or None when the API was unreachable.
+    """
+
+    def __init__(self, message: str, status: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status = status
 
 
 class BloodHoundClient:
-    def __init__(self, base_url: str, username: str, password: str):
+    def __init__(
+        self,
+        base_url: str,
+        username: str,
+        password: str,
+        *,
+        timeout: float = 30.0,
+        pool_size: int = 8,
+        idle_timeout: float = 60.0,
+        transport: Optional[Any] = None,
+        cache: Optional[GraphCache] = None,
+        session: Optional[SessionManager] = None,
+    ):
         self.base_url = base_url.rstrip("/")
         self.username = username
         self.password = password
-        self.session_token: Optional[str] = None
+        # Shared with every other client for the same server and user unless
+        # a dedicated manager is passed in.
+        self.session = session if session is not None else SessionManager.shared(self.base_url, username)
+        self.tier_zero_index: Optional[Any] = None
+        if transport is None:
+            transport = KeepAliveTransport(
+                self.base_url,
+                pool_size=pool_size,
+                idle_timeout=idle_timeout,
+                timeout=timeout,
+            )
+        self.transport = transport
+        self.cache = cache
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.transport.close()
+
+    def __enter__(self) -> "BloodHoundClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def session_token(self) -> Optional[str]:
+        return self.session.current_token
+
+    @session_token.setter
+    def session_token(self, token: Optional[str]) -> None:
+        self.session.set_token(token)
 
     def login(self) -> str:
+        """Return a valid session token, logging in only if the shared session has none."""
+        return self.session.token(self._authenticate)
+
+    def _authenticate(self) -> Tuple[str, Optional[float]]:
         body = {
             "login_method": "secret",
             "username": self.username,
             "secret": self.password,
         }
-        data = self._request("/api/v2/login", method="POST", body=body)
-        token = data["data"]["session_token"]
-        self.session_token = token
-        return token
+        data = self._request("/api/v2/login", method="POST", body=body, authenticated=False)
+        return data["data"]["session_token"], None
+
+    def get_ingestion_epoch(self) -> Optional[str]:
+        """Timestamp of BloodHound's last completed analysis; changes with every ingestion."""
+        data = self._request("/api/v2/datapipe/status", method="GET")
+        status = data.get("data") or {}
+        return status.get("last_complete_analysis_at")
+
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Hit/miss counters of the lookup cache, or None when caching is off."""
+        return self.cache.stats() if self.cache is not None else None
 
     def get_identity(self, query: str, node_type: str = "user") -> Dict:
         """Resolve an identity by search query (UPN, display name, object id)."""
+        return self._cached(("identity", query, node_type), lambda: self._search_identity(query, node_type))
+
+    def _search_identity(self, query: str, node_type: str) -> Dict:
         params = urllib.parse.urlencode({"query": query, "type": node_type})
         data = self._request(f"/api/v2/graph-search?{params}", method="GET")
         items = data.get("data", [])
@@ -47,28 +153,166 @@ class BloodHoundClient:
         This uses the official API endpoint `/api/v2/graphs/cypher` (still a
         BloodHound-controlled call) to avoid direct Neo4j connections.
         """
+        return self._cached(
+            ("reachable", object_id, limit), lambda: self._query_reachable_assets(object_id, limit)
+        )
+
+    def _query_reachable_assets(self, object_id: str, limit: int) -> List[Dict]:
         cypher = (
             "MATCH (n {objectid: $oid})-[r]->(m) "
             "RETURN m.objectid AS id, labels(m)[0] AS kind, m.name AS name, type(r) AS via "
             "LIMIT $limit"
         )
-        payload = {"query": cypher, "parameters": {"oid": object_id, "limit": limit}}
-        data = self._request("/api/v2/graphs/cypher", method="POST", body=payload)
-        assets = []
-        for row in data.get("data", []):
-            assets.append(
-                {
-                    "id": row.get("id"),
-                    "name": row.get("name"),
-                    "kind": (row.get("kind") or "asset").lower(),
-                    "via": (row.get("via") or "edge").lower(),
-                    "confidence": "graph",
-                }
+        data = self._cypher(cypher, {"oid": object_id, "limit": limit})
+        return [_normalize_asset(row) for row in data.get("data", [])]
+
+    def iter_reachable_assets(
+        self,
+        object_id: str,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[Sequence[str]] = None,
+    ) -> Iterator[Dict]:
+        """Stream every directly reachable asset, without the `limit` cap.
+
+        Assets are fetched `page_size` rows per cypher call in a stable order
+        (target object id, then edge kind) and yielded one by one, so memory
+        stays bounded by one page however many edges the identity has. Pass the
+        `cursor` returned by `iter_reachable_asset_pages` to resume after a page.
+        Results are not cached.
+        """
+        for assets, _ in self.iter_reachable_asset_pages(object_id, page_size=page_size, cursor=cursor):
+            yield from assets
+
+    def iter_reachable_asset_pages(
+        self,
+        object_id: str,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[Sequence[str]] = None,
+    ) -> Iterator[Tuple[List[Dict], Optional[Tuple[str, str]]]]:
+        """Page-level variant of `iter_reachable_assets`.
+
+        Yields `(assets, next_cursor)`; `next_cursor` is the `(object id, edge
+        kind)` of the page's last row (JSON-serializable as a list), or None
+        after the last page.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be >= 1")
+        after = _page_cursor(cursor)
+        while True:
+            rows = self._query_reachable_page(object_id, after, page_size)
+            if not rows:
+                return
+            last = rows[-1]
+            after = (last.get("id") or "", last.get("via") or "")
+            next_cursor = after if len(rows) == page_size else None
+            yield [_normalize_asset(row) for row in rows], next_cursor
+            if next_cursor is None:
+                return
+
+    def _query_reachable_page(self, object_id: str, after: Tuple[str, str], page_size: int) -> List[Dict]:
+        # Keyset pagination: DISTINCT makes (id, via) unique, so "strictly
+        # after the cursor" neither skips nor repeats rows across pages.
+        cypher = (
+            "MATCH (n {objectid: $oid})-[r]->(m) "
+            "WITH DISTINCT m, coalesce(m.objectid, '') AS id, type(r) AS via "
+            "WHERE id > $after_id OR (id = $after_id AND via > $after_via) "
+            "RETURN id, labels(m)[0] AS kind, m.name AS name, via "
+            "ORDER BY id ASC, via ASC LIMIT $page_size"
+        )
+        params = {"oid": object_id, "after_id": after[0], "after_via": after[1], "page_size": page_size}
+        return self._cypher(cypher, params).get("data", [])
+
+    def get_blast_radius(
+        self,
+        object_id: str,
+        *,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        edge_kinds: Optional[Sequence[str]] = None,
+        frontier_batch: int = 500,
+        page_size: int = 5000,
+    ) -> List[Dict]:
+        """List form of `iter_blast_radius`."""
+        return list(
+            self.iter_blast_radius(
+                object_id,
+                max_depth=max_depth,
+                edge_kinds=edge_kinds,
+                frontier_batch=frontier_batch,
+                page_size=page_size,
             )
-        return assets
+        )
+
+    def iter_blast_radius(
+        self,
+        object_id: str,
+        *,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        edge_kinds: Optional[Sequence[str]] = None,
+        frontier_batch: int = 500,
+        page_size: int = 5000,
+    ) -> Iterator[Dict]:
+        """Transitive reachability (nested groups, role chains) up to `max_depth` hops.
+
+        Breadth-first, one level at a time: each level's frontier is expanded
+        `frontier_batch` nodes per cypher call, and each call returns targets
+        deduplicated server-side and paged `page_size` rows at a time, so no
+        single API call grows with the size of the closure. `edge_kinds`
+        (e.g. `["MemberOf", "HasRole"]`) restricts the edges followed.
+
+        Yields each asset once, in order of increasing `depth` (the minimum hop
+        distance from the identity); `via` is the edge kind it was reached by.
+        The identity itself is not yielded.
+        """
+        _check_expansion_limits(max_depth, frontier_batch, page_size)
+        kinds = list(edge_kinds or [])
+        seen = {object_id}
+        frontier = [object_id]
+        for depth in range(1, max_depth + 1):
+            next_frontier = []
+            for batch in _batches(frontier, frontier_batch):
+                after = ""
+                while True:
+                    rows = self._query_expansion_page(batch, kinds, after, page_size)
+                    for row in rows:
+                        asset_id = row.get("id")
+                        if not asset_id or asset_id in seen:
+                            continue
+                        seen.add(asset_id)
+                        next_frontier.append(asset_id)
+                        asset = _normalize_asset(row)
+                        asset["depth"] = depth
+                        yield asset
+                    if len(rows) < page_size:
+                        break
+                    after = rows[-1].get("id") or ""
+            if not next_frontier:
+                return
+            frontier = next_frontier
+
+    def _query_expansion_page(
+        self, frontier: List[str], edge_kinds: List[str], after: str, page_size: int
+    ) -> List[Dict]:
+        # Grouping by m deduplicates targets reached from several frontier
+        # nodes before they are sent; the id cursor pages large levels.
+        cypher = (
+            "UNWIND $frontier AS fid "
+            "MATCH (n {objectid: fid})-[r]->(m) "
+            "WHERE size($edge_kinds) = 0 OR type(r) IN $edge_kinds "
+            "WITH m, coalesce(m.objectid, '') AS id, min(type(r)) AS via "
+            "WHERE id > $after_id "
+            "RETURN id, labels(m)[0] AS kind, m.name AS name, via "
+            "ORDER BY id ASC LIMIT $page_size"
+        )
+        params = {"frontier": frontier, "edge_kinds": edge_kinds, "after_id": after, "page_size": page_size}
+        return self._cypher(cypher, params).get("data", [])
 
     def get_critical_path(self, start_id: str, target_id: str) -> Optional[Dict]:
         """Fetch a shortest path between two nodes using the BloodHound pathfinding API."""
+        return self._cached(("path", start_id, target_id), lambda: self._query_critical_path(start_id, target_id))
+
+    def _query_critical_path(self, start_id: str, target_id: str) -> Optional[Dict]:
         body = {"start_node": start_id, "end_node": target_id}
         data = self._request("/api/v2/pathfinding", method="GET", body=body)
         path = data.get("data")
@@ -83,17 +327,115 @@ class BloodHoundClient:
                     "edge": hop.get("relationship") or hop.get("edge"),
                 }
             )
-        return {
-            "from": start_id,
-            "to": target_id,
-            "length": len(hops),
-            "hops": hops,
-        }
+        return _critical_path(start_id, target_id, hops)
+
+    def get_tier_zero_paths(
+        self,
+        start_id: str,
+        *,
+        max_length: int = DEFAULT_MAX_PATH_LENGTH,
+        max_paths: int = DEFAULT_MAX_PATHS,
+    ) -> List[Dict]:
+        """Shortest paths from `start_id` to every high-value / Tier Zero node.
 
-    def build_identity_report(self, identity_ref: Dict, critical_target_id: Optional[str] = None) -> Dict:
-        """High-level helper that assembles the contract-compliant payload."""
-        if not self.session_token:
-            self.login()
+        One server-side cypher call computes a shortest path per reachable Tier
+        Zero target (nodes flagged `highvalue` or tagged `admin_tier_0`), keeps
+        paths of at most `max_length` edges and returns the `max_paths` shortest,
+        ordered by length then target id.
+        """
+        _check_path_limits(max_length, max_paths)
+        return self._cached(
+            ("tier_zero_paths", start_id, max_length, max_paths),
+            lambda: self._query_tier_zero_paths(start_id, max_length, max_paths),
+        )
+
+    def _query_tier_zero_paths(self, start_id: str, max_length: int, max_paths: int) -> List[Dict]:
+        cypher = (
+            "MATCH (s {objectid: $oid}) "
+            f"MATCH (t) WHERE {_TIER_ZERO_PREDICATE} AND t <> s "
+            f"MATCH p = shortestPath((s)-[*1..{max_length}]->(t)) "
+            "WITH t, p ORDER BY length(p) ASC, t.objectid ASC LIMIT $max_paths "
+            "RETURN t.objectid AS target, [x IN nodes(p) | {objectid: x.objectid, type: labels(x)[0]}] AS nodes, "
+            "[r IN relationships(p) | type(r)] AS edges"
+        )
+        data = self._cypher(cypher, {"oid": start_id, "max_paths": max_paths})
+        return [
+            _critical_path(start_id, row.get("target"), _hops_from_cypher(row)) for row in data.get("data", [])
+        ]
+
+    def iter_tier_zero_nodes(self, *, page_size: int = 5000) -> Iterator[Dict]:
+        """`{id, kind}` of every high-value / Tier Zero node, in id order, paged."""
+        after = ""
+        while True:
+            rows = self._query_tier_zero_page(after, page_size)
+            yield from rows
+            if len(rows) < page_size:
+                return
+            after = rows[-1].get("id") or ""
+
+    def _query_tier_zero_page(self, after: str, page_size: int) -> List[Dict]:
+        cypher = (
+            f"MATCH (t) WHERE {_TIER_ZERO_PREDICATE} "
+            "WITH t, coalesce(t.objectid, '') AS id WHERE id > $after_id "
+            "RETURN id, labels(t)[0] AS kind ORDER BY id ASC LIMIT $page_size"
+        )
+        return self._cypher(cypher, {"after_id": after, "page_size": page_size}).get("data", [])
+
+    def _query_reverse_expansion_page(self, targets: List[str], after: str, page_size: int) -> List[Dict]:
+        # Predecessors of a BFS level toward Tier Zero; each keeps the lowest
+        # (target id, edge kind) as its next hop so the index is deterministic.
+        cypher = (
+            "UNWIND $targets AS tid "
+            "MATCH (m)-[r]->(t {objectid: tid}) "
+            "WITH m, coalesce(m.objectid, '') AS id, tid, type(r) AS via WHERE id > $after_id "
+            "WITH m, id, tid, via ORDER BY tid ASC, via ASC "
+            "WITH id, labels(m)[0] AS kind, collect([tid, via])[0] AS hop "
+            "RETURN id, kind, hop[0] AS next_hop, hop[1] AS via "
+            "ORDER BY id ASC LIMIT $page_size"
+        )
+        params = {"targets": targets, "after_id": after, "page_size": page_size}
+        return self._cypher(cypher, params).get("data", [])
+
+    def use_tier_zero_index(self, index: Optional[Any], *, check_epoch: bool = True) -> None:
+        """Answer Tier Zero path lookups from a precomputed `TierZeroIndex` (see tier_zero_index.py).
+
+        With `check_epoch` the index must have been built for BloodHound's
+        current ingestion epoch (one API call now, none per lookup afterwards).
+        Pass None to go back to cypher queries.
+        """
+        if index is not None and check_epoch:
+            epoch = self.get_ingestion_epoch()
+            if index.epoch != epoch:
+                raise ValueError(f"tier zero index is for epoch {index.epoch!r}, BloodHound is at {epoch!r}")
+        self.tier_zero_index = index
+
+    def get_nearest_tier_zero_path(self, start_id: str) -> Optional[Dict]:
+        """Shortest path to the closest Tier Zero node; no API call when an index is in use."""
+        if self.tier_zero_index is not None:
+            return self.tier_zero_index.path(start_id)
+        paths = self.get_tier_zero_paths(start_id, max_length=DEFAULT_MAX_PATH_LENGTH, max_paths=1)
+        return paths[0] if paths else None
+
+    def build_identity_report(
+        self,
+        identity_ref: Dict,
+        critical_target_id: Optional[str] = None,
+        *,
+        tier_zero: bool = False,
+        max_path_length: int = DEFAULT_MAX_PATH_LENGTH,
+        max_paths: int = DEFAULT_MAX_PATHS,
+        compact: bool = False,
+    ) -> Dict:
+        """High-level helper that assembles the contract-compliant payload.
+
+        With `tier_zero=True`, `critical_paths` also holds the shortest paths to
+        every Tier Zero node (see `get_tier_zero_paths`). When a Tier Zero index
+        is in use (`use_tier_zero_index`) it holds the path to the nearest Tier
+        Zero node instead, read from the index without an API call.
+
+        With `compact=True` the report is a columnar `CompactReport` (see
+        compact_report.py), a read-only mapping with the same keys.
+        """
         resolved = self.get_identity(identity_ref.get("id") or identity_ref.get("upn") or "")
         oid = resolved.get("objectid") or resolved.get("id")
         reachable = self.get_reachable_assets(oid)
@@ -102,39 +444,345 @@ class BloodHoundClient:
             path = self.get_critical_path(oid, critical_target_id)
             if path:
                 critical.append(path)
-        privileges = [
-            {
-                "target_id": asset.get("id"),
-                "privilege": "admin" if "admin" in (asset.get("name") or "").lower() else "read",
-                "evidence": "graph_edge",
-                "source": "bloodhound",
+        if tier_zero:
+            if self.tier_zero_index is not None:
+                paths = _indexed_paths(self.tier_zero_index, oid, max_path_length)
+            else:
+                paths = self.get_tier_zero_paths(oid, max_length=max_path_length, max_paths=max_paths)
+            critical = _merge_paths(critical, paths)
+        return _assemble_report(resolved, reachable, critical, compact)
+
+    def build_identity_reports(
+        self,
+        identity_refs: List[Dict],
+        critical_target_id: Optional[str] = None,
+        *,
+        batch_size: int = 200,
+        limit: int = 100,
+        tier_zero: bool = False,
+        max_path_length: int = DEFAULT_MAX_PATH_LENGTH,
+        max_paths: int = DEFAULT_MAX_PATHS,
+        compact: bool = False,
+    ) -> List[Optional[Dict]]:
+        """Bulk variant of `build_identity_report`.
+
+        Identities are resolved and expanded with one `UNWIND $oids ...` cypher
+        call per batch of at most `batch_size` identities (plus one shortest-path
+        cypher per batch when `critical_target_id` is set), instead of three or
+        four calls per identity. References the bulk lookup cannot match by
+        object id or UPN fall back to the per-identity graph search.
+
+        Returns one report per input reference, in input order; `None` where the
+        identity cannot be resolved upstream. `limit` caps reachable assets per
+        identity, as in `get_reachable_assets`. `tier_zero` adds Tier Zero
+        paths with one more cypher call per batch. `compact` as in
+        `build_identity_report`.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        if tier_zero:
+            _check_path_limits(max_path_length, max_paths)
+
+        queries = [ref.get("id") or ref.get("upn") or "" for ref in identity_refs]
+        resolved_by_query: Dict[str, Dict] = {}
+        distinct = [q for q in dict.fromkeys(queries) if q]
+        for batch in _batches(distinct, batch_size):
+            resolved_by_query.update(self._resolve_identities(batch))
+        for query in distinct:
+            if query not in resolved_by_query:
+                try:
+                    resolved_by_query[query] = self.get_identity(query)
+                except LookupError:
+                    continue
+
+        oids = list(dict.fromkeys(_object_id(r) for r in resolved_by_query.values()))
+        reachable_by_oid: Dict[str, List[Dict]] = {oid: [] for oid in oids}
+        paths_by_oid: Dict[str, Dict] = {}
+        tier_zero_by_oid: Dict[str, List[Dict]] = {}
+        for batch in _batches(oids, batch_size):
+            for oid, assets in self._reachable_assets_bulk(batch, limit).items():
+                reachable_by_oid[oid] = assets
+            if critical_target_id:
+                paths_by_oid.update(self._critical_paths_bulk(batch, critical_target_id))
+            if tier_zero and self.tier_zero_index is None:
+                tier_zero_by_oid.update(self._tier_zero_paths_bulk(batch, max_path_length, max_paths))
+            elif tier_zero:
+                tier_zero_by_oid.update(
+                    (oid, _indexed_paths(self.tier_zero_index, oid, max_path_length)) for oid in batch
+                )
+
+        reports: List[Optional[Dict]] = []
+        for query in queries:
+            resolved = resolved_by_query.get(query)
+            if resolved is None:
+                reports.append(None)
+                continue
+            oid = _object_id(resolved)
+            critical = [paths_by_oid[oid]] if oid in paths_by_oid else []
+            if tier_zero:
+                critical = _merge_paths(critical, tier_zero_by_oid.get(oid, []))
+            reports.append(_assemble_report(resolved, list(reachable_by_oid.get(oid, [])), critical, compact))
+        return reports
+
+    def _resolve_identities(self, queries: List[str]) -> Dict[str, Dict]:
+        # Two label-scoped equality matches (object id first, then name) so both
+        # hit the `Base` property indexes; an unlabelled `OR` scans every node.
+        # Nodes outside `Base` (Azure's `AZBase`) fall back to `get_identity`.
+        cypher = (
+            "UNWIND $refs AS ref "
+            "OPTIONAL MATCH (a:Base {objectid: toUpper(ref)}) "
+            "OPTIONAL MATCH (b:Base {name: toUpper(ref)}) WHERE a IS NULL "
+            "WITH ref, coalesce(a, b) AS n WHERE n IS NOT NULL "
+            "RETURN ref, n.objectid AS objectid, n.name AS name, labels(n)[0] AS type, "
+            "n.userprincipalname AS upn"
+        )
+        data = self._cypher(cypher, {"refs": queries})
+        resolved: Dict[str, Dict] = {}
+        for row in data.get("data", []):
+            ref = row.get("ref")
+            if ref in resolved or not row.get("objectid"):
+                continue
+            resolved[ref] = {
+                "objectid": row.get("objectid"),
+                "name": row.get("name"),
+                "type": row.get("type"),
+                "properties": {"userprincipalname": row.get("upn")} if row.get("upn") else {},
             }
-            for asset in reachable
-        ]
-        return {
-            "identity": {
-                "id": oid,
-                "upn": resolved.get("properties", {}).get("userprincipalname") or resolved.get("name"),
-                "display_name": resolved.get("name"),
-                "type": (resolved.get("type") or "identity").lower(),
-            },
-            "reachable_assets": reachable,
-            "critical_paths": critical,
-            "privilege_classification": privileges,
-        }
+        return resolved
+
+    def _reachable_assets_bulk(self, oids: List[str], limit: int) -> Dict[str, List[Dict]]:
+        cypher = (
+            "UNWIND $oids AS oid "
+            "MATCH (n {objectid: oid})-[r]->(m) "
+            "WITH oid, collect({id: m.objectid, kind: labels(m)[0], name: m.name, via: type(r)})[..$limit] AS assets "
+            "UNWIND assets AS a "
+            "RETURN oid AS source, a.id AS id, a.kind AS kind, a.name AS name, a.via AS via"
+        )
+        data = self._cypher(cypher, {"oids": oids, "limit": limit})
+        grouped: Dict[str, List[Dict]] = {}
+        for row in data.get("data", []):
+            grouped.setdefault(row.get("source"), []).append(_normalize_asset(row))
+        return grouped
+
+    def _critical_paths_bulk(self, oids: List[str], target_id: str) -> Dict[str, Dict]:
+        cypher = (
+            "UNWIND $oids AS oid "
+            "MATCH (s {objectid: oid}), (t {objectid: $target}) "
+            "MATCH p = shortestPath((s)-[*1..]->(t)) "
+            "RETURN oid AS source, [x IN nodes(p) | {objectid: x.objectid, type: labels(x)[0]}] AS nodes, "
+            "[r IN relationships(p) | type(r)] AS edges"
+        )
+        data = self._cypher(cypher, {"oids": oids, "target": target_id})
+        paths: Dict[str, Dict] = {}
+        for row in data.get("data", []):
+            source = row.get("source")
+            if source in paths:
+                continue
+            paths[source] = _critical_path(source, target_id, _hops_from_cypher(row))
+        return paths
+
+    def _tier_zero_paths_bulk(self, oids: List[str], max_length: int, max_paths: int) -> Dict[str, List[Dict]]:
+        cypher = (
+            "UNWIND $oids AS oid "
+            "MATCH (s {objectid: oid}) "
+            f"MATCH (t) WHERE {_TIER_ZERO_PREDICATE} AND t <> s "
+            f"MATCH p = shortestPath((s)-[*1..{max_length}]->(t)) "
+            "WITH oid, t, p ORDER BY length(p) ASC, t.objectid ASC "
+            "WITH oid, collect({target: t.objectid, "
+            "nodes: [x IN nodes(p) | {objectid: x.objectid, type: labels(x)[0]}], "
+            "edges: [r IN relationships(p) | type(r)]})[..$max_paths] AS paths "
+            "UNWIND paths AS x "
+            "RETURN oid AS source, x.target AS target, x.nodes AS nodes, x.edges AS edges"
+        )
+        data = self._cypher(cypher, {"oids": oids, "max_paths": max_paths})
+        grouped: Dict[str, List[Dict]] = {}
+        for row in data.get("data", []):
+            source = row.get("source")
+            grouped.setdefault(source, []).append(_critical_path(source, row.get("target"), _hops_from_cypher(row)))
+        return grouped
+
+    def _cached(self, key: tuple, compute):
+        if self.cache is None:
+            return compute()
+        # Entries, epoch and epoch checks are per instance, so a cache shared by clients of
+        # different instances neither crosses them nor lets one instance's import evict another's.
+        if self.cache.epoch_is_stale(self.base_url):
+            self.cache.observe_epoch(self.get_ingestion_epoch(), self.base_url)
+        value = self.cache.get(key, self.base_url)
+        if not _cache.is_missing(value):
+            return value
+        value = compute()
+        self.cache.put(key, value, self.base_url)
+        return value
+
+    def _cypher(self, query: str, parameters: Dict[str, Any]) -> Dict:
+        payload = {"query": query, "parameters": parameters}
+        return self._request("/api/v2/graphs/cypher", method="POST", body=payload)
 
-    def _request(self, path: str, method: str = "GET", body: Optional[Dict] = None) -> Dict:
-        url = f"{self.base_url}{path}"
-        headers = {"Content-Type": "application/json"}
-        if self.session_token:
-            headers["Authorization"] = f"Bearer {self.session_token}"
+    def _request(
+        self,
+        path: str,
+        method: str = "GET",
+        body: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+        authenticated: bool = True,
+    ) -> Dict:
+        """Send one API call; `timeout` overrides the transport's per-request deadline.
+
+        Authenticated calls carry the shared session token. A 401 drops that
+        token and the call is retried exactly once with a fresh one.
+        """
         data_bytes = json.dumps(body).encode("utf-8") if body is not None else None
-        req = urllib.request.Request(url, data=data_bytes, headers=headers, method=method)
-        try:
-            with urllib.request.urlopen(req, timeout=30) as resp:
-                resp_body = resp.read().decode("utf-8")
-                return json.loads(resp_body) if resp_body else {}
-        except urllib.error.HTTPError as exc:
-            raise RuntimeError(f"BloodHound API error {exc.code} for {path}: {exc.reason}") from exc
-        except urllib.error.URLError as exc:
-            raise RuntimeError(f"BloodHound API unreachable for {path}: {exc.reason}") from exc
+        for attempt in range(2):
+            headers = {"Content-Type": "application/json"}
+            token = self.session.token(self._authenticate) if authenticated else None
+            if token:
+                headers["Authorization"] = f"Bearer {token}"
+            try:
+                resp = self.transport.request(method, path, body=data_bytes, headers=headers, timeout=timeout)
+            except TransportError as exc:
+                raise BloodHoundAPIError(f"BloodHound API unreachable for {path}: {exc}") from exc
+            if resp.status == 401 and authenticated and attempt == 0:
+                self.session.invalidate(token)
+                continue
+            break
+        if resp.status >= 400:
+            raise BloodHoundAPIError(f"BloodHound API error {resp.status} for {path}: {resp.reason}", resp.status)
+        resp_body = resp.body.decode("utf-8")
+        return json.loads(resp_body) if resp_body else {}
+
+
+def _batches(items: List[Any], size: int):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _page_cursor(cursor: Optional[Sequence[str]]) -> Tuple[str, str]:
+    if cursor is None:
+        return ("", "")
+    if len(cursor) != 2:
+        raise ValueError("cursor must be an (object id, edge kind) pair")
+    return (str(cursor[0]), str(cursor[1]))
+
+
+def _object_id(resolved: Dict) -> str:
+    return resolved.get("objectid") or resolved.get("id")
+
+
+def _normalize_asset(row: Dict) -> Dict:
+    return {
+        "id": row.get("id"),
+        "name": row.get("name"),
+        "kind": (row.get("kind") or "asset").lower(),
+        "via": (row.get("via") or "edge").lower(),
+        "confidence": "graph",
+    }
+
+
+def _hops_from_cypher(row: Dict) -> List[Dict]:
+    """Turn `nodes`/`edges` columns of a path query into pathfinding-style hops."""
+    nodes = row.get("nodes") or []
+    edges = row.get("edges") or []
+    return [
+        {
+            "id": node.get("objectid") or node.get("id"),
+            "type": (node.get("type") or "node").lower(),
+            "edge": edges[index] if index < len(edges) else None,
+        }
+        for index, node in enumerate(nodes)
+    ]
+
+
+def _critical_path(start_id: str, target_id: str, hops: List[Dict]) -> Dict:
+    return {
+        "from": start_id,
+        "to": target_id,
+        "length": len(hops),
+        "hops": hops,
+    }
+
+
+def _merge_paths(first: List[Dict], extra: List[Dict]) -> List[Dict]:
+    seen = {path.get("to") for path in first}
+    return first + [path for path in extra if path.get("to") not in seen]
+
+
+def _indexed_paths(index: Any, start_id: str, max_length: int) -> List[Dict]:
+    path = index.path(start_id)
+    return [path] if path is not None and path["length"] - 1 <= max_length else []
+
+
+def _check_path_limits(max_length: int, max_paths: int) -> None:
+    # max_length is interpolated into the cypher text (variable-length bounds
+    # cannot be parameters), so it must be a plain positive int.
+    if not isinstance(max_length, int) or isinstance(max_length, bool) or not 1 <= max_length <= 32:
+        raise ValueError("max_length must be an int between 1 and 32")
+    if max_paths < 1:
+        raise ValueError("max_paths must be >= 1")
+
+
+def _check_expansion_limits(max_depth: int, frontier_batch: int, page_size: int) -> None:
+    if not isinstance(max_depth, int) or isinstance(max_depth, bool) or not 1 <= max_depth <= 32:
+        raise ValueError("max_depth must be an int between 1 and 32")
+    if frontier_batch < 1:
+        raise ValueError("frontier_batch must be >= 1")
+    if page_size < 1:
+        raise ValueError("page_size must be >= 1")
+
+
+def _classify_privileges(reachable: List[Dict]) -> List[Dict]:
+    privilege, evidence = _classifier.DEFAULT_CLASSIFIER.classify(reachable)
+    privileges, evidences = _classifier.PRIVILEGES, _classifier.EVIDENCE
+    return [
+        {
+            "target_id": asset.get("id"),
+            "privilege": privileges[p],
+            "evidence": evidences[e],
+            "source": "bloodhound",
+        }
+        for asset, p, e in zip(reachable, privilege, evidence)
+    ]
+
+
+def _assemble_report(resolved: Dict, reachable: List[Dict], critical: List[Dict], compact: bool = False) -> Any:
+    identity = {
+        "id": _object_id(resolved),
+        "upn": resolved.get("properties", {}).get("userprincipalname") or resolved.get("name"),
+        "display_name": resolved.get("name"),
+        "type": (resolved.get("type") or "identity").lower(),
+    }
+    if compact:
+        privilege, evidence = _classifier.DEFAULT_CLASSIFIER.classify(reachable)
+        return CompactReport.from_assets(identity, reachable, critical, privilege, evidence)
+    return {
+        "identity": identity,
+        "reachable_assets": reachable,
+        "critical_paths": critical,
+        "privilege_classification": _classify_privileges(reachable),
+    }
+
+
+def create_client(backend: str = "api", **kwargs: Any) -> BloodHoundClient:
+    """Build an access-graph client for the selected backend.
+
+    - `api` (default): `BloodHoundClient(base_url, username, password, ...)`.
+    - `local`: `graph_engine.LocalGraphClient` over an offline graph, from
+      `snapshot_path=...` (memory-mapped) or `azurehound_paths=[...]`.
+    """
+    if backend == "api":
+        return BloodHoundClient(**kwargs)
+    if backend == "local":
+        if __package__:
+            from . import graph_engine as engine
+        else:
+            import graph_engine as engine
+        snapshot_path = kwargs.pop("snapshot_path", None)
+        azurehound_paths = kwargs.pop("azurehound_paths", None)
+        if snapshot_path:
+            graph = engine.LocalGraph.load(snapshot_path)
+        elif azurehound_paths:
+            graph = engine.LocalGraph.from_azurehound(azurehound_paths)
+        else:
+            raise ValueError("local backend needs snapshot_path or azurehound_paths")
+        return engine.LocalGraphClient(graph, **kwargs)
+    raise ValueError(f"unsupported access-graph backend: {backend}")
@@ -0,0 +1,229 @@
+"""Columnar (struct-of-arrays) identity reports.
+
+A contract report stores every reachable asset as a dict and repeats its id in
+a second dict under `privilege_classification`. For identities that reach tens
+of thousands of assets that is most of the worker's memory and `json.dumps`
+time. `CompactReport` keeps the same data as parallel columns instead:
+
+- `ids` / `names`: lists of interned strings, shared with every other report
+  in the process that mentions the same asset;
+- `kind` / `via`: one byte per asset, codes into per-report string tables;
+- `privilege` / `evidence`: one byte per asset, codes into the fixed
+  `PRIVILEGES` / `EVIDENCE` enums of privilege_classifier.py, which produces
+  them directly.
+
+`identity` and `critical_paths` are small and kept as in the contract.
+
+A `CompactReport` is a read-only mapping with the contract keys;
+`reachable_assets` and `privilege_classification` are materialized as dicts on
+first access only. `to_dict()` returns a plain contract report, and
+`to_compact()` / `from_compact()` give a JSON-ready columnar form that
+serializes far faster than the contract shape.
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+
+if __package__:
+    from . import privilege_classifier as _classifier
+else:  # a script in this directory (python graph_engine.py ...), not the package
+    import privilege_classifier as _classifier
+PRIVILEGES = _classifier.PRIVILEGES
+EVIDENCE = _classifier.EVIDENCE
+
+FORMAT = "columnar-v1"
+
+_PRIVILEGE_CODES = {name: code for code, name in enumerate(PRIVILEGES)}
+_EVIDENCE_CODES = {name: code for code, name in enumerate(EVIDENCE)}
+_KEYS = ("identity", "reachable_assets", "critical_paths", "privilege_classification")
+_intern = sys.intern
+
+
+class CompactReport(Mapping):
+    """Contract report stored column-wise; see the module docstring."""
+
+    __slots__ = (
+        "identity",
+        "critical_paths",
+        "ids",
+        "names",
+        "kind",
+        "via",
+        "privilege",
+        "evidence",
+        "kinds",
+        "vias",
+        "_materialized",
+    )
+
+    def __init__(self, identity: Dict, critical_paths: List[Dict]) -> None:
+        self.identity = identity
+        self.critical_paths = critical_paths
+        self.ids: List[str] = []
+        self.names: List[Optional[str]] = []
+        self.kind = array("B")
+        self.via = array("B")
+        self.privilege = array("B")
+        self.evidence = array("B")
+        self.kinds: List[str] = []
+        self.vias: List[str] = []
+        self._materialized: Dict[str, List[Dict]] = {}
+
+    @classmethod
+    def from_assets(
+        cls,
+        identity: Dict,
+        reachable: Sequence[Dict],
+        critical_paths: List[Dict],
+        privilege: Sequence[int],
+        evidence: Sequence[int],
+    ) -> "CompactReport":
+        """Build from normalized assets (as returned by `get_reachable_assets`)
+        and their privilege/evidence codes (`PrivilegeClassifier.classify`)."""
+        report = cls(identity, critical_paths)
+        report.extend(reachable, privilege, evidence)
+        return report
+
+    @classmethod
+    def from_report(cls, report: Dict) -> "CompactReport":
+        """Columnar copy of a contract report."""
+        classification = report["privilege_classification"]
+        return cls.from_assets(
+            report["identity"],
+            report["reachable_assets"],
+            report["critical_paths"],
+            [_PRIVILEGE_CODES[entry["privilege"]] for entry in classification],
+            [_EVIDENCE_CODES[entry["evidence"]] for entry in classification],
+        )
+
+    @classmethod
+    def from_compact(cls, payload: Dict[str, Any]) -> "CompactReport":
+        """Inverse of `to_compact()`."""
+        if payload.get("format") != FORMAT:
+            raise ValueError(f"unsupported report format: {payload.get('format')!r}")
+        report = cls(payload["identity"], payload["critical_paths"])
+        report.ids = [_intern(value) for value in payload["ids"]]
+        report.names = [_intern(value) if value is not None else None for value in payload["names"]]
+        report.kinds = list(payload["kinds"])
+        report.vias = list(payload["vias"])
+        report.kind = array("B", payload["kind"])
+        report.via = array("B", payload["via"])
+        report.privilege = array("B", payload["privilege"])
+        report.evidence = array("B", payload["evidence"])
+        report._check_columns()
+        return report
+
+    def extend(self, reachable: Sequence[Dict], privilege: Sequence[int], evidence: Sequence[int]) -> None:
+        """Append assets and their privilege/evidence codes."""
+        if not len(reachable) == len(privilege) == len(evidence):
+            raise ValueError("one privilege and evidence code is required per asset")
+        kind_codes = {name: code for code, name in enumerate(self.kinds)}
+        via_codes = {name: code for code, name in enumerate(self.vias)}
+        for asset in reachable:
+            kind = asset.get("kind") or "asset"
+            via = asset.get("via") or "edge"
+            code = kind_codes.get(kind)
+            if code is None:
+                code = kind_codes[kind] = _add_code(self.kinds, kind)
+            self.kind.append(code)
+            code = via_codes.get(via)
+            if code is None:
+                code = via_codes[via] = _add_code(self.vias, via)
+            self.via.append(code)
+            name = asset.get("name")
+            self.ids.append(_intern(asset.get("id") or ""))
+            self.names.append(_intern(name) if name is not None else None)
+        self.privilege.extend(privilege)
+        self.evidence.extend(evidence)
+        self._materialized.clear()
+
+    def __len__(self) -> int:
+        return len(_KEYS)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_KEYS)
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "identity":
+            return self.identity
+        if key == "critical_paths":
+            return self.critical_paths
+        if key not in _KEYS:
+            raise KeyError(key)
+        rows = self._materialized.get(key)
+        if rows is None:
+            rows = self._materialized[key] = (
+                list(self.iter_assets()) if key == "reachable_assets" else list(self.iter_classification())
+            )
+        return rows
+
+    @property
+    def asset_count(self) -> int:
+        return len(self.ids)
+
+    def iter_assets(self) -> Iterator[Dict]:
+        """Contract `reachable_assets` entries, built one at a time."""
+        kinds, vias = self.kinds, self.vias
+        for object_id, name, kind, via in zip(self.ids, self.names, self.kind, self.via):
+            yield {"id": object_id, "name": name, "kind": kinds[kind], "via": vias[via], "confidence": "graph"}
+
+    def iter_classification(self) -> Iterator[Dict]:
+        """Contract `privilege_classification` entries, built one at a time."""
+        for object_id, privilege, evidence in zip(self.ids, self.privilege, self.evidence):
+            yield {
+                "target_id": object_id,
+                "privilege": PRIVILEGES[privilege],
+                "evidence": EVIDENCE[evidence],
+                "source": "bloodhound",
+            }
+
+    def release(self) -> None:
+        """Drop dicts materialized by `report[...]`; the columns are kept."""
+        self._materialized.clear()
+
+    def to_dict(self) -> Dict:
+        """Plain contract report (docs/contracts/access-graph-adapter.md)."""
+        return {
+            "identity": self.identity,
+            "reachable_assets": list(self.iter_assets()),
+            "critical_paths": self.critical_paths,
+            "privilege_classification": list(self.iter_classification()),
+        }
+
+    def to_compact(self) -> Dict[str, Any]:
+        """JSON-ready columnar form (codes as int lists, string tables alongside)."""
+        return {
+            "format": FORMAT,
+            "identity": self.identity,
+            "critical_paths": self.critical_paths,
+            "ids": self.ids,
+            "names": self.names,
+            "kinds": self.kinds,
+            "vias": self.vias,
+            "kind": self.kind.tolist(),
+            "via": self.via.tolist(),
+            "privilege": self.privilege.tolist(),
+            "evidence": self.evidence.tolist(),
+        }
+
+    def _check_columns(self) -> None:
+        count = len(self.ids)
+        for column in (self.names, self.kind, self.via, self.privilege, self.evidence):
+            if len(column) != count:
+                raise ValueError("report columns differ in length")
+        if count and (max(self.kind) >= len(self.kinds) or max(self.via) >= len(self.vias)):
+            raise ValueError("report code out of range of its string table")
+        if count and (max(self.privilege) >= len(PRIVILEGES) or max(self.evidence) >= len(EVIDENCE)):
+            raise ValueError("report code out of range of its enum")
+
+
+def _add_code(table: List[str], value: str) -> int:
+    if len(table) >= 256:
+        raise ValueError("more than 256 distinct kinds/vias in one report")
+    table.append(_intern(value))
+    return len(table) - 1
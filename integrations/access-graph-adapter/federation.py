@@ -0,0 +1,219 @@
+"""Federated access-graph queries across several BloodHound instances.
+
+`FederatedClient` holds one `BloodHoundClient` per BloodHound deployment (for
+example one per tenant) and sends each question to all of them at once:
+
+- every instance runs on its own worker thread with its own deadline, so the
+  overall latency is that of the slowest instance, capped by its deadline,
+  rather than the sum over instances;
+- instances that time out, fail or do not know the identity are reported per
+  instance and left out of the merge (partial failure); the call only fails
+  when no instance could answer;
+- results are merged into one contract-shaped report (docs/contracts/
+  access-graph-adapter.md): reachable assets deduplicated by (id, via),
+  critical paths by target (shortest kept).
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+if __package__:
+    from . import client as _client
+else:  # a script in this directory (python graph_engine.py ...), not the package
+    import client as _client
+
+
+class FederatedClient:
+    """Fan-out client over named BloodHound instances.
+
+    - `instances`: `{name: client}`; order defines precedence when merging
+      identity details (the first instance that resolves the identity wins).
+    - `timeouts`: per-instance deadline in seconds for one federated call;
+      instances without an entry use `default_timeout`.
+    """
+
+    def __init__(
+        self,
+        instances: Dict[str, Any],
+        *,
+        timeouts: Optional[Dict[str, float]] = None,
+        default_timeout: float = 30.0,
+    ) -> None:
+        if not instances:
+            raise ValueError("at least one instance is required")
+        self.instances = dict(instances)
+        self.timeouts = dict(timeouts or {})
+        self.default_timeout = default_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(4, 2 * len(self.instances)), thread_name_prefix="bloodhound-federation"
+        )
+
+    @classmethod
+    def from_config(cls, config: Sequence[Dict[str, Any]], **kwargs: Any) -> "FederatedClient":
+        """Build from `[{"name", "base_url", "username", "password", "timeout"?, "backend"?}, ...]`."""
+        instances: Dict[str, Any] = {}
+        timeouts: Dict[str, float] = {}
+        for entry in config:
+            entry = dict(entry)
+            name = entry.pop("name")
+            if name in instances:
+                raise ValueError(f"duplicate instance name: {name}")
+            backend = entry.pop("backend", "api")
+            # For API instances the deadline also bounds each HTTP request, so
+            # calls abandoned after a timeout do not linger.
+            timeout = entry.get("timeout") if backend == "api" else entry.pop("timeout", None)
+            if timeout is not None:
+                timeouts[name] = float(timeout)
+            instances[name] = _client.create_client(backend, **entry)
+        return cls(instances, timeouts=timeouts, **kwargs)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for client in self.instances.values():
+            client.close()
+
+    def __enter__(self) -> "FederatedClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def get_identity(self, query: str, node_type: str = "user") -> Dict[str, Dict]:
+        """Resolve `query` on every instance; `{instance: identity}` for instances that know it."""
+        results, _ = self._fan_out(lambda client: client.get_identity(query, node_type))
+        if not results:
+            raise LookupError(f"No identity found for query: {query}")
+        return results
+
+    def get_reachable_assets(self, object_id: str, limit: int = 100) -> List[Dict]:
+        """Directly reachable assets of `object_id`, merged over all instances that answered."""
+        results, outcomes = self._fan_out(lambda client: client.get_reachable_assets(object_id, limit))
+        _raise_if_no_answer(results, outcomes)
+        return _merge_assets(results.values())
+
+    def build_identity_report(
+        self,
+        identity_ref: Dict,
+        critical_target_id: Optional[str] = None,
+        *,
+        tier_zero: bool = False,
+        max_path_length: int = _client.DEFAULT_MAX_PATH_LENGTH,
+        max_paths: int = _client.DEFAULT_MAX_PATHS,
+    ) -> Dict:
+        """One contract-compliant report merged from every instance that resolves the identity."""
+        return self.build_federated_report(
+            identity_ref,
+            critical_target_id,
+            tier_zero=tier_zero,
+            max_path_length=max_path_length,
+            max_paths=max_paths,
+        )["report"]
+
+    def build_federated_report(
+        self,
+        identity_ref: Dict,
+        critical_target_id: Optional[str] = None,
+        *,
+        tier_zero: bool = False,
+        max_path_length: int = _client.DEFAULT_MAX_PATH_LENGTH,
+        max_paths: int = _client.DEFAULT_MAX_PATHS,
+    ) -> Dict[str, Any]:
+        """Merged report plus per-instance outcomes.
+
+        Returns `{"report": ..., "instances": {name: {"status", "elapsed_ms", ...}}}`
+        where status is `ok`, `not_found`, `timeout` or `error`.
+        """
+
+        def build(client: Any) -> Dict:
+            return client.build_identity_report(
+                identity_ref,
+                critical_target_id,
+                tier_zero=tier_zero,
+                max_path_length=max_path_length,
+                max_paths=max_paths,
+            )
+
+        results, outcomes = self._fan_out(build)
+        _raise_if_no_answer(results, outcomes)
+        reports = list(results.values())
+        resolved = reports[0]["identity"]
+        reachable = _merge_assets(report["reachable_assets"] for report in reports)
+        critical = _merge_critical_paths(report["critical_paths"] for report in reports)
+        report = _client._assemble_report(
+            {"objectid": resolved.get("id"), "name": resolved.get("display_name"), "type": resolved.get("type")},
+            reachable,
+            critical,
+        )
+        report["identity"] = dict(resolved)
+        for name, result in results.items():
+            outcomes[name]["reachable_assets"] = len(result["reachable_assets"])
+            outcomes[name]["identity_id"] = result["identity"].get("id")
+        return {"report": report, "instances": outcomes}
+
+    def _fan_out(self, call: Callable[[Any], Any]) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """Run `call(client)` on every instance concurrently, each under its own deadline."""
+        started = time.monotonic()
+        futures = {}
+        for name, client in self.instances.items():
+            futures[name] = self._executor.submit(_timed, call, client)
+        results: Dict[str, Any] = {}
+        outcomes: Dict[str, Dict[str, Any]] = {}
+        for name, future in futures.items():
+            deadline = started + self.timeouts.get(name, self.default_timeout)
+            try:
+                value, elapsed = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeout:
+                # The worker keeps running until the transport's own timeout; its result is dropped.
+                future.cancel()
+                outcomes[name] = {"status": "timeout", "elapsed_ms": _elapsed_ms(started)}
+                continue
+            except LookupError as exc:
+                outcomes[name] = {"status": "not_found", "error": str(exc), "elapsed_ms": _elapsed_ms(started)}
+                continue
+            except Exception as exc:  # partial failure: one instance must not fail the federation
+                outcomes[name] = {"status": "error", "error": str(exc), "elapsed_ms": _elapsed_ms(started)}
+                continue
+            results[name] = value
+            outcomes[name] = {"status": "ok", "elapsed_ms": round(elapsed * 1000, 1)}
+        return results, outcomes
+
+
+def _timed(call: Callable[[Any], Any], client: Any) -> Tuple[Any, float]:
+    started = time.monotonic()
+    return call(client), time.monotonic() - started
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.monotonic() - started) * 1000, 1)
+
+
+def _raise_if_no_answer(results: Dict[str, Any], outcomes: Dict[str, Dict[str, Any]]) -> None:
+    if results:
+        return
+    if outcomes and all(outcome["status"] == "not_found" for outcome in outcomes.values()):
+        raise LookupError("identity not found on any BloodHound instance")
+    summary = ", ".join(f"{name}: {outcome['status']}" for name, outcome in outcomes.items())
+    raise _client.BloodHoundAPIError(f"no BloodHound instance answered ({summary})")
+
+
+def _merge_assets(asset_lists: Any) -> List[Dict]:
+    merged: Dict[Tuple[Any, Any], Dict] = {}
+    for assets in asset_lists:
+        for asset in assets:
+            merged.setdefault((asset.get("id"), asset.get("via")), asset)
+    return list(merged.values())
+
+
+def _merge_critical_paths(path_lists: Any) -> List[Dict]:
+    best: Dict[Any, Dict] = {}
+    for paths in path_lists:
+        for path in paths:
+            target = path.get("to")
+            if target not in best or path.get("length", 0) < best[target].get("length", 0):
+                best[target] = path
+    return list(best.values())
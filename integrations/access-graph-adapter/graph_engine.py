@@ -0,0 +1,864 @@
+"""Offline, in-process access graph built from AzureHound collector output.
+
+`LocalGraph` loads the JSON files produced by AzureHound (see
+docs/ingestion/azurehound.md) into a compact CSR adjacency structure:
+
+- nodes are sorted by object id; ids and names live in one UTF-8 blob each
+  with an offsets array, so lookups are a binary search and no per-node Python
+  objects are created at load time;
+- edges are two flat arrays (`targets`, `edge_kind`) indexed by a per-node
+  `offsets` array.
+
+A graph can be saved as a single snapshot file and re-opened with `mmap`, so
+start-up cost does not grow with graph size. The file layout (magic, JSON
+header, 8-byte aligned arrays) is written and read by `write_snapshot` and
+`open_snapshot`, which other precomputed tables (tier_zero_index.py) reuse
+along with `StringTable` and `intern_kind`. `LocalGraphClient` serves the
+`BloodHoundClient` methods from such a graph with local BFS instead of API
+calls; select it with `client.create_client(backend="local", ...)`.
+
+Standard library only (`array` + `mmap` instead of NumPy, to keep the
+adapter dependency-free).
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import mmap
+import os
+from array import array
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+_MAGIC = b"ITDRCSR1"
+_SNAPSHOT_VERSION = 1
+_ALIGN = 8
+
+# Built-in Entra ID role templates treated as Tier Zero.
+TIER_ZERO_ROLE_TEMPLATES = frozenset(
+    {
+        "62E90394-69F5-4237-9190-012177145E10",  # Global Administrator
+        "E8611AB8-C189-46E8-94E1-60213AB1F814",  # Privileged Role Administrator
+        "7BE44C8A-ADAF-4E2A-84D6-AB2649E08A13",  # Privileged Authentication Administrator
+        "9B895D92-2CD3-44C7-9D02-A6AC2D5EA5C3",  # Application Administrator
+        "158C047A-C907-4556-B7EF-446551A6B5F7",  # Cloud Application Administrator
+        "194AE4CB-B126-40B2-BD5B-6091B380977D",  # Security Administrator
+        "C4E39BD9-1100-46D3-8C65-FB160DA0071F",  # Authentication Administrator
+        "29232CDF-9323-42FD-ADE2-1D097AF3E4DE",  # Exchange Administrator
+        "B1BE1C3E-B65D-4F19-8427-F6FA0D97FEB9",  # Conditional Access Administrator
+        "8AC3FC64-6ECA-42EA-9E69-59F4C7B60EB2",  # Hybrid Identity Administrator
+        "E3973BDF-4987-49AE-837A-BA8E231C7286",  # Azure DevOps Administrator
+    }
+)
+
+# Node-bearing AzureHound kinds -> how to read id and name.
+_NODE_KINDS: Dict[str, Tuple[str, Sequence[str]]] = {
+    "AZUser": ("id", ("userPrincipalName", "displayName")),
+    "AZGroup": ("id", ("displayName",)),
+    "AZServicePrincipal": ("id", ("displayName", "appDisplayName")),
+    "AZApp": ("id", ("displayName",)),
+    "AZDevice": ("id", ("displayName",)),
+    "AZRole": ("id", ("displayName",)),
+    "AZTenant": ("tenantId", ("displayName", "defaultDomain")),
+    "AZSubscription": ("id", ("displayName", "name")),
+    "AZManagementGroup": ("id", ("displayName", "name")),
+    "AZResourceGroup": ("id", ("name",)),
+    "AZKeyVault": ("id", ("name",)),
+    "AZVM": ("id", ("name",)),
+    "AZAutomationAccount": ("id", ("name",)),
+    "AZLogicApp": ("id", ("name",)),
+    "AZFunctionApp": ("id", ("name",)),
+    "AZWebApp": ("id", ("name",)),
+    "AZContainerRegistry": ("id", ("name",)),
+    "AZManagedCluster": ("id", ("name",)),
+}
+
+# Entra ID ownership/membership kinds: kind -> (target id key, list key, entry key, edge kind).
+# Edges point from the principal to the object it gains access to.
+_DIRECTORY_EDGES: Dict[str, Tuple[str, str, str, str]] = {
+    "AZGroupMember": ("groupId", "members", "member", "AZMemberOf"),
+    "AZGroupOwner": ("groupId", "owners", "owner", "AZOwns"),
+    "AZAppOwner": ("appId", "owners", "owner", "AZOwns"),
+    "AZServicePrincipalOwner": ("servicePrincipalId", "owners", "owner", "AZOwns"),
+    "AZDeviceOwner": ("deviceId", "owners", "owner", "AZOwns"),
+}
+
+# Azure RBAC kinds, e.g. AZSubscriptionOwner / AZKeyVaultContributor: suffix -> (list key, entry key, edge kind).
+_RBAC_SUFFIXES: Dict[str, Tuple[str, str, str]] = {
+    "Owner": ("owners", "owner", "AZOwner"),
+    "UserAccessAdmin": ("userAccessAdmins", "userAccessAdmin", "AZUserAccessAdministrator"),
+    "Contributor": ("contributors", "contributor", "AZContributor"),
+}
+
+
+class GraphError(LookupError):
+    """The local graph cannot answer (unknown node, corrupt snapshot)."""
+
+
+class StringTable:
+    """Read-only string table over (offsets, utf-8 blob); string i is `blob[offsets[i]:offsets[i + 1]]`."""
+
+    def __init__(self, offsets: Sequence[int], blob: Any) -> None:
+        self.offsets = offsets
+        self.blob = blob
+
+    @classmethod
+    def build(cls, values: Iterable[str]) -> "StringTable":
+        offsets, blob = array("q", [0]), bytearray()
+        for value in values:
+            blob += value.encode("utf-8")
+            offsets.append(len(blob))
+        return cls(offsets, bytes(blob))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return bytes(self.blob[self.offsets[index] : self.offsets[index + 1]]).decode("utf-8")
+
+    def raw(self, index: int) -> bytes:
+        return bytes(self.blob[self.offsets[index] : self.offsets[index + 1]])
+
+
+class SnapshotFile:
+    """An opened snapshot: its JSON `header` and `arrays` (views on the file) by name."""
+
+    def __init__(self, header: Dict[str, Any], arrays: Dict[str, Any], backing: Any, views: List[memoryview]) -> None:
+        self.header = header
+        self.arrays = arrays
+        self._backing = backing
+        self._views = views
+
+    def close(self) -> None:
+        """Release the views and the mapping; the arrays are unusable afterwards."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if isinstance(self._backing, mmap.mmap):
+            self._backing.close()
+        self._backing = None
+
+
+def write_snapshot(
+    path: str, magic: bytes, version: int, header: Dict[str, Any], arrays: Dict[str, Tuple[str, Any]]
+) -> None:
+    """Write `magic`, a JSON header and 8-byte aligned arrays to `path` (atomic replace).
+
+    `arrays` maps names to `(typecode, values)`; names ending in `_blob` are
+    read back as raw bytes, the others as typed views.
+    """
+    packed = {name: _as_array(typecode, values) for name, (typecode, values) in arrays.items()}
+    table: Dict[str, Tuple[str, int, int]] = {}
+    header = {"version": version, **header, "arrays": table}
+    # Offsets depend on the header length, which depends on the offsets:
+    # reserve a fixed-width header by padding the JSON.
+    provisional = len(json.dumps({**header, "arrays": {k: ("q", 10**15, 10**15) for k in packed}}))
+    header_len = provisional + 64
+    position = _align(len(magic) + 8 + header_len)
+    for name, arr in packed.items():
+        table[name] = (arr.typecode, position, len(arr))
+        position = _align(position + len(arr) * arr.itemsize)
+    encoded = json.dumps(header).encode("utf-8").ljust(header_len, b" ")
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(magic)
+        f.write(header_len.to_bytes(8, "little"))
+        f.write(encoded)
+        for name, arr in packed.items():
+            f.write(b"\0" * (table[name][1] - f.tell()))
+            arr.tofile(f)
+    os.replace(tmp_path, path)
+
+
+def open_snapshot(
+    path: str, magic: bytes, version: int, *, use_mmap: bool = True, what: str = "graph snapshot"
+) -> SnapshotFile:
+    """Open a file written by `write_snapshot`; with `use_mmap` the arrays are views on the mapped file."""
+    with open(path, "rb") as f:
+        if use_mmap:
+            buf: Any = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            buf = f.read()
+    view = memoryview(buf)
+    if bytes(view[: len(magic)]) != magic:
+        raise GraphError(f"not a {what}: {path}")
+    header_len = int.from_bytes(view[len(magic) : len(magic) + 8], "little")
+    header_start = len(magic) + 8
+    header = json.loads(bytes(view[header_start : header_start + header_len]).decode("utf-8"))
+    if header.get("version") != version:
+        raise GraphError(f"unsupported {what} version: {header.get('version')}")
+    arrays: Dict[str, Any] = {}
+    views = [view]
+    for name, (typecode, start, count) in header["arrays"].items():
+        chunk = view[start : start + count * array(typecode).itemsize]
+        views.append(chunk)
+        if not name.endswith("_blob"):
+            chunk = chunk.cast(typecode)
+            views.append(chunk)
+        arrays[name] = chunk
+    return SnapshotFile(header, arrays, buf, views)
+
+
+def intern_kind(value: str, table: List[str], codes: Dict[str, int]) -> int:
+    """One-byte code of `value` in `table` (appended on first use), as stored in kind arrays."""
+    code = codes.get(value)
+    if code is None:
+        code = codes[value] = len(table)
+        if code > 255:
+            raise GraphError("too many distinct node/edge kinds for the snapshot format")
+        table.append(value)
+    return code
+
+
+class LocalGraph:
+    """Immutable CSR access graph. Build with `from_azurehound`, persist with `save`/`load`."""
+
+    def __init__(
+        self,
+        *,
+        ids: StringTable,
+        names: StringTable,
+        name_order: Sequence[int],
+        node_kind: Sequence[int],
+        tier_zero: Sequence[int],
+        offsets: Sequence[int],
+        targets: Sequence[int],
+        edge_kind: Sequence[int],
+        node_kinds: List[str],
+        edge_kinds: List[str],
+        epoch: Optional[str],
+        snapshot: Optional[SnapshotFile] = None,
+    ) -> None:
+        self.ids = ids
+        self.names = names
+        self.name_order = name_order
+        self.node_kind = node_kind
+        self.tier_zero = tier_zero
+        self.offsets = offsets
+        self.targets = targets
+        self.edge_kind = edge_kind
+        self.node_kinds = node_kinds
+        self.edge_kinds = edge_kinds
+        self.epoch = epoch
+        self._snapshot = snapshot
+        self._reverse: Optional[Tuple[array, array, array]] = None
+
+    # --- construction ---
+
+    @classmethod
+    def from_azurehound(cls, paths: Iterable[str], *, epoch: Optional[str] = None) -> "LocalGraph":
+        """Build from AzureHound JSON files (or directories of them)."""
+        builder = _Builder()
+        files = list(_expand_paths(paths))
+        for path in files:
+            with open(path, "r", encoding="utf-8-sig") as f:
+                payload = json.load(f)
+            items = payload.get("data", []) if isinstance(payload, dict) else payload
+            for item in items:
+                if isinstance(item, dict):
+                    builder.add(item.get("kind"), item.get("data") or {})
+        if epoch is None and files:
+            epoch = str(max(int(os.path.getmtime(p)) for p in files))
+        return builder.build(epoch)
+
+    @classmethod
+    def load(cls, path: str, *, use_mmap: bool = True) -> "LocalGraph":
+        """Open a snapshot written by `save`; with `use_mmap` arrays are views on the file."""
+        snapshot = open_snapshot(path, _MAGIC, _SNAPSHOT_VERSION, use_mmap=use_mmap)
+        arrays, header = snapshot.arrays, snapshot.header
+        return cls(
+            ids=StringTable(arrays["id_offsets"], arrays["id_blob"]),
+            names=StringTable(arrays["name_offsets"], arrays["name_blob"]),
+            name_order=arrays["name_order"],
+            node_kind=arrays["node_kind"],
+            tier_zero=arrays["tier_zero"],
+            offsets=arrays["offsets"],
+            targets=arrays["targets"],
+            edge_kind=arrays["edge_kind"],
+            node_kinds=header["node_kinds"],
+            edge_kinds=header["edge_kinds"],
+            epoch=header.get("epoch"),
+            snapshot=snapshot,
+        )
+
+    def save(self, path: str) -> None:
+        """Write a single-file snapshot (atomic replace)."""
+        arrays = {
+            "id_offsets": ("q", self.ids.offsets),
+            "id_blob": ("B", self.ids.blob),
+            "name_offsets": ("q", self.names.offsets),
+            "name_blob": ("B", self.names.blob),
+            "name_order": ("i", self.name_order),
+            "node_kind": ("B", self.node_kind),
+            "tier_zero": ("B", self.tier_zero),
+            "offsets": ("q", self.offsets),
+            "targets": ("i", self.targets),
+            "edge_kind": ("B", self.edge_kind),
+        }
+        header = {"epoch": self.epoch, "node_kinds": self.node_kinds, "edge_kinds": self.edge_kinds}
+        write_snapshot(path, _MAGIC, _SNAPSHOT_VERSION, header, arrays)
+
+    def close(self) -> None:
+        """Release the snapshot mapping; the graph is unusable afterwards."""
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+
+    # --- queries ---
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_kind)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def index_of(self, object_id: str) -> Optional[int]:
+        key = object_id.upper().encode("utf-8")
+        lo, hi = 0, len(self.ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.ids.raw(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self.ids) and self.ids.raw(lo) == key:
+            return lo
+        return None
+
+    def index_of_name(self, name: str) -> Optional[int]:
+        key = name.upper().encode("utf-8")
+        lo, hi = 0, len(self.name_order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.names.raw(self.name_order[mid]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self.name_order) and self.names.raw(self.name_order[lo]) == key:
+            return self.name_order[lo]
+        return None
+
+    def resolve(self, query: str) -> Optional[int]:
+        """Node index for an object id or (UPN) name."""
+        index = self.index_of(query)
+        return index if index is not None else self.index_of_name(query)
+
+    def node(self, index: int) -> Dict[str, Any]:
+        return {"objectid": self.ids[index], "name": self.names[index], "type": self.node_kinds[self.node_kind[index]]}
+
+    def neighbors(self, index: int) -> Iterator[Tuple[int, int]]:
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return zip(self.targets[start:end], self.edge_kind[start:end])
+
+    def predecessors(self, index: int) -> Iterator[Tuple[int, int]]:
+        """(source, edge kind) of edges into `index`; the reverse CSR is built on first use."""
+        if self._reverse is None:
+            self._reverse = self._build_reverse()
+        offsets, sources, kinds = self._reverse
+        start, end = offsets[index], offsets[index + 1]
+        return zip(sources[start:end], kinds[start:end])
+
+    def _build_reverse(self) -> Tuple[array, array, array]:
+        counts = array("q", [0]) * (self.node_count + 1)
+        for target in self.targets:
+            counts[target + 1] += 1
+        for i in range(self.node_count):
+            counts[i + 1] += counts[i]
+        fill = array("q", counts)
+        sources = array("i", [0]) * self.edge_count
+        kinds = array("B", [0]) * self.edge_count
+        for source in range(self.node_count):
+            for position in range(self.offsets[source], self.offsets[source + 1]):
+                target = self.targets[position]
+                sources[fill[target]] = source
+                kinds[fill[target]] = self.edge_kind[position]
+                fill[target] += 1
+        return counts, sources, kinds
+
+    def ancestors(self, indices: Iterable[int], *, max_depth: Optional[int] = None) -> set:
+        """`indices` plus every node with a path of at most `max_depth` edges
+        (unbounded when None) into one of them."""
+        seen = set(indices)
+        frontier = list(seen)
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_frontier = []
+            for node in frontier:
+                for source, _ in self.predecessors(node):
+                    if source not in seen:
+                        seen.add(source)
+                        next_frontier.append(source)
+            frontier = next_frontier
+        return seen
+
+    def reachable(self, index: int, limit: int) -> List[Dict[str, Any]]:
+        rows = []
+        for target, kind in self.neighbors(index):
+            if len(rows) >= limit:
+                break
+            rows.append(
+                {
+                    "id": self.ids[target],
+                    "kind": self.node_kinds[self.node_kind[target]],
+                    "name": self.names[target],
+                    "via": self.edge_kinds[kind],
+                }
+            )
+        return rows
+
+    def reachable_page(self, index: int, after: Tuple[str, str], limit: int) -> List[Dict[str, Any]]:
+        """Up to `limit` (target, edge kind) rows ordered after the `(object id,
+        edge kind)` cursor. Edges are unique per node, so memory is bounded by
+        `limit`."""
+        keys = ((self.ids[target], self.edge_kinds[kind], target) for target, kind in self.neighbors(index))
+        page = heapq.nsmallest(limit, (key for key in keys if key[:2] > after))
+        return [
+            {
+                "id": object_id,
+                "kind": self.node_kinds[self.node_kind[target]],
+                "name": self.names[target],
+                "via": via,
+            }
+            for object_id, via, target in page
+        ]
+
+    def expand(
+        self, start: int, *, max_depth: int, edge_kinds: Optional[Sequence[str]] = None
+    ) -> Iterator[Tuple[int, int, int]]:
+        """Level-synchronous BFS from `start`: yields `(node, depth, edge kind)`
+        once per node at its minimum depth, levels in object id order."""
+        allowed = None
+        if edge_kinds:
+            wanted = set(edge_kinds)
+            allowed = {code for code, name in enumerate(self.edge_kinds) if name in wanted}
+        seen = {start}
+        frontier = [start]
+        for depth in range(1, max_depth + 1):
+            level: Dict[int, int] = {}
+            for node in frontier:
+                for target, kind in self.neighbors(node):
+                    if target in seen or (allowed is not None and kind not in allowed):
+                        continue
+                    best = level.get(target)
+                    if best is None or self.edge_kinds[kind] < self.edge_kinds[best]:
+                        level[target] = kind
+            if not level:
+                return
+            frontier = sorted(level)
+            seen.update(frontier)
+            for target in frontier:
+                yield target, depth, level[target]
+
+    def shortest_paths(
+        self, start: int, targets: Optional[Sequence[int]], *, max_length: int, max_paths: int
+    ) -> List[List[Tuple[int, Optional[int]]]]:
+        """BFS from `start`; paths (as (node, edge kind to next node) pairs) to
+        each of `targets`, or to Tier Zero nodes when `targets` is None, in
+        order of increasing length."""
+        wanted = set(targets) if targets is not None else None
+        parents: Dict[int, Tuple[int, int]] = {start: (-1, -1)}
+        frontier = deque([(start, 0)])
+        found: List[int] = []
+        while frontier and len(found) < max_paths:
+            node, depth = frontier.popleft()
+            if depth >= max_length:
+                continue
+            for target, kind in self.neighbors(node):
+                if target in parents:
+                    continue
+                parents[target] = (node, kind)
+                if (wanted is None and self.tier_zero[target]) or (wanted is not None and target in wanted):
+                    found.append(target)
+                    if len(found) >= max_paths or (wanted is not None and len(found) == len(wanted)):
+                        break
+                frontier.append((target, depth + 1))
+        paths = []
+        for target in found:
+            chain: List[Tuple[int, Optional[int]]] = [(target, None)]
+            node = target
+            while parents[node][0] != -1:
+                parent, kind = parents[node]
+                chain.append((parent, kind))
+                node = parent
+            chain.reverse()
+            paths.append(chain)
+        return paths
+
+    def hops(self, chain: List[Tuple[int, Optional[int]]]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": self.ids[node],
+                "type": self.node_kinds[self.node_kind[node]].lower(),
+                "edge": self.edge_kinds[kind] if kind is not None else None,
+            }
+            for node, kind in chain
+        ]
+
+
+def changed_nodes(old: LocalGraph, new: LocalGraph) -> set:
+    """Object ids whose outgoing edges, kind, name or Tier Zero flag differ
+    between two graphs, plus ids present in only one of them.
+
+    Both id tables are sorted, so this is a single merge pass.
+    """
+    changed = set()
+    i = j = 0
+    while i < old.node_count or j < new.node_count:
+        old_id = old.ids.raw(i) if i < old.node_count else None
+        new_id = new.ids.raw(j) if j < new.node_count else None
+        if new_id is None or (old_id is not None and old_id < new_id):
+            changed.add(old.ids[i])
+            i += 1
+            continue
+        if old_id is None or new_id < old_id:
+            changed.add(new.ids[j])
+            j += 1
+            continue
+        if _node_signature(old, i) != _node_signature(new, j):
+            changed.add(new.ids[j])
+        i += 1
+        j += 1
+    return changed
+
+
+def _node_signature(graph: LocalGraph, index: int) -> Tuple[Any, ...]:
+    edges = sorted((graph.ids.raw(target), graph.edge_kinds[kind]) for target, kind in graph.neighbors(index))
+    return (graph.node_kinds[graph.node_kind[index]], graph.names.raw(index), graph.tier_zero[index], edges)
+
+
+class _Builder:
+    def __init__(self) -> None:
+        self.nodes: Dict[str, Tuple[str, str]] = {}
+        self.edges: List[Tuple[str, str, str]] = []
+        self.tier_zero: set = set()
+        self.app_ids: Dict[str, str] = {}
+        self.sp_by_app: Dict[str, str] = {}
+
+    def add_node(self, object_id: Optional[str], kind: str, name: Optional[str]) -> None:
+        if not object_id:
+            return
+        oid = str(object_id).upper()
+        if oid not in self.nodes or self.nodes[oid][0] == "Base":
+            self.nodes[oid] = (kind, (name or oid).upper())
+
+    def add_edge(self, source: Optional[str], target: Optional[str], kind: str) -> None:
+        if source and target:
+            self.edges.append((str(source).upper(), str(target).upper(), kind))
+
+    def add(self, kind: Optional[str], data: Dict[str, Any]) -> None:
+        if not kind:
+            return
+        if kind in _NODE_KINDS:
+            id_key, name_keys = _NODE_KINDS[kind]
+            object_id = data.get(id_key) or data.get("id")
+            name = next((data.get(k) for k in name_keys if data.get(k)), None)
+            self.add_node(object_id, kind, name)
+            template = str(data.get("templateId") or data.get("id") or "").upper()
+            if kind == "AZRole" and template in TIER_ZERO_ROLE_TEMPLATES:
+                self.tier_zero.add(str(object_id).upper())
+            elif kind == "AZTenant":
+                self.tier_zero.add(str(object_id).upper())
+            elif kind == "AZApp" and data.get("appId"):
+                self.app_ids[str(data["appId"]).upper()] = str(object_id).upper()
+            elif kind == "AZServicePrincipal" and data.get("appId"):
+                self.sp_by_app[str(data["appId"]).upper()] = str(object_id).upper()
+            return
+        if kind in _DIRECTORY_EDGES:
+            target_key, list_key, entry_key, edge_kind = _DIRECTORY_EDGES[kind]
+            target = data.get(target_key)
+            for entry in data.get(list_key) or []:
+                principal = (entry or {}).get(entry_key) or {}
+                self.add_edge(principal.get("id"), target, edge_kind)
+                self.add_node(principal.get("id"), _odata_kind(principal), principal.get("displayName"))
+            return
+        if kind == "AZRoleAssignment":
+            for entry in data.get("roleAssignments") or []:
+                role = entry.get("roleDefinitionId") or data.get("roleDefinitionId")
+                self.add_edge(entry.get("principalId"), role, "AZHasRole")
+            return
+        if kind == "AZAppRoleAssignment":
+            self.add_edge(data.get("principalId"), data.get("resourceId"), "AZAppRoleAssignment")
+            return
+        for suffix, (list_key, entry_key, edge_kind) in _RBAC_SUFFIXES.items():
+            if kind.startswith("AZ") and kind.endswith(suffix) and list_key in data:
+                target_key = next((k for k in data if k.endswith("Id") and isinstance(data[k], str)), None)
+                target = data.get(target_key) if target_key else None
+                for entry in data.get(list_key) or []:
+                    principal = ((entry or {}).get(entry_key) or {}).get("properties") or {}
+                    self.add_edge(principal.get("principalId"), target, edge_kind)
+                return
+
+    def build(self, epoch: Optional[str]) -> LocalGraph:
+        for app_id, app_oid in self.app_ids.items():
+            sp_oid = self.sp_by_app.get(app_id)
+            if sp_oid:
+                self.add_edge(app_oid, sp_oid, "AZRunsAs")
+        for source, target, _ in self.edges:
+            for oid in (source, target):
+                if oid not in self.nodes:
+                    self.nodes[oid] = ("Base", oid)
+
+        order = sorted(self.nodes)
+        index = {oid: i for i, oid in enumerate(order)}
+        node_kinds: List[str] = []
+        edge_kinds: List[str] = []
+        node_kind_code: Dict[str, int] = {}
+        edge_kind_code: Dict[str, int] = {}
+
+        node_kind = array("B")
+        tier_zero = array("B")
+        for oid in order:
+            node_kind.append(intern_kind(self.nodes[oid][0], node_kinds, node_kind_code))
+            tier_zero.append(1 if oid in self.tier_zero else 0)
+        names_bytes = [self.nodes[oid][1].encode("utf-8") for oid in order]
+        name_order = array("i", sorted(range(len(order)), key=names_bytes.__getitem__))
+
+        adjacency: List[List[Tuple[int, int]]] = [[] for _ in order]
+        seen = set()
+        for source, target, kind in self.edges:
+            key = (source, target, kind)
+            if key in seen:
+                continue
+            seen.add(key)
+            adjacency[index[source]].append((index[target], intern_kind(kind, edge_kinds, edge_kind_code)))
+        offsets = array("q", [0])
+        targets = array("i")
+        edge_kind = array("B")
+        for edges in adjacency:
+            edges.sort()
+            for target, kind in edges:
+                targets.append(target)
+                edge_kind.append(kind)
+            offsets.append(len(targets))
+
+        return LocalGraph(
+            ids=StringTable.build(order),
+            names=StringTable.build(self.nodes[oid][1] for oid in order),
+            name_order=name_order,
+            node_kind=node_kind,
+            tier_zero=tier_zero,
+            offsets=offsets,
+            targets=targets,
+            edge_kind=edge_kind,
+            node_kinds=node_kinds,
+            edge_kinds=edge_kinds,
+            epoch=epoch,
+        )
+
+
+if __package__:
+    from . import client as _client
+else:  # a script in this directory (python graph_engine.py ...), not the package
+    import client as _client
+
+
+class LocalGraphClient(_client.BloodHoundClient):
+    """`BloodHoundClient` served from a `LocalGraph` instead of the BloodHound API.
+
+    Same methods and report shape; no HTTP calls are made. The graph's epoch
+    (snapshot build time) stands in for the BloodHound ingestion epoch.
+    """
+
+    def __init__(self, graph: LocalGraph, *, cache: Optional[Any] = None) -> None:
+        super().__init__(
+            "local://graph", "", "", transport=_NoTransport(), cache=cache, session=_client.SessionManager()
+        )
+        self.session_token = "local"
+        self.graph = graph
+
+    @classmethod
+    def from_snapshot(cls, path: str, **kwargs: Any) -> "LocalGraphClient":
+        return cls(LocalGraph.load(path), **kwargs)
+
+    def close(self) -> None:
+        self.graph.close()
+
+    def login(self) -> str:
+        return self.session_token
+
+    def get_ingestion_epoch(self) -> Optional[str]:
+        return self.graph.epoch
+
+    def _search_identity(self, query: str, node_type: str) -> Dict:
+        index = self.graph.resolve(query)
+        if index is None:
+            raise LookupError(f"No identity found for query: {query}")
+        return self._resolved(index)
+
+    def _query_reachable_assets(self, object_id: str, limit: int) -> List[Dict]:
+        index = self.graph.index_of(object_id)
+        if index is None:
+            return []
+        return [_client._normalize_asset(row) for row in self.graph.reachable(index, limit)]
+
+    def _query_reachable_page(self, object_id: str, after: Tuple[str, str], page_size: int) -> List[Dict]:
+        index = self.graph.index_of(object_id)
+        if index is None:
+            return []
+        return self.graph.reachable_page(index, after, page_size)
+
+    def iter_blast_radius(
+        self,
+        object_id: str,
+        *,
+        max_depth: int = _client.DEFAULT_MAX_DEPTH,
+        edge_kinds: Optional[Sequence[str]] = None,
+        frontier_batch: int = 500,
+        page_size: int = 5000,
+    ) -> Iterator[Dict]:
+        _client._check_expansion_limits(max_depth, frontier_batch, page_size)
+        start = self.graph.index_of(object_id)
+        if start is None:
+            return
+        for target, depth, kind in self.graph.expand(start, max_depth=max_depth, edge_kinds=edge_kinds):
+            asset = _client._normalize_asset(
+                {
+                    "id": self.graph.ids[target],
+                    "kind": self.graph.node_kinds[self.graph.node_kind[target]],
+                    "name": self.graph.names[target],
+                    "via": self.graph.edge_kinds[kind],
+                }
+            )
+            asset["depth"] = depth
+            yield asset
+
+    def iter_tier_zero_nodes(self, *, page_size: int = 5000) -> Iterator[Dict]:
+        for index, flagged in enumerate(self.graph.tier_zero):
+            if flagged:
+                yield {"id": self.graph.ids[index], "kind": self.graph.node_kinds[self.graph.node_kind[index]]}
+
+    def _query_reverse_expansion_page(self, targets: List[str], after: str, page_size: int) -> List[Dict]:
+        hops: Dict[int, Tuple[int, str]] = {}
+        for target_id in targets:
+            target = self.graph.index_of(target_id)
+            if target is None:
+                continue
+            for source, kind in self.graph.predecessors(target):
+                hop = (target, self.graph.edge_kinds[kind])
+                if self.graph.ids[source] > after and (source not in hops or hop < hops[source]):
+                    hops[source] = hop
+        return [
+            {
+                "id": self.graph.ids[source],
+                "kind": self.graph.node_kinds[self.graph.node_kind[source]],
+                "next_hop": self.graph.ids[hops[source][0]],
+                "via": hops[source][1],
+            }
+            for source in heapq.nsmallest(page_size, hops)
+        ]
+
+    def _query_critical_path(self, start_id: str, target_id: str) -> Optional[Dict]:
+        start, target = self.graph.index_of(start_id), self.graph.index_of(target_id)
+        if start is None or target is None:
+            return None
+        paths = self.graph.shortest_paths(start, [target], max_length=self.graph.node_count, max_paths=1)
+        if not paths:
+            return None
+        return _client._critical_path(start_id, target_id, self.graph.hops(paths[0]))
+
+    def _query_tier_zero_paths(self, start_id: str, max_length: int, max_paths: int) -> List[Dict]:
+        start = self.graph.index_of(start_id)
+        if start is None:
+            return []
+        return [
+            _client._critical_path(start_id, self.graph.ids[chain[-1][0]], self.graph.hops(chain))
+            for chain in self.graph.shortest_paths(start, None, max_length=max_length, max_paths=max_paths)
+        ]
+
+    def _resolve_identities(self, queries: List[str]) -> Dict[str, Dict]:
+        resolved = {}
+        for query in queries:
+            index = self.graph.resolve(query)
+            if index is not None:
+                resolved[query] = self._resolved(index)
+        return resolved
+
+    def _reachable_assets_bulk(self, oids: List[str], limit: int) -> Dict[str, List[Dict]]:
+        return {oid: self._query_reachable_assets(oid, limit) for oid in oids}
+
+    def _critical_paths_bulk(self, oids: List[str], target_id: str) -> Dict[str, Dict]:
+        paths = {}
+        for oid in oids:
+            path = self._query_critical_path(oid, target_id)
+            if path:
+                paths[oid] = path
+        return paths
+
+    def _tier_zero_paths_bulk(self, oids: List[str], max_length: int, max_paths: int) -> Dict[str, List[Dict]]:
+        return {oid: self._query_tier_zero_paths(oid, max_length, max_paths) for oid in oids}
+
+    def _resolved(self, index: int) -> Dict:
+        node = self.graph.node(index)
+        if node["type"] == "AZUser":
+            node["properties"] = {"userprincipalname": node["name"].lower()}
+        return node
+
+
+class _NoTransport:
+    def request(self, method: str, path: str, **kwargs: Any) -> Any:
+        raise _client.TransportError("local graph backend has no HTTP API")
+
+    def close(self) -> None:
+        return None
+
+
+def _odata_kind(principal: Dict[str, Any]) -> str:
+    odata = str(principal.get("@odata.type") or "")
+    return {
+        "#microsoft.graph.user": "AZUser",
+        "#microsoft.graph.group": "AZGroup",
+        "#microsoft.graph.servicePrincipal": "AZServicePrincipal",
+        "#microsoft.graph.device": "AZDevice",
+        "#microsoft.graph.application": "AZApp",
+    }.get(odata, "Base")
+
+
+def _expand_paths(paths: Iterable[str]) -> Iterator[str]:
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(".json"):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def _as_array(typecode: str, values: Any) -> array:
+    if isinstance(values, array) and values.typecode == typecode:
+        return values
+    if isinstance(values, (bytes, bytearray, memoryview)) and typecode == "B":
+        return array("B", bytes(values))
+    return array(typecode, values)
+
+
+def _align(position: int) -> int:
+    return (position + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Build a local graph snapshot from AzureHound output")
+    parser.add_argument("inputs", nargs="+", help="AzureHound JSON files or directories")
+    parser.add_argument("--out", required=True, help="snapshot path to write")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    graph = LocalGraph.from_azurehound(args.inputs)
+    graph.save(args.out)
+    print(
+        f"nodes={graph.node_count} edges={graph.edge_count} "
+        f"tier_zero={sum(graph.tier_zero)} built_in={time.perf_counter() - started:.2f}s -> {args.out}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,214 @@
+"""Table-driven `privilege_classification` for reachable assets.
+
+An asset's privilege comes from the edge that reaches it, not from its name:
+`AZOwner` on a subscription is admin, `AZContributor` is write, `AZGetSecrets`
+is read, and so on. The rules live in two tables:
+
+- `EDGE_RULES`: edge kind (`via`) -> `(privilege, evidence)` for every asset kind;
+- `KIND_RULES`: `(asset kind, via)` -> `(privilege, evidence)`, overriding
+  `EDGE_RULES` where the target kind matters (owning an app vs a group).
+
+A privilege of `None` means the edge itself grants nothing fixed (membership,
+role assignment); the asset's name then decides, through one multi-pattern
+matcher (`NAME_PATTERNS`, e.g. "Global Administrator" -> admin). Unknown
+edges are treated the same way. Anything the name does not match is read.
+
+`PrivilegeClassifier.classify(assets)` labels a whole batch in one pass: the
+(kind, via) pairs are looked up in a precompiled code table, and the names
+that need the matcher are lower-cased, joined into one text and searched for
+each pattern with `str.find` (C speed; Python only sees the hits, which is far
+faster than a regex alternation). It returns one privilege and one evidence
+code per asset (`PRIVILEGES` / `EVIDENCE` index).
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from itertools import accumulate
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+PRIVILEGES = ("admin", "write", "read", "execute")
+EVIDENCE = ("graph_edge", "role_assignment", "ownership", "risky_path")
+
+Rule = Tuple[Optional[str], str]
+
+# Lower-case BloodHound edge kinds (AzureHound and SharpHound).
+EDGE_RULES: Dict[str, Rule] = {
+    # Ownership
+    "azowner": ("admin", "ownership"),
+    "azowns": ("admin", "ownership"),
+    "owns": ("admin", "ownership"),
+    # Azure RBAC and Entra ID role edges
+    "azuseraccessadministrator": ("admin", "role_assignment"),
+    "azglobaladmin": ("admin", "role_assignment"),
+    "azprivilegedroleadmin": ("admin", "role_assignment"),
+    "azprivilegedauthadmin": ("admin", "role_assignment"),
+    "azappadmin": ("admin", "role_assignment"),
+    "azcloudappadmin": ("admin", "role_assignment"),
+    "azvmadminlogin": ("admin", "role_assignment"),
+    "adminto": ("admin", "role_assignment"),
+    "azcontributor": ("write", "role_assignment"),
+    "azkeyvaultcontributor": ("write", "role_assignment"),
+    "azvmcontributor": ("write", "role_assignment"),
+    "azaverecontributor": ("write", "role_assignment"),
+    "azwebsitecontributor": ("write", "role_assignment"),
+    "azlogicappcontributor": ("write", "role_assignment"),
+    "azautomationcontributor": ("write", "role_assignment"),
+    "azakscontributor": ("write", "role_assignment"),
+    "azhasrole": (None, "role_assignment"),
+    "hasrole": (None, "role_assignment"),
+    # Abusable rights
+    "genericall": ("admin", "risky_path"),
+    "dcsync": ("admin", "risky_path"),
+    "genericwrite": ("write", "risky_path"),
+    "writedacl": ("write", "risky_path"),
+    "writeowner": ("write", "risky_path"),
+    "allextendedrights": ("write", "risky_path"),
+    "addmember": ("write", "risky_path"),
+    "addself": ("write", "risky_path"),
+    "forcechangepassword": ("write", "risky_path"),
+    "azresetpassword": ("write", "risky_path"),
+    "azaddmembers": ("write", "risky_path"),
+    "azaddowner": ("write", "risky_path"),
+    "azaddsecret": ("write", "risky_path"),
+    "azmgaddmember": ("write", "risky_path"),
+    "azmgaddowner": ("write", "risky_path"),
+    "azmgaddsecret": ("write", "risky_path"),
+    "azmggrantapproles": ("write", "risky_path"),
+    "azmggrantrole": ("write", "risky_path"),
+    "azexecutecommand": ("execute", "risky_path"),
+    "canrdp": ("execute", "risky_path"),
+    "canpsremote": ("execute", "risky_path"),
+    "executedcom": ("execute", "risky_path"),
+    "azgetkeys": ("read", "risky_path"),
+    "azgetsecrets": ("read", "risky_path"),
+    "azgetcertificates": ("read", "risky_path"),
+    "readlapspassword": ("read", "risky_path"),
+    "readgmsapassword": ("read", "risky_path"),
+    # Membership: the group's name decides (e.g. "Domain Admins").
+    "memberof": (None, "graph_edge"),
+    "azmemberof": (None, "graph_edge"),
+}
+
+# (lower-case asset kind, via) overrides.
+KIND_RULES: Dict[Tuple[str, str], Rule] = {
+    # Owning a group or device lets the owner manage it, not the tenant.
+    ("azgroup", "azowns"): ("write", "ownership"),
+    ("group", "owns"): ("write", "ownership"),
+    ("azdevice", "azowns"): ("write", "ownership"),
+    # Owners of apps and service principals can add credentials and act as them.
+    ("azapp", "azowns"): ("admin", "ownership"),
+    ("azserviceprincipal", "azowns"): ("admin", "ownership"),
+}
+
+# Name heuristics: lower-case substrings by privilege; the strongest match wins.
+NAME_PATTERNS: Dict[str, Sequence[str]] = {
+    "admin": ("admin", "owner", "privileged", "tier0", "tier 0", "tier-0", "tier_0"),
+    "write": ("contributor", "writer", "operator", "editor"),
+    "execute": ("login", "execut", "runas", "run as"),
+}
+
+# Strength when several name patterns or rules meet: admin > write > execute > read.
+_RANK = {"admin": 3, "write": 2, "execute": 1, "read": 0}
+_PRIVILEGE_CODES = {name: code for code, name in enumerate(PRIVILEGES)}
+_EVIDENCE_CODES = {name: code for code, name in enumerate(EVIDENCE)}
+_BY_NAME = 0x0F  # privilege nibble of a rule decided by the name matcher
+_READ = _PRIVILEGE_CODES["read"]
+_kind_of = itemgetter("kind")
+_via_of = itemgetter("via")
+
+
+class _RuleCodes(dict):
+    """(kind, via) -> packed rule code (evidence << 4 | privilege), compiled on first sight."""
+
+    def __init__(self, classifier: "PrivilegeClassifier") -> None:
+        super().__init__()
+        self._classifier = classifier
+
+    def __missing__(self, key: Tuple[str, str]) -> int:
+        kind, via = key
+        kind = (kind or "").lower()
+        via = (via or "").lower()
+        classifier = self._classifier
+        privilege, evidence = classifier.kind_rules.get((kind, via)) or classifier.edge_rules.get(
+            via, (None, "graph_edge")
+        )
+        code = _EVIDENCE_CODES[evidence] << 4 | (_BY_NAME if privilege is None else _PRIVILEGE_CODES[privilege])
+        self[key] = code
+        return code
+
+
+class PrivilegeClassifier:
+    """Classifier over `edge_rules` / `kind_rules` / `name_patterns` (defaults: module tables)."""
+
+    def __init__(
+        self,
+        edge_rules: Optional[Dict[str, Rule]] = None,
+        kind_rules: Optional[Dict[Tuple[str, str], Rule]] = None,
+        name_patterns: Optional[Dict[str, Sequence[str]]] = None,
+    ) -> None:
+        self.edge_rules = dict(EDGE_RULES if edge_rules is None else edge_rules)
+        self.kind_rules = dict(KIND_RULES if kind_rules is None else kind_rules)
+        patterns = NAME_PATTERNS if name_patterns is None else name_patterns
+        for privilege, _ in (*self.edge_rules.values(), *self.kind_rules.values()):
+            if privilege is not None and privilege not in _PRIVILEGE_CODES:
+                raise ValueError(f"unknown privilege: {privilege}")
+        for _, evidence in (*self.edge_rules.values(), *self.kind_rules.values()):
+            if evidence not in _EVIDENCE_CODES:
+                raise ValueError(f"unknown evidence: {evidence}")
+        unknown = set(patterns) - set(_PRIVILEGE_CODES)
+        if unknown:
+            raise ValueError(f"unknown privilege in name_patterns: {sorted(unknown)}")
+        # Strongest privilege first (see `_apply_names`).
+        self._patterns = sorted(
+            ((pattern.lower(), _PRIVILEGE_CODES[privilege], _RANK[privilege])
+             for privilege, group in patterns.items() for pattern in group if pattern),
+            key=lambda entry: -entry[2],
+        )
+        self._codes = _RuleCodes(self)
+        # Packed rule code -> privilege code / evidence code / needs-name flag.
+        self._privilege_table = bytes((code & 0x0F if code & 0x0F != _BY_NAME else _READ) for code in range(256))
+        self._evidence_table = bytes(code >> 4 for code in range(256))
+        self._by_name_table = bytes(int(code & 0x0F == _BY_NAME) for code in range(256))
+
+    def classify(self, assets: Sequence[Dict]) -> Tuple[bytearray, bytes]:
+        """Privilege and evidence codes (`PRIVILEGES` / `EVIDENCE` index), one per asset."""
+        codes = bytes(map(self._codes.__getitem__, zip(map(_kind_of, assets), map(_via_of, assets))))
+        privilege = bytearray(codes.translate(self._privilege_table))
+        evidence = codes.translate(self._evidence_table)
+        by_name = [match.start() for match in re.finditer(b"\x01", codes.translate(self._by_name_table))]
+        if by_name:
+            self._apply_names(privilege, [assets[i].get("name") or "" for i in by_name], by_name)
+        return privilege, evidence
+
+    def labels(self, assets: Sequence[Dict]) -> Iterator[Tuple[str, str]]:
+        """`(privilege, evidence)` per asset, in order."""
+        privilege, evidence = self.classify(assets)
+        return zip(map(PRIVILEGES.__getitem__, privilege), map(EVIDENCE.__getitem__, evidence))
+
+    def _apply_names(self, privilege: bytearray, names: List[str], positions: List[int]) -> None:
+        # Role and group names repeat across assets: match each distinct name once.
+        distinct = list(dict.fromkeys(names))
+        # Distinct names are searched as one "\n"-joined text; `starts` maps a hit back to its name.
+        lowered = list(map(str.lower, distinct))
+        text = "\n".join(lowered)
+        starts = list(accumulate((len(name) + 1 for name in lowered), initial=0))
+        find = text.find
+        decided: Dict[str, int] = {}
+        for pattern, code, _ in self._patterns:
+            position = find(pattern)
+            while position != -1:
+                slot = bisect_right(starts, position) - 1
+                # Patterns run strongest first, so the first hit on a name is its privilege.
+                decided.setdefault(distinct[slot], code)
+                position = find(pattern, starts[slot + 1])
+        if decided:
+            for position, name in zip(positions, names):
+                code = decided.get(name)
+                if code is not None:
+                    privilege[position] = code
+
+
+DEFAULT_CLASSIFIER = PrivilegeClassifier()
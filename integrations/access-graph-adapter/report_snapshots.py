@@ -0,0 +1,314 @@
+"""Versioned blast-radius report snapshots and diffs between ingestions.
+
+`SnapshotStore` keeps one compact snapshot per ingestion epoch: a gzip JSON
+lines file with a header line and one line per identity report. Reports are
+keyed by identity object id; `privilege_classification` is derived from the
+reachable assets, so it is not stored.
+
+`refresh` moves a snapshot to the next epoch. When the old and new local
+graphs are available (`graph_engine.LocalGraph`, e.g. snapshots of two
+AzureHound imports) only identities that can reach a changed node within the
+report's path length are recomputed; every other report is carried over. The
+result lists, per recomputed identity, the reachable assets and critical paths
+that were added or removed.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+_SNAPSHOT_VERSION = 1
+
+
+if __package__:
+    from . import client as _client, graph_engine as _engine
+else:  # a script in this directory (python graph_engine.py ...), not the package
+    import client as _client, graph_engine as _engine
+
+
+class SnapshotStore:
+    """Directory of per-epoch report snapshots (`<epoch>.reports.jsonl.gz`)."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def path_for(self, epoch: str) -> str:
+        safe = re.sub(r"[^A-Za-z0-9._-]", "_", epoch)
+        return os.path.join(self.directory, f"{safe}.reports.jsonl.gz")
+
+    def epochs(self) -> List[str]:
+        """Stored epochs, oldest first (by write time)."""
+        if not os.path.isdir(self.directory):
+            return []
+        found = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".reports.jsonl.gz"):
+                continue
+            path = os.path.join(self.directory, name)
+            header = self._header(path)
+            if header is not None:
+                found.append((header.get("written_at", 0), header["epoch"]))
+        return [epoch for _, epoch in sorted(found)]
+
+    def latest_epoch(self) -> Optional[str]:
+        epochs = self.epochs()
+        return epochs[-1] if epochs else None
+
+    def save(self, epoch: str, reports: Iterable[Dict], *, meta: Optional[Dict[str, Any]] = None) -> str:
+        """Write the snapshot for `epoch` (atomic replace); returns its path."""
+        path = self.path_for(epoch)
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        header = {"version": _SNAPSHOT_VERSION, "epoch": epoch, "written_at": time.time(), **(meta or {})}
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps(header, separators=(",", ":")) + "\n")
+            for report in reports:
+                f.write(json.dumps(_pack(report), separators=(",", ":")) + "\n")
+        os.replace(tmp_path, path)
+        return path
+
+    def load(self, epoch: str) -> Dict[str, Dict]:
+        """Reports of `epoch` by identity id (empty when there is no snapshot)."""
+        path = self.path_for(epoch)
+        if not os.path.exists(path):
+            return {}
+        reports: Dict[str, Dict] = {}
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != _SNAPSHOT_VERSION:
+                raise ValueError(f"unsupported report snapshot version: {header.get('version')}")
+            for line in f:
+                report = _unpack(json.loads(line))
+                reports[report["identity"]["id"]] = report
+        return reports
+
+    def get(self, identity_id: str, epoch: str) -> Optional[Dict]:
+        return self.load(epoch).get(identity_id)
+
+    @staticmethod
+    def _header(path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                header = json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+        return header if isinstance(header, dict) and "epoch" in header else None
+
+
+def diff_reports(old: Optional[Dict], new: Optional[Dict]) -> Dict[str, Any]:
+    """Added/removed reachable assets (by id + via) and critical paths (by target + hops)."""
+    old_assets = {_asset_key(a): a for a in (old or {}).get("reachable_assets", [])}
+    new_assets = {_asset_key(a): a for a in (new or {}).get("reachable_assets", [])}
+    old_paths = {_path_key(p): p for p in (old or {}).get("critical_paths", [])}
+    new_paths = {_path_key(p): p for p in (new or {}).get("critical_paths", [])}
+    identity = (new or old or {}).get("identity", {})
+    return {
+        "identity_id": identity.get("id"),
+        "reachable_assets": {
+            "added": [new_assets[k] for k in new_assets if k not in old_assets],
+            "removed": [old_assets[k] for k in old_assets if k not in new_assets],
+        },
+        "critical_paths": {
+            "added": [new_paths[k] for k in new_paths if k not in old_paths],
+            "removed": [old_paths[k] for k in old_paths if k not in new_paths],
+        },
+    }
+
+
+def diff_is_empty(diff: Dict[str, Any]) -> bool:
+    return not any(
+        diff[section][change] for section in ("reachable_assets", "critical_paths") for change in ("added", "removed")
+    )
+
+
+def affected_identities(
+    old_graph: Any, new_graph: Any, identity_ids: Iterable[str], *, max_depth: Optional[int]
+) -> Set[str]:
+    """Identities (of `identity_ids`) that reach a changed node within `max_depth` edges in either graph.
+
+    A report only depends on the nodes within that radius of the identity, so
+    every identity outside this set has an unchanged report.
+    """
+    changed = _engine.changed_nodes(old_graph, new_graph)
+    wanted = {identity_id.upper() for identity_id in identity_ids}
+    affected: Set[str] = set()
+    for graph in (old_graph, new_graph):
+        seeds = [index for index in (graph.index_of(object_id) for object_id in changed) if index is not None]
+        for index in graph.ancestors(seeds, max_depth=max_depth):
+            object_id = graph.ids[index]
+            if object_id in wanted:
+                affected.add(object_id)
+    return affected
+
+
+def refresh(
+    client: Any,
+    store: SnapshotStore,
+    identity_refs: List[Dict],
+    *,
+    previous_epoch: Optional[str] = None,
+    old_graph: Any = None,
+    new_graph: Any = None,
+    critical_target_id: Optional[str] = None,
+    tier_zero: bool = False,
+    max_path_length: int = _client.DEFAULT_MAX_PATH_LENGTH,
+    max_paths: int = _client.DEFAULT_MAX_PATHS,
+    batch_size: int = 200,
+) -> Dict[str, Any]:
+    """Bring the report snapshot up to the client's current ingestion epoch.
+
+    `previous_epoch` defaults to the latest stored one. Without both graphs
+    (e.g. against the BloodHound API, which cannot tell what changed between
+    epochs) every identity is recomputed; the diff is still computed. Returns
+    `{"epoch", "previous_epoch", "recomputed", "reused", "diffs"}`; `diffs`
+    holds only identities whose report changed.
+    """
+    epoch = client.get_ingestion_epoch() or time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    if previous_epoch is None:
+        previous_epoch = store.latest_epoch()
+    previous = store.load(previous_epoch) if previous_epoch else {}
+    aliases = _aliases(previous)
+
+    known: Dict[str, str] = {}
+    for ref in identity_refs:
+        query = ref.get("id") or ref.get("upn") or ""
+        identity_id = aliases.get(query.lower())
+        if identity_id is not None:
+            known[query] = identity_id
+
+    stale = list(identity_refs)
+    if old_graph is not None and new_graph is not None and previous:
+        # Paths to an explicit target are unbounded; Tier Zero paths and
+        # reachable assets only look max_path_length / 1 hops out.
+        depth = None if critical_target_id else (max_path_length if tier_zero else 1)
+        affected = affected_identities(old_graph, new_graph, known.values(), max_depth=depth)
+        stale = [
+            ref
+            for ref in identity_refs
+            if (ref.get("id") or ref.get("upn") or "") not in known
+            or known[ref.get("id") or ref.get("upn") or ""].upper() in affected
+        ]
+
+    fresh = client.build_identity_reports(
+        stale,
+        critical_target_id,
+        batch_size=batch_size,
+        tier_zero=tier_zero,
+        max_path_length=max_path_length,
+        max_paths=max_paths,
+    )
+    reports = dict(previous)
+    diffs = []
+    recomputed = set()
+    for ref, report in zip(stale, fresh):
+        if report is None:
+            # Gone upstream: everything it could reach is removed.
+            identity_id = known.get(ref.get("id") or ref.get("upn") or "")
+            if identity_id is not None and reports.pop(identity_id, None) is not None:
+                diffs.append(diff_reports(previous[identity_id], None))
+            continue
+        identity_id = report["identity"]["id"]
+        recomputed.add(identity_id)
+        diff = diff_reports(previous.get(identity_id), report)
+        if not diff_is_empty(diff):
+            diffs.append(diff)
+        reports[identity_id] = report
+    store.save(epoch, reports.values(), meta={"previous_epoch": previous_epoch})
+    return {
+        "epoch": epoch,
+        "previous_epoch": previous_epoch,
+        "recomputed": len(recomputed),
+        "reused": len(reports) - len(recomputed),
+        "diffs": diffs,
+    }
+
+
+def _aliases(reports: Dict[str, Dict]) -> Dict[str, str]:
+    aliases: Dict[str, str] = {}
+    for identity_id, report in reports.items():
+        aliases[identity_id.lower()] = identity_id
+        upn = report["identity"].get("upn")
+        if upn:
+            aliases.setdefault(upn.lower(), identity_id)
+    return aliases
+
+
+def _asset_key(asset: Dict) -> Tuple[Any, Any]:
+    return (asset.get("id"), asset.get("via"))
+
+
+def _path_key(path: Dict) -> Tuple[Any, ...]:
+    return (path.get("to"), tuple((hop.get("id"), hop.get("edge")) for hop in path.get("hops", [])))
+
+
+def _pack(report: Dict) -> Dict[str, Any]:
+    return {
+        "i": report["identity"],
+        "r": [
+            [a.get("id"), a.get("name"), a.get("kind"), a.get("via"), a.get("confidence")]
+            for a in report["reachable_assets"]
+        ],
+        "c": [
+            [p.get("from"), p.get("to"), [[h.get("id"), h.get("type"), h.get("edge")] for h in p.get("hops", [])]]
+            for p in report["critical_paths"]
+        ],
+    }
+
+
+def _unpack(packed: Dict[str, Any]) -> Dict:
+    reachable = [
+        {"id": id_, "name": name, "kind": kind, "via": via, "confidence": confidence}
+        for id_, name, kind, via, confidence in packed["r"]
+    ]
+    critical = [
+        _client._critical_path(start, target, [{"id": h[0], "type": h[1], "edge": h[2]} for h in hops])
+        for start, target, hops in packed["c"]
+    ]
+    identity = packed["i"]
+    report = _client._assemble_report({}, reachable, critical)
+    report["identity"] = identity
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Refresh report snapshots from a new local graph and print diffs")
+    parser.add_argument("--store", required=True, help="snapshot directory")
+    parser.add_argument("--new", required=True, help="graph snapshot of the new ingestion")
+    parser.add_argument("--old", help="graph snapshot of the previous ingestion (enables incremental recompute)")
+    parser.add_argument("--identities", required=True, help="JSON file with a list of identity references")
+    parser.add_argument("--tier-zero", action="store_true")
+    parser.add_argument("--critical-target")
+    args = parser.parse_args(argv)
+
+    with open(args.identities, "r", encoding="utf-8") as f:
+        refs = json.load(f)
+    new_graph = _engine.LocalGraph.load(args.new)
+    old_graph = _engine.LocalGraph.load(args.old) if args.old else None
+    client = _engine.LocalGraphClient(new_graph)
+    started = time.perf_counter()
+    result = refresh(
+        client,
+        SnapshotStore(args.store),
+        refs,
+        old_graph=old_graph,
+        new_graph=new_graph,
+        critical_target_id=args.critical_target,
+        tier_zero=args.tier_zero,
+    )
+    result["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+    print(json.dumps(result, indent=2))
+    client.close()
+    if old_graph is not None:
+        old_graph.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
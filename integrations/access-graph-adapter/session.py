@@ -0,0 +1,158 @@
+"""Process-wide BloodHound session tokens for the access graph adapter.
+
+One `SessionManager` per (base URL, username) is shared by every client in
+the process (`SessionManager.shared`). It hands out the current session token,
+logs in again shortly before the token expires, and lets only one thread log
+in at a time: concurrent callers wait for that single login instead of each
+starting their own.
+
+Expiry is read from the token's JWT `exp` claim when present, otherwise
+`default_ttl` seconds after login is assumed.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+LoginFn = Callable[[], Tuple[str, Optional[float]]]
+
+
+class SessionManager:
+    """Thread-safe, single-flight session token holder.
+
+    - `refresh_margin`: log in again when the token expires within this many
+      seconds. While that refresh is in flight, other callers keep using the
+      still-valid token instead of waiting.
+    - `default_ttl`: assumed token lifetime when the token carries no expiry.
+    """
+
+    _registry: Dict[Tuple[str, str], "SessionManager"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(
+        self,
+        *,
+        refresh_margin: float = 120.0,
+        default_ttl: float = 3600.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.refresh_margin = refresh_margin
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._token: Optional[str] = None
+        self._expires_at: Optional[float] = None
+        self._in_flight = False
+        self._flight = 0
+        self._failures: Dict[int, BaseException] = {}
+        self._counters = {"logins": 0, "refreshes": 0, "login_failures": 0, "invalidations": 0, "waits": 0}
+
+    @classmethod
+    def shared(cls, base_url: str, username: str, **kwargs: Any) -> "SessionManager":
+        """The process-wide manager for `username` at `base_url` (created on first use)."""
+        key = (base_url.rstrip("/"), username)
+        with cls._registry_lock:
+            manager = cls._registry.get(key)
+            if manager is None:
+                manager = cls._registry[key] = cls(**kwargs)
+            return manager
+
+    @property
+    def current_token(self) -> Optional[str]:
+        with self._cond:
+            return self._token
+
+    def set_token(self, token: Optional[str], expires_at: Optional[float] = None) -> None:
+        """Install a token obtained elsewhere (None clears it)."""
+        with self._cond:
+            self._token = token
+            self._expires_at = expires_at if token is None or expires_at is not None else _jwt_expiry(token)
+            self._cond.notify_all()
+
+    def token(self, login: LoginFn) -> str:
+        """Return a usable token, calling `login()` at most once across all waiting threads.
+
+        `login` returns `(token, expires_at)`; `expires_at` (epoch seconds) may be
+        None, in which case the JWT `exp` claim or `default_ttl` is used.
+        """
+        with self._cond:
+            while True:
+                now = self._clock()
+                if self._token is not None and not self._expires_within(now, self.refresh_margin):
+                    return self._token
+                if not self._in_flight:
+                    break
+                if self._token is not None and not self._expires_within(now, 0.0):
+                    # Refresh already under way; the current token is still valid.
+                    return self._token
+                flight = self._flight
+                self._counters["waits"] += 1
+                while self._in_flight and self._flight == flight:
+                    self._cond.wait()
+                if flight in self._failures:
+                    raise self._failures[flight]
+            self._in_flight = True
+            self._flight += 1
+            flight = self._flight
+            self._failures.pop(flight - 1, None)
+            refreshing = self._token is not None
+
+        try:
+            token, expires_at = login()
+        except BaseException as exc:
+            with self._cond:
+                self._counters["login_failures"] += 1
+                self._failures[flight] = exc
+                self._in_flight = False
+                self._cond.notify_all()
+            raise
+
+        with self._cond:
+            self._token = token
+            self._expires_at = expires_at if expires_at is not None else _jwt_expiry(token)
+            if self._expires_at is None:
+                self._expires_at = self._clock() + self.default_ttl
+            self._counters["refreshes" if refreshing else "logins"] += 1
+            self._in_flight = False
+            self._cond.notify_all()
+            return token
+
+    def invalidate(self, token: Optional[str]) -> None:
+        """Drop `token` after the API rejected it (401).
+
+        A no-op when another thread already replaced it, so a burst of 401s on
+        the same stale token triggers one re-login, not one per request.
+        """
+        with self._cond:
+            if token is not None and token == self._token:
+                self._token = None
+                self._expires_at = None
+                self._counters["invalidations"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                **self._counters,
+                "expires_in": (self._expires_at - self._clock()) if self._expires_at is not None else None,
+            }
+
+    def _expires_within(self, now: float, margin: float) -> bool:
+        return self._expires_at is not None and self._expires_at - now <= margin
+
+
+def _jwt_expiry(token: str) -> Optional[float]:
+    """`exp` claim of a JWT, or None when the token is not a JWT or has no expiry."""
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    payload = parts[1] + "=" * (-len(parts[1]) % 4)
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload.encode("ascii")))
+    except (ValueError, UnicodeError):
+        return None
+    exp = claims.get("exp") if isinstance(claims, dict) else None
+    return float(exp) if isinstance(exp, (int, float)) else None
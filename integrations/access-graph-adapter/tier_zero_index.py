@@ -0,0 +1,280 @@
+"""Precomputed distance-to-Tier-Zero index for the access graph adapter.
+
+Built once per BloodHound ingestion by a reverse multi-source BFS: all Tier
+Zero nodes form level 0, and each level adds the nodes with an edge into the
+previous one. For every node reached the index stores its distance (edges) to
+the nearest Tier Zero node and the next hop on that path, so the path from any
+identity is read by following next hops, without an API call.
+
+On disk the index is one file written by `graph_engine.write_snapshot` (the
+graph snapshot layout): node ids sorted for binary search in a UTF-8 blob with
+offsets, plus `distance`, `next_hop`, `node_kind` and `edge_kind` arrays.
+`load` memory-maps it.
+
+Build with `python tier_zero_index.py --out tier0.idx` against BloodHound
+(`--bloodhound-url`, `--username`, password from BLOODHOUND_PASSWORD) or an
+offline graph (`--snapshot`), then `client.use_tier_zero_index(TierZeroIndex.load(...))`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+_MAGIC = b"ITDRT0I1"
+_INDEX_VERSION = 1
+_NO_HOP = -1
+
+
+if __package__:
+    from . import client as _client, graph_engine as _engine
+else:  # a script in this directory (python graph_engine.py ...), not the package
+    import client as _client, graph_engine as _engine
+
+
+class TierZeroIndex:
+    """Read-only distance / next-hop table keyed by object id."""
+
+    def __init__(
+        self,
+        *,
+        ids: Any,
+        distance: Sequence[int],
+        next_hop: Sequence[int],
+        node_kind: Sequence[int],
+        edge_kind: Sequence[int],
+        node_kinds: List[str],
+        edge_kinds: List[str],
+        epoch: Optional[str],
+        stats: Optional[Dict[str, Any]] = None,
+        snapshot: Optional[_engine.SnapshotFile] = None,
+    ) -> None:
+        self.ids = ids
+        self.distance = distance
+        self.next_hop = next_hop
+        self.node_kind = node_kind
+        self.edge_kind = edge_kind
+        self.node_kinds = node_kinds
+        self.edge_kinds = edge_kinds
+        self.epoch = epoch
+        self.stats = stats or {}
+        self._snapshot = snapshot
+
+    def __len__(self) -> int:
+        return len(self.distance)
+
+    # --- construction ---
+
+    @classmethod
+    def build(
+        cls,
+        client: Any,
+        *,
+        max_depth: int = 8,
+        frontier_batch: int = 500,
+        page_size: int = 5000,
+    ) -> "TierZeroIndex":
+        """Run the reverse BFS through `client` (a `BloodHoundClient` or `LocalGraphClient`).
+
+        Each level is expanded `frontier_batch` nodes per cypher call and paged
+        `page_size` rows at a time, as in `iter_blast_radius`. Raises
+        RuntimeError if the ingestion epoch changes while the index is built.
+        """
+        _client._check_expansion_limits(max_depth, frontier_batch, page_size)
+        started = time.perf_counter()
+        epoch = client.get_ingestion_epoch()
+        # object id -> (distance, next hop id, edge kind, node kind)
+        reached: Dict[str, Tuple[int, Optional[str], Optional[str], Optional[str]]] = {}
+        frontier = []
+        for row in client.iter_tier_zero_nodes(page_size=page_size):
+            object_id = row.get("id")
+            if object_id and object_id not in reached:
+                reached[object_id] = (0, None, None, row.get("kind"))
+                frontier.append(object_id)
+        tier_zero = len(frontier)
+        calls = 0
+        for depth in range(1, max_depth + 1):
+            next_frontier = []
+            for batch in _client._batches(frontier, frontier_batch):
+                after = ""
+                while True:
+                    rows = client._query_reverse_expansion_page(batch, after, page_size)
+                    calls += 1
+                    for row in rows:
+                        object_id = row.get("id")
+                        if not object_id or object_id in reached:
+                            continue
+                        reached[object_id] = (depth, row.get("next_hop"), row.get("via"), row.get("kind"))
+                        next_frontier.append(object_id)
+                    if len(rows) < page_size:
+                        break
+                    after = rows[-1].get("id") or ""
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        if client.get_ingestion_epoch() != epoch:
+            raise RuntimeError("BloodHound ingestion epoch changed while building the tier zero index; re-run")
+
+        index = cls._from_reached(reached, epoch)
+        index.stats = {
+            "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "build_seconds": round(time.perf_counter() - started, 3),
+            "nodes": len(reached),
+            "tier_zero": tier_zero,
+            "max_depth": max_depth,
+            "expansion_calls": calls,
+            "peak_rss_mb": _peak_rss_mb(),
+        }
+        return index
+
+    @classmethod
+    def _from_reached(
+        cls, reached: Dict[str, Tuple[int, Optional[str], Optional[str], Optional[str]]], epoch: Optional[str]
+    ) -> "TierZeroIndex":
+        order = sorted(reached)
+        position = {object_id: i for i, object_id in enumerate(order)}
+        node_kinds: List[str] = []
+        edge_kinds: List[str] = []
+        node_codes: Dict[str, int] = {}
+        edge_codes: Dict[str, int] = {}
+        distance, next_hop = array("B"), array("i")
+        node_kind, edge_kind = array("B"), array("B")
+        for object_id in order:
+            depth, hop, via, kind = reached[object_id]
+            distance.append(depth)
+            next_hop.append(position[hop] if hop in position else _NO_HOP)
+            node_kind.append(_engine.intern_kind(kind or "Base", node_kinds, node_codes))
+            edge_kind.append(_engine.intern_kind(via or "", edge_kinds, edge_codes))
+        return cls(
+            ids=_engine.StringTable.build(order),
+            distance=distance,
+            next_hop=next_hop,
+            node_kind=node_kind,
+            edge_kind=edge_kind,
+            node_kinds=node_kinds,
+            edge_kinds=edge_kinds,
+            epoch=epoch,
+        )
+
+    @classmethod
+    def load(cls, path: str, *, use_mmap: bool = True) -> "TierZeroIndex":
+        snapshot = _engine.open_snapshot(path, _MAGIC, _INDEX_VERSION, use_mmap=use_mmap, what="tier zero index")
+        arrays, header = snapshot.arrays, snapshot.header
+        return cls(
+            ids=_engine.StringTable(arrays["id_offsets"], arrays["id_blob"]),
+            distance=arrays["distance"],
+            next_hop=arrays["next_hop"],
+            node_kind=arrays["node_kind"],
+            edge_kind=arrays["edge_kind"],
+            node_kinds=header["node_kinds"],
+            edge_kinds=header["edge_kinds"],
+            epoch=header.get("epoch"),
+            stats=header.get("stats"),
+            snapshot=snapshot,
+        )
+
+    def save(self, path: str) -> None:
+        """Write the index file (atomic replace)."""
+        arrays = {
+            "id_offsets": ("q", self.ids.offsets),
+            "id_blob": ("B", self.ids.blob),
+            "distance": ("B", self.distance),
+            "next_hop": ("i", self.next_hop),
+            "node_kind": ("B", self.node_kind),
+            "edge_kind": ("B", self.edge_kind),
+        }
+        header = {
+            "epoch": self.epoch,
+            "stats": self.stats,
+            "node_kinds": self.node_kinds,
+            "edge_kinds": self.edge_kinds,
+        }
+        _engine.write_snapshot(path, _MAGIC, _INDEX_VERSION, header, arrays)
+
+    def close(self) -> None:
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+
+    # --- queries ---
+
+    def position_of(self, object_id: str) -> Optional[int]:
+        key = object_id.encode("utf-8")
+        lo, hi = 0, len(self.ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.ids.raw(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self.ids) and self.ids.raw(lo) == key:
+            return lo
+        return None
+
+    def distance_of(self, object_id: str) -> Optional[int]:
+        """Edges to the nearest Tier Zero node (0 for Tier Zero itself), or None if not within reach."""
+        position = self.position_of(object_id)
+        return None if position is None else self.distance[position]
+
+    def path(self, object_id: str) -> Optional[Dict]:
+        """Contract-shaped critical path to the nearest Tier Zero node, or None."""
+        position = self.position_of(object_id)
+        if position is None or self.distance[position] == 0:
+            return None
+        hops = []
+        while position != _NO_HOP:
+            last = self.distance[position] == 0
+            hops.append(
+                {
+                    "id": self.ids[position],
+                    "type": self.node_kinds[self.node_kind[position]].lower(),
+                    "edge": None if last else self.edge_kinds[self.edge_kind[position]],
+                }
+            )
+            if last:
+                break
+            position = self.next_hop[position]
+        return _client._critical_path(object_id, hops[-1]["id"], hops)
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    import getpass
+
+    parser = argparse.ArgumentParser(description="Build the Tier Zero distance index for the current ingestion")
+    parser.add_argument("--out", required=True, help="index path to write")
+    parser.add_argument("--snapshot", help="build from a local graph snapshot instead of BloodHound")
+    parser.add_argument("--bloodhound-url", default="http://localhost:8080")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--max-depth", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    if args.snapshot:
+        client = _engine.LocalGraphClient.from_snapshot(args.snapshot)
+    else:
+        password = os.environ.get("BLOODHOUND_PASSWORD") or getpass.getpass("BloodHound password: ")
+        client = _client.BloodHoundClient(args.bloodhound_url, args.username, password)
+    with client:
+        index = TierZeroIndex.build(client, max_depth=args.max_depth)
+    index.save(args.out)
+    index.stats["index_mb"] = round(os.path.getsize(args.out) / 1e6, 3)
+    print(json.dumps({"epoch": index.epoch, **index.stats}))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,239 @@
+"""HTTP transports for the BloodHound access graph adapter.
+
+`KeepAliveTransport` keeps a bounded pool of persistent HTTP/1.1 connections
+per adapter so consecutive API calls reuse the same TCP (and TLS) session.
+`UrllibTransport` is the original one-connection-per-call behaviour, kept for
+environments that rely on urllib proxy handling.
+
+Standard library only.
+"""
+
+from __future__ import annotations
+
+import http.client
+import socket
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Tuple
+
+
+class TransportError(Exception):
+    """The upstream could not be reached or did not answer in time."""
+
+
+@dataclass(frozen=True)
+class Response:
+    status: int
+    reason: str
+    headers: Mapping[str, str]
+    body: bytes
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    if deadline is None:
+        return None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TransportError("request deadline exceeded")
+    return remaining
+
+
+class KeepAliveTransport:
+    """Thread-safe pool of persistent HTTP/1.1 connections to one origin.
+
+    - At most `pool_size` connections are open at once; extra callers wait for
+      a free slot (bounded by their request deadline).
+    - Connections idle for longer than `idle_timeout` seconds are discarded
+      instead of reused.
+    - `timeout` is the default per-request deadline in seconds; it covers
+      waiting for a pool slot, connecting, sending and reading the response.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        pool_size: int = 8,
+        idle_timeout: float = 60.0,
+        timeout: float = 30.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ) -> None:
+        if pool_size < 1:
+            raise ValueError("pool_size must be >= 1")
+        parsed = urllib.parse.urlsplit(base_url)
+        if parsed.scheme not in ("http", "https"):
+            raise ValueError(f"unsupported URL scheme: {parsed.scheme!r}")
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        self.base_path = parsed.path.rstrip("/")
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._ssl_context = ssl_context
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._lock = threading.Lock()
+        self._idle: List[Tuple[http.client.HTTPConnection, float]] = []
+        self._closed = False
+        self.connections_opened = 0
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Response:
+        budget = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + budget if budget is not None else None
+        if not self._slots.acquire(timeout=_remaining(deadline)):
+            raise TransportError("timed out waiting for a pooled connection")
+        try:
+            conn, reused = self._checkout(deadline)
+            try:
+                return self._send(conn, method, path, body, headers or {}, deadline)
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if not reused:
+                    raise TransportError("connection closed by upstream") from None
+                # The server dropped a keep-alive connection between requests;
+                # retry once on a fresh connection.
+                conn = self._connect(deadline)
+                try:
+                    return self._send(conn, method, path, body, headers or {}, deadline)
+                except BaseException:
+                    conn.close()
+                    raise
+            except BaseException:
+                conn.close()
+                raise
+        except (socket.timeout, TimeoutError) as exc:
+            raise TransportError("request deadline exceeded") from exc
+        except (OSError, http.client.HTTPException) as exc:
+            raise TransportError(str(exc) or exc.__class__.__name__) from exc
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            conn.close()
+
+    def idle_connections(self) -> int:
+        with self._lock:
+            return len(self._idle)
+
+    def _checkout(self, deadline: Optional[float]) -> Tuple[http.client.HTTPConnection, bool]:
+        now = time.monotonic()
+        stale: List[http.client.HTTPConnection] = []
+        conn: Optional[http.client.HTTPConnection] = None
+        with self._lock:
+            while self._idle:
+                candidate, last_used = self._idle.pop()
+                if now - last_used > self.idle_timeout:
+                    stale.append(candidate)
+                    continue
+                conn = candidate
+                break
+        for old in stale:
+            old.close()
+        if conn is not None:
+            return conn, True
+        return self._connect(deadline), False
+
+    def _connect(self, deadline: Optional[float]) -> http.client.HTTPConnection:
+        timeout = _remaining(deadline)
+        if self.scheme == "https":
+            conn: http.client.HTTPConnection = http.client.HTTPSConnection(
+                self.host, self.port, timeout=timeout, context=self._ssl_context
+            )
+        else:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+        conn.connect()
+        conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self._lock:
+            self.connections_opened += 1
+        return conn
+
+    def _send(
+        self,
+        conn: http.client.HTTPConnection,
+        method: str,
+        path: str,
+        body: Optional[bytes],
+        headers: Dict[str, str],
+        deadline: Optional[float],
+    ) -> Response:
+        if conn.sock is not None:
+            conn.sock.settimeout(_remaining(deadline))
+        conn.request(method, f"{self.base_path}{path}", body=body, headers=headers)
+        resp = conn.getresponse()
+        payload = resp.read()
+        response = Response(
+            status=resp.status,
+            reason=resp.reason,
+            headers={k.lower(): v for k, v in resp.getheaders()},
+            body=payload,
+        )
+        if resp.will_close:
+            conn.close()
+        else:
+            self._checkin(conn)
+        return response
+
+    def _checkin(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if not self._closed and len(self._idle) < self.pool_size:
+                self._idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+
+class UrllibTransport:
+    """One `urllib.request` connection per call (no reuse)."""
+
+    def __init__(self, base_url: str, *, timeout: float = 30.0) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Response:
+        req = urllib.request.Request(f"{self.base_url}{path}", data=body, headers=headers or {}, method=method)
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout if timeout is None else timeout) as resp:
+                return Response(
+                    status=resp.status,
+                    reason=resp.reason,
+                    headers={k.lower(): v for k, v in resp.getheaders()},
+                    body=resp.read(),
+                )
+        except urllib.error.HTTPError as exc:
+            return Response(
+                status=exc.code,
+                reason=str(exc.reason),
+                headers={k.lower(): v for k, v in (exc.headers or {}).items()},
+                body=exc.read() or b"",
+            )
+        except urllib.error.URLError as exc:
+            raise TransportError(str(exc.reason)) from exc
+        except (socket.timeout, TimeoutError) as exc:
+            raise TransportError("request deadline exceeded") from exc
+
+    def close(self) -> None:
+        return None
@@ -0,0 +1,105 @@
+"""Containment of many identities: `execute_many` vs midPoint bulk actions.
+
+Runs the same requests as bench_execute_many.py (`--identities` x
+`revoke_sessions`, every fifth identity also `disable_identity` then
+`remove_role`) against a midPoint stub with `--latency` seconds per call, where
+every `--fail-every`-th identity cannot be processed. `execute_bulk` is run
+synchronously and asynchronously (tasks closing after `--task-seconds`), and
+once more with tasks outliving the polling timeout, which suspends them.
+`revoke_sessions` has no default bulk action and runs per identity. Reports
+wall time and midPoint HTTP calls, and checks that each identity's outcome
+maps back to its request.
+
+Usage: python bench_execute_bulk.py [--identities 2000] [--latency 0.02] [--batch-size 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from bench_execute_many import _load_adapter, _requests
+from midpoint_stub import MidPointStub
+
+
+def _check(results, requests, failing, bulk) -> None:
+    assert sorted(r["index"] for r in results) == list(range(len(requests)))
+    for result in results:
+        request = requests[result["index"]]
+        assert result["identity_ref"] == request["identity_ref"] and result["action_id"] == request["action_id"]
+        # The stub only fails objects of bulk actions.
+        in_bulk = bulk.bulk_action(request["action_id"], request["parameters"]) is not None
+        expected = "failed" if in_bulk and request["identity_ref"] in failing else "success"
+        assert result["result"]["status"] == expected, (result, expected)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--identities", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--fail-every", type=int, default=97)
+    parser.add_argument("--task-seconds", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    mod = _load_adapter()
+    requests = _requests(args.identities)
+    failing = [f"user-{i:05d}" for i in range(0, args.identities, args.fail_every)]
+    bulk = sys.modules["identity_governance_adapter_bulk"]
+    runs = [
+        ("execute_many", args.task_seconds, lambda adapter: adapter.execute_many(requests)),
+        (
+            "execute_bulk sync",
+            args.task_seconds,
+            lambda adapter: adapter.execute_bulk(requests, batch_size=args.batch_size, asynchronous=False),
+        ),
+        (
+            "execute_bulk async",
+            args.task_seconds,
+            lambda adapter: adapter.execute_bulk(requests, batch_size=args.batch_size, poll_interval=0.05),
+        ),
+        (
+            "execute_bulk timeout",
+            60.0,
+            lambda adapter: adapter.execute_bulk(
+                requests, batch_size=args.batch_size, poll_interval=0.05, timeout=args.task_seconds
+            ),
+        ),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, task_seconds, run in runs:
+            with MidPointStub(latency=args.latency, failing=failing, task_seconds=task_seconds) as stub:
+                adapter = mod.IdentityGovernanceAdapter(
+                    base_url=stub.base_url,
+                    username="u",
+                    password="p",
+                    storage_path=os.path.join(tmp, f"{name.replace(' ', '-')}.json"),
+                    max_concurrency=args.concurrency,
+                )
+                started = time.perf_counter()
+                results = list(run(adapter))
+                elapsed = time.perf_counter() - started
+                calls = stub.stats()["calls"]
+                journal = adapter.journal().stats()
+            assert journal["records"] == len(requests)
+            if name != "execute_many":
+                _check(results, requests, set(failing), bulk)
+            scripts = sum(1 for call in calls if call["path"] == "/ws/rest/rpc/executeScript")
+            suspends = sum(1 for call in calls if call["path"].endswith("/suspend"))
+            polls = sum(1 for call in calls if call["path"].startswith("/ws/rest/tasks/")) - suspends
+            if name == "execute_bulk timeout":
+                assert suspends == scripts, (suspends, scripts)
+            print(
+                f"{name:<20}: {len(requests)} actions in {elapsed:.2f}s ({len(requests) / elapsed:,.0f}/s), "
+                f"{len(calls)} midPoint calls ({scripts} bulk actions, {polls} task polls, {suspends} suspends, "
+                f"{len(calls) - scripts - polls - suspends} other)"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
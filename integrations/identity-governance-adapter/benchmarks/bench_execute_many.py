@@ -0,0 +1,112 @@
+"""Containment of many identities: serial `execute` vs `execute_many`.
+
+Runs `--identities` x `revoke_sessions` (every fifth identity also gets
+`disable_identity` then `remove_role`, which must stay in that order) against
+a midPoint stub with `--latency` seconds per call. Reports wall time, the
+stub's peak concurrency (must not exceed `--concurrency`) and journal commits.
+
+Usage: python bench_execute_many.py [--identities 300] [--latency 0.02] [--concurrency 8 32]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+
+from midpoint_stub import MidPointStub
+
+
+def _load_adapter():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "client.py")
+    spec = importlib.util.spec_from_file_location("identity_governance_adapter", path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError("failed to load adapter")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["identity_governance_adapter"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _requests(identities: int):
+    requests = []
+    for i in range(identities):
+        identity = f"user-{i:05d}"
+        base = {"incident_id": "inc-1", "identity_ref": identity}
+        requests.append({**base, "action_id": "revoke_sessions", "parameters": {}})
+        if i % 5 == 0:
+            requests.append({**base, "action_id": "disable_identity", "parameters": {}})
+            requests.append({**base, "action_id": "remove_role", "parameters": {"role_ref": "r1"}})
+    return requests
+
+
+def _check_order(calls) -> None:
+    # Per identity, midPoint must see revoke -> disable -> remove_role in request order.
+    seen = {}
+    for call in sorted(calls, key=lambda c: c["at"]):
+        if call["method"] != "POST":
+            continue  # pre-action state reads
+        body = call["body"] or {}
+        identity = body.get("identity_ref") or call["path"].rsplit("/", 1)[-1]
+        seen.setdefault(identity, []).append(body.get("operation", "revoke"))
+    for identity, operations in seen.items():
+        if len(operations) > 1:
+            assert operations == ["revoke", "disable", "remove_role"], (identity, operations)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--identities", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32])
+    args = parser.parse_args()
+
+    mod = _load_adapter()
+    requests = _requests(args.identities)
+    with tempfile.TemporaryDirectory() as tmp:
+        with MidPointStub(latency=args.latency) as stub:
+            serial = mod.IdentityGovernanceAdapter(
+                base_url=stub.base_url, username="u", password="p", storage_path=os.path.join(tmp, "serial.json")
+            )
+            started = time.perf_counter()
+            for request in requests:
+                serial.execute(**request)
+            elapsed = time.perf_counter() - started
+            print(f"serial execute      : {len(requests)} actions in {elapsed:.2f}s ({len(requests) / elapsed:,.0f}/s)")
+
+        for cap in args.concurrency:
+            # One stub per run: the concurrency cap is per midPoint base URL.
+            with MidPointStub(latency=args.latency) as stub:
+                adapter = mod.IdentityGovernanceAdapter(
+                    base_url=stub.base_url,
+                    username="u",
+                    password="p",
+                    storage_path=os.path.join(tmp, f"many-{cap}.json"),
+                    max_concurrency=cap,
+                )
+                started = time.perf_counter()
+                first = None
+                results = []
+                for result in adapter.execute_many(requests):
+                    first = first if first is not None else time.perf_counter() - started
+                    results.append(result)
+                elapsed = time.perf_counter() - started
+                journal = adapter.journal().stats()
+                server = stub.stats()
+            assert len(results) == len(requests) and journal["records"] == len(requests)
+            assert all(r["result"]["status"] == "success" for r in results)
+            assert server["max_in_flight"] <= cap, server["max_in_flight"]
+            _check_order(server["calls"])
+            print(
+                f"execute_many cap {cap:<3}: {len(requests)} actions in {elapsed:.2f}s "
+                f"({len(requests) / elapsed:,.0f}/s), first result after {first * 1000:.0f} ms, "
+                f"midPoint peak concurrency {server['max_in_flight']}, journal commits {journal['commits']}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
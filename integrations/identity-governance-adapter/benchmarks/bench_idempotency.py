@@ -0,0 +1,110 @@
+"""Idempotent execution: replays and concurrent duplicates against a midPoint stub.
+
+- replay: `--requests` executions, then the same requests again (as after a
+  worker restart) through `execute` and `execute_many`. Replays must return the
+  original execution_ids without calling midPoint; reports replay latency.
+- overlap: `--threads` workers submit the same `--overlap` requests in lockstep.
+  Each request must change midPoint exactly once (one POST), and every worker
+  must get the same result.
+
+Usage: python bench_idempotency.py [--requests 1000] [--overlap 200] [--threads 16] [--latency 0.02]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from bench_execute_many import _load_adapter
+from midpoint_stub import MidPointStub
+
+
+def _requests(count: int):
+    return [
+        {
+            "incident_id": f"inc-{i // 10}",
+            "action_id": ("revoke_sessions", "disable_identity")[i % 2],
+            "identity_ref": f"user-{i:05d}",
+            "parameters": {},
+        }
+        for i in range(count)
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--overlap", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+    mod = _load_adapter()
+    requests = _requests(args.requests)
+
+    with tempfile.TemporaryDirectory() as tmp, MidPointStub(latency=args.latency) as stub:
+        adapter = mod.IdentityGovernanceAdapter(
+            base_url=stub.base_url, username="u", password="p", storage_path=os.path.join(tmp, "replay.json")
+        )
+        started = time.perf_counter()
+        first = {r["index"]: r["result"] for r in adapter.execute_many(requests)}
+        elapsed = time.perf_counter() - started
+        calls = len(stub.stats()["calls"])
+        print(f"first run      : {len(requests)} executions in {elapsed:.2f}s, {calls} midPoint calls")
+
+        stub.reset()
+        started = time.perf_counter()
+        for index, request in enumerate(requests):
+            assert adapter.execute(**request)["execution_id"] == first[index]["execution_id"]
+        per_replay = (time.perf_counter() - started) / len(requests)
+        started = time.perf_counter()
+        for item in adapter.execute_many(requests):
+            assert item["result"]["execution_id"] == first[item["index"]]["execution_id"]
+        batch_replay = time.perf_counter() - started
+        calls = len(stub.stats()["calls"])
+        records = adapter.journal().stats()["records"]
+        assert calls == 0 and records == len(requests), (calls, records)
+        print(
+            f"replay         : execute {per_replay * 1e6:.0f} us/request, execute_many {batch_replay:.2f}s for "
+            f"{len(requests)}; {calls} midPoint calls, {records} journal records"
+        )
+
+    with tempfile.TemporaryDirectory() as tmp, MidPointStub(latency=args.latency) as stub:
+        adapter = mod.IdentityGovernanceAdapter(
+            base_url=stub.base_url,
+            username="u",
+            password="p",
+            storage_path=os.path.join(tmp, "overlap.json"),
+            max_concurrency=args.threads,
+        )
+        overlap = requests[: args.overlap]
+        seen = [dict() for _ in range(args.threads)]
+        barrier = threading.Barrier(args.threads)
+
+        def worker(n: int) -> None:
+            barrier.wait()
+            for index, request in enumerate(overlap):
+                seen[n][index] = adapter.execute(**request)["execution_id"]
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(args.threads)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        calls = sum(1 for call in stub.stats()["calls"] if call["method"] == "POST")
+        records = adapter.journal().stats()["records"]
+        assert all(s == seen[0] for s in seen)
+        assert calls == records == len(overlap), (calls, records)
+        print(
+            f"overlap        : {args.threads} workers x {len(overlap)} identical requests in {elapsed:.2f}s; "
+            f"{calls} midPoint writes, {records} journal records, identical results in every worker"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
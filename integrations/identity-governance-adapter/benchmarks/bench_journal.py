@@ -0,0 +1,177 @@
+"""Execution recording: rewrite-the-whole-file JSON vs the append-only journal.
+
+- legacy: the former `_record_execution_result` (load executions.json, append,
+  rewrite) for `--legacy` executions, showing the per-write cost growing with
+  the file;
+- journal: `--executions` records appended by `--threads` concurrent writers
+  (group commit, fsync on) and by `append_many` batches, plus several
+  processes appending at once (no record may be lost);
+- index: reopen/scan time and lookup latency by execution_id and incident_id;
+- migration of a legacy file of the same size.
+
+Usage: python bench_journal.py [--executions 100000] [--threads 32] [--legacy 1000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+
+def _load_journal():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "journal.py")
+    spec = importlib.util.spec_from_file_location("identity_governance_adapter_journal", path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError("failed to load journal")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["identity_governance_adapter_journal"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _entry(i: int) -> dict:
+    return {
+        "incident_id": f"inc-{i // 20:06d}",
+        "action_id": ("revoke_sessions", "disable_identity", "remove_role")[i % 3],
+        "identity_ref": f"user-{i:07d}",
+        "parameters": {},
+        "result": {"execution_id": str(uuid.uuid4()), "status": "success", "reversible": True, "revert_hint": {}},
+    }
+
+
+def _legacy_record(path: str, entry: dict) -> None:
+    # The former IdentityGovernanceAdapter._record_execution_result.
+    existing = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            existing = json.load(f)
+    existing.setdefault(entry["incident_id"], []).append(entry)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(existing, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _process_writer(path: str, worker: int, count: int) -> None:
+    mod = _load_journal()
+    with mod.ExecutionJournal(path) as journal:
+        for i in range(count):
+            journal.append(_entry(worker * count + i))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--executions", type=int, default=100_000)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--legacy", type=int, default=1000)
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+    mod = _load_journal()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy.json")
+        marks = {}
+        started = time.perf_counter()
+        for i in range(args.legacy):
+            t0 = time.perf_counter()
+            _legacy_record(legacy_path, _entry(i))
+            if i + 1 in (1, args.legacy // 2, args.legacy):
+                marks[i + 1] = time.perf_counter() - t0
+        legacy_total = time.perf_counter() - started
+        print(
+            f"legacy rewrite   : {args.legacy} executions in {legacy_total:.2f}s "
+            f"({args.legacy / legacy_total:,.0f}/s)"
+        )
+        print("                   per write: " + ", ".join(f"#{n} {s * 1000:.1f} ms" for n, s in marks.items()))
+
+        path = os.path.join(tmp, "threads.jsonl")
+        entries = [_entry(i) for i in range(args.executions)]
+        journal = mod.ExecutionJournal(path)
+        chunks = [entries[w :: args.threads] for w in range(args.threads)]
+        threads = [threading.Thread(target=lambda c=c: [journal.append(e) for e in c]) for c in chunks]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        stats = journal.stats()
+        journal.close()
+        assert stats["records"] == args.executions, stats
+        print(
+            f"journal append   : {args.executions} executions, {args.threads} threads in {elapsed:.2f}s "
+            f"({args.executions / elapsed:,.0f}/s, {stats['fsyncs']} fsyncs)"
+        )
+
+        batch_path = os.path.join(tmp, "batches.jsonl")
+        with mod.ExecutionJournal(batch_path) as batched:
+            started = time.perf_counter()
+            for start in range(0, args.executions, 1000):
+                batched.append_many(entries[start : start + 1000])
+            elapsed = time.perf_counter() - started
+            fsyncs = batched.stats()["fsyncs"]
+        print(
+            f"journal batches  : {args.executions} executions in {elapsed:.2f}s "
+            f"({args.executions / elapsed:,.0f}/s, {fsyncs} fsyncs)"
+        )
+
+        per_process = max(1, args.executions // (args.processes * 20))
+        shared_path = os.path.join(tmp, "processes.jsonl")
+        workers = [
+            multiprocessing.Process(target=_process_writer, args=(shared_path, w, per_process))
+            for w in range(args.processes)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        with mod.ExecutionJournal(shared_path) as check:
+            found = len(check)
+        expected = per_process * args.processes
+        print(f"multi-process    : {args.processes} processes x {per_process} appends -> {found}/{expected} records")
+        assert found == expected
+
+        started = time.perf_counter()
+        reopened = mod.ExecutionJournal(path)
+        count = len(reopened)
+        scan = time.perf_counter() - started
+        sample = random.Random(7).sample(entries, 1000)
+        started = time.perf_counter()
+        for entry in sample:
+            assert reopened.get(entry["result"]["execution_id"])["identity_ref"] == entry["identity_ref"]
+        by_id = (time.perf_counter() - started) / len(sample)
+        started = time.perf_counter()
+        for entry in sample:
+            assert len(reopened.by_incident(entry["incident_id"])) == 20
+        by_incident = (time.perf_counter() - started) / len(sample)
+        print(
+            f"index            : scan of {count} records {scan:.2f}s; get(execution_id) {by_id * 1e6:.0f} us; "
+            f"by_incident (20 records) {by_incident * 1e6:.0f} us"
+        )
+
+        big_legacy = os.path.join(tmp, "executions.json")
+        grouped: dict = {}
+        for entry in entries:
+            grouped.setdefault(entry["incident_id"], []).append(entry)
+        with open(big_legacy, "w", encoding="utf-8") as f:
+            json.dump(grouped, f, indent=2, sort_keys=True)
+        with mod.ExecutionJournal(os.path.join(tmp, "executions.jsonl")) as target:
+            started = time.perf_counter()
+            migrated = mod.migrate_legacy_json(big_legacy, target)
+            elapsed = time.perf_counter() - started
+            assert migrated == len(target) == args.executions
+        print(f"migration        : {migrated} legacy executions in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
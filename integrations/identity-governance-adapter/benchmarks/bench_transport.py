@@ -0,0 +1,130 @@
+"""midPoint transport under overload and outage: one attempt vs retries + circuit breaker.
+
+- overload: midPoint answers `429 Retry-After: 1` for the first `--throttled`
+  seconds of a batch of `--executions`. With one attempt (what the callers
+  used to configure) those executions fail; with backoff that honors
+  Retry-After they succeed.
+- outage: `--threads` workers execute `revoke_sessions` in a loop for
+  `--duration` seconds while midPoint answers 503 for the first `--outage`
+  seconds. Reports midPoint calls during the outage (load on a sick server),
+  failed executions and how soon after recovery executions succeed again.
+
+Usage: python bench_transport.py [--executions 200] [--throttled 1] [--outage 2] [--duration 4] [--threads 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from bench_execute_many import _load_adapter
+from midpoint_stub import MidPointStub
+
+POLICIES = {
+    # What the callers used to configure; the breaker effectively off.
+    "one attempt": {"max_attempts": 1, "breaker_threshold": 10**9},
+    "retry + breaker": {
+        "max_attempts": 4,
+        "backoff_base": 0.1,
+        "backoff_max": 2.0,
+        "deadline_seconds": 3.0,
+        "breaker_threshold": 5,
+        "breaker_reset_seconds": 0.5,
+    },
+}
+
+
+def _adapter(mod, stub, tmp, name, policy):
+    return mod.IdentityGovernanceAdapter(
+        base_url=stub.base_url,
+        username="u",
+        password="p",
+        storage_path=os.path.join(tmp, f"{name.replace(' ', '-')}.json"),
+        **policy,
+    )
+
+
+def _overload(mod, tmp, args) -> None:
+    requests = [
+        {"incident_id": "inc-1", "action_id": "revoke_sessions", "identity_ref": f"user-{i:05d}", "parameters": {}}
+        for i in range(args.executions)
+    ]
+    for name, policy in POLICIES.items():
+        with MidPointStub() as stub:
+            stub.outage(429, seconds=args.throttled, retry_after=1)
+            adapter = _adapter(mod, stub, tmp, f"overload-{name}", policy)
+            started = time.perf_counter()
+            results = list(adapter.execute_many(requests))
+            elapsed = time.perf_counter() - started
+            metrics = adapter.metrics()
+        failed = sum(1 for r in results if r["result"]["status"] != "success")
+        print(
+            f"overload {name:<16}: {len(requests)} executions, {failed} failed, {elapsed:.2f}s; "
+            f"retries {metrics['retries']} (Retry-After waits {metrics['retry_after_waits']})"
+        )
+
+
+def _outage(mod, tmp, args) -> None:
+    for name, policy in POLICIES.items():
+        with MidPointStub() as stub:
+            adapter = _adapter(mod, stub, tmp, f"outage-{name}", policy)
+            outage_started = time.time()
+            stub.outage(503, seconds=args.outage)
+            started = time.monotonic()
+            first_success: list = []
+            outcomes = {"success": 0, "failed": 0}
+            lock = threading.Lock()
+
+            def worker(n: int) -> None:
+                i = 0
+                while time.monotonic() - started < args.duration:
+                    i += 1
+                    result = adapter.execute(
+                        incident_id="inc-1",
+                        action_id="revoke_sessions",
+                        identity_ref=f"user-{n}-{i}",
+                        parameters={},
+                    )
+                    at = time.monotonic() - started
+                    with lock:
+                        outcomes[result["status"]] += 1
+                        if result["status"] == "success" and at >= args.outage:
+                            first_success.append(at)
+                    if result["status"] == "failed":
+                        time.sleep(0.01)  # the caller's own pacing between attempts
+
+            threads = [threading.Thread(target=worker, args=(n,)) for n in range(args.threads)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            during = sum(1 for c in stub.stats()["calls"] if c["at"] - outage_started < args.outage)
+            metrics = adapter.metrics()
+        print(
+            f"outage   {name:<16}: {during} midPoint calls during the {args.outage:.0f}s outage, "
+            f"{outcomes['failed']} failed / {outcomes['success']} succeeded executions, "
+            f"first success {(min(first_success) - args.outage) * 1000:.0f} ms after recovery; "
+            f"breaker {metrics['breaker']}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--executions", type=int, default=200)
+    parser.add_argument("--throttled", type=float, default=1.0)
+    parser.add_argument("--outage", type=float, default=2.0)
+    parser.add_argument("--duration", type=float, default=4.0)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+    mod = _load_adapter()
+    with tempfile.TemporaryDirectory() as tmp:
+        _overload(mod, tmp, args)
+        _outage(mod, tmp, args)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
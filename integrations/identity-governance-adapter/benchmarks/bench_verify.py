@@ -0,0 +1,142 @@
+"""Verifying a mass containment: per-execution polling vs `verify_executions`.
+
+Contains `--identities` users (revoke_sessions, disable_identity, remove_role
+per identity) with `execute_many` against a midPoint stub whose changes take
+0.5-1.5x `--propagation` seconds to become effective; every hundredth user's
+changes never do. Then verifies every execution:
+
+- per-execution: one `GET /ws/rest/users/<oid>` per pending execution every
+  `--naive-interval` seconds (`--concurrency` pollers), the usual check-loop.
+- verify_executions: batched user searches, rate-limited, adaptive interval.
+
+Reports midPoint calls, wall time, verified/failed counts and the
+time-to-effect histogram; both must agree on which executions verify.
+
+Usage: python bench_verify.py [--identities 300] [--propagation 2.0] [--timeout 8] [--latency 0.02]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_execute_many import _load_adapter
+from bench_revert import _requests
+from midpoint_stub import MidPointStub
+
+
+def _contain(adapter, requests):
+    ids = []
+    for item in adapter.execute_many(requests):
+        assert item["result"]["status"] == "success", item
+        ids.append(item["result"]["execution_id"])
+    return [adapter.get_execution(execution_id) for execution_id in ids]  # recorded once the batch is done
+
+
+def _poll_each(adapter, executions, *, interval: float, timeout: float, concurrency: int):
+    verify = sys.modules["identity_governance_adapter_verify"]
+
+    def poll(record) -> str:
+        if record["action_id"] not in verify.VERIFIABLE:
+            return "verified"
+        deadline = time.monotonic() + timeout
+        path = f"/ws/rest/users/{record['identity_ref']}"
+        while True:
+            user = adapter._request(path, method="GET").get("user")
+            if verify.effect_observed(record["action_id"], record.get("parameters") or {}, user):
+                return "verified"
+            if time.monotonic() + interval > deadline:
+                return "failed"
+            time.sleep(interval)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        statuses = list(pool.map(poll, executions))
+    return {record["result"]["execution_id"]: status for record, status in zip(executions, statuses)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--identities", type=int, default=300)
+    parser.add_argument("--propagation", type=float, default=2.0)
+    parser.add_argument("--timeout", type=float, default=8.0)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--naive-interval", type=float, default=0.25)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+    mod = _load_adapter()
+    requests = _requests(args.identities)
+    stuck = [f"user-{i:05d}" for i in range(0, args.identities, 100)]
+
+    outcomes = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("per-execution", "verify_executions"):
+            with MidPointStub(latency=args.latency, failing=stuck, propagation_seconds=args.propagation) as stub:
+                adapter = mod.IdentityGovernanceAdapter(
+                    base_url=stub.base_url,
+                    username="u",
+                    password="p",
+                    storage_path=os.path.join(tmp, f"{mode}.json"),
+                    max_concurrency=args.concurrency,
+                )
+                executions = _contain(adapter, requests)
+                calls_before = len(stub.stats()["calls"])
+                started = time.perf_counter()
+                if mode == "per-execution":
+                    statuses = _poll_each(
+                        adapter,
+                        executions,
+                        interval=args.naive_interval,
+                        timeout=args.timeout,
+                        concurrency=args.concurrency,
+                    )
+                else:
+                    statuses = {
+                        item["execution_id"]: item["verification"]["status"]
+                        for item in adapter.verify_executions(
+                            [record["result"]["execution_id"] for record in executions],
+                            batch_size=args.batch_size,
+                            interval=args.naive_interval,
+                            timeout=args.timeout,
+                        )
+                    }
+                elapsed = time.perf_counter() - started
+                calls = len(stub.stats()["calls"]) - calls_before
+                by_identity = {r["result"]["execution_id"]: (r["identity_ref"], r["action_id"]) for r in executions}
+                outcomes[mode] = {by_identity[execution_id]: status for execution_id, status in statuses.items()}
+                verified = sum(1 for status in statuses.values() if status == "verified")
+                print(
+                    f"{mode:<18}: {len(statuses)} executions in {elapsed:.2f}s, {calls} midPoint calls; "
+                    f"{verified} verified, {len(statuses) - verified} failed"
+                )
+                if mode == "verify_executions":
+                    for action_id, histogram in adapter.metrics()["time_to_effect"].items():
+                        counts, previous = [], 0
+                        for le, cumulative in histogram["buckets"].items():
+                            if cumulative > previous:
+                                counts.append(f"<={le}s: {cumulative - previous}")
+                            previous = cumulative
+                        buckets = ", ".join(counts)
+                        mean = histogram["sum"] / histogram["count"] if histogram["count"] else 0.0
+                        print(f"  time-to-effect {action_id:<16}: mean {mean:.2f}s; {buckets}")
+                    observed = next(
+                        execution_id
+                        for execution_id, status in statuses.items()
+                        if status == "verified" and by_identity[execution_id][1] != "revoke_sessions"
+                    )
+                    repeat = list(adapter.verify_executions([observed]))
+                    assert repeat[0]["verification"]["status"] == "verified"
+                    assert len(stub.stats()["calls"]) - calls_before == calls, "verified executions polled again"
+
+    assert outcomes["per-execution"] == outcomes["verify_executions"]
+    failed = {key for key, status in outcomes["verify_executions"].items() if status == "failed"}
+    assert failed == {(ref, action) for ref in stuck for action in ("disable_identity", "remove_role")}, failed
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,295 @@
+"""midPoint REST stub for the identity governance adapter benchmarks.
+
+Runs in a child process (so the stub's own request handling does not compete
+with the adapter for the GIL) and accepts the calls the adapter makes
+(`/ws/rest/rpc/invalidateSessions`, `POST /ws/rest/users/{oid}`). Every request
+sleeps `latency` seconds and is recorded with the number of requests in flight
+at the time; `stats()` fetches the records, `reset()` clears them.
+
+Bulk actions (`POST /ws/rest/rpc/executeScript`) apply the action to the OIDs
+of the pipeline's `inOid` search and report a result per object; OIDs in
+`failing` get a `fatal_error`. With `?asynchronous=true` the call returns
+`201 Location: /ws/rest/tasks/<oid>` and the task closes `task_seconds` later
+(`GET /ws/rest/tasks/<oid>`); `POST /ws/rest/tasks/<oid>/suspend` stops it
+early, reporting the objects it already processed (all of them: the stub
+applies a bulk action when it is submitted).
+
+Users start enabled with role `r1`; `POST /ws/rest/users/{oid}` operations
+(`disable`, `enable`, `remove_role`, `assign_role`) and bulk actions change
+them, `GET /ws/rest/users/{oid}` and `POST /ws/rest/users/search` return them
+and `users()` fetches the whole state. A change shows in
+`activation.effectiveStatus` and `roleMembershipRef` only after propagation:
+between 0.5x and 1.5x `propagation_seconds` later (fixed per OID), and never
+for OIDs in `failing` changed by direct operations.
+
+`outage(status, seconds=, count=, retry_after=)` makes midPoint calls fail
+with `status` (optionally sending `Retry-After`) for `seconds` or for the
+next `count` calls.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import threading
+import time
+import urllib.parse
+import urllib.request
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class _State:
+    def __init__(self, latency: float, failing: List[str], task_seconds: float, propagation_seconds: float) -> None:
+        self.latency = latency
+        self.failing = set(failing)
+        self.task_seconds = task_seconds
+        self.propagation_seconds = propagation_seconds
+        self.tasks: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self.suspended: set = set()
+        self.outage: Optional[Dict[str, Any]] = None
+        self.users: Dict[str, Dict[str, Any]] = {}
+        self.calls: List[Dict[str, Any]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def handle(
+        self, method: str, path: str, body: Optional[Dict[str, Any]]
+    ) -> Tuple[int, Optional[Dict[str, Any]], Dict[str, str]]:
+        split = urllib.parse.urlsplit(path)
+        route = split.path
+        if route == "/__stats":
+            with self.lock:
+                return 200, {"calls": list(self.calls), "max_in_flight": self.max_in_flight}, {}
+        if route == "/__users":
+            with self.lock:
+                return 200, {oid: self._user(oid) for oid in self.users}, {}
+        if route == "/__reset":
+            with self.lock:
+                self.calls.clear()
+                self.tasks.clear()
+                self.suspended.clear()
+                self.outage = None
+                self.users.clear()
+                self.max_in_flight = 0
+            return 200, {}, {}
+        if route == "/__outage":
+            with self.lock:
+                self.outage = dict(body or {}, until=time.time() + float((body or {}).get("seconds") or 0))
+            return 200, {}, {}
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            concurrent = self.in_flight
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            with self.lock:
+                self.calls.append(
+                    {"method": method, "path": route, "body": body, "in_flight": concurrent, "at": time.time()}
+                )
+                failure = self._outage_failure()
+            if failure is not None:
+                return failure
+            if route == "/ws/rest/rpc/invalidateSessions":
+                return 200, {}, {}
+            if route == "/ws/rest/users/search":
+                oids = (body or {}).get("query", {}).get("filter", {}).get("inOid", {}).get("value", [])
+                with self.lock:
+                    return 200, {"object": {"object": [self._user(oid) for oid in oids]}}, {}
+            if route.startswith("/ws/rest/users/"):
+                oid = urllib.parse.unquote(route.rsplit("/", 1)[-1])
+                with self.lock:
+                    if method == "POST":
+                        self._apply(oid, (body or {}).get("operation"), (body or {}).get("role_ref"))
+                        return 200, {}, {}
+                    return 200, {"user": self._user(oid)}, {}
+            if route == "/ws/rest/rpc/executeScript":
+                result = self._script_result(body or {})
+                if "asynchronous=true" not in split.query:
+                    return 200, {"executeScriptResponse": {"result": result}}, {}
+                oid = str(uuid.uuid4())
+                with self.lock:
+                    self.tasks[oid] = (time.time() + self.task_seconds, result)
+                return 201, None, {"Location": f"/ws/rest/tasks/{oid}"}
+            if route.startswith("/ws/rest/tasks/"):
+                parts = route[len("/ws/rest/tasks/") :].split("/")
+                with self.lock:
+                    task = self.tasks.get(parts[0])
+                    if task is not None and method == "POST" and parts[1:] == ["suspend"]:
+                        self.suspended.add(parts[0])
+                        return 204, None, {}
+                    suspended = parts[0] in self.suspended
+                if task is None:
+                    return 404, {"error": "not found"}, {}
+                closes_at, result = task
+                if suspended and time.time() < closes_at:
+                    return 200, {"task": {"executionState": "suspended", "result": result}}, {}
+                if time.time() < closes_at:
+                    return 200, {"task": {"executionState": "runnable", "result": {"status": "in_progress"}}}, {}
+                return 200, {"task": {"executionState": "closed", "result": result}}, {}
+            return 404, {"error": "not found"}, {}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def _outage_failure(self) -> Optional[Tuple[int, Optional[Dict[str, Any]], Dict[str, str]]]:
+        # Called with the lock held.
+        outage = self.outage
+        if outage is None:
+            return None
+        if outage.get("count") is not None:
+            if outage["count"] <= 0:
+                return None
+            outage["count"] -= 1
+        elif time.time() >= outage["until"]:
+            return None
+        headers = {"Retry-After": str(outage["retry_after"])} if outage.get("retry_after") is not None else {}
+        return int(outage["status"]), {"error": "unavailable"}, headers
+
+    def _user(self, oid: str) -> Dict[str, Any]:
+        # Called with the lock held.
+        user = self.users.setdefault(
+            oid, {"status": "enabled", "roles": ["r1"], "effective": ("enabled", ["r1"]), "due": 0.0}
+        )
+        status, roles = (user["status"], user["roles"]) if time.time() >= user["due"] else user["effective"]
+        return {
+            "oid": oid,
+            "activation": {"administrativeStatus": user["status"], "effectiveStatus": status},
+            "assignment": [{"targetRef": {"oid": role, "type": "RoleType"}} for role in user["roles"]],
+            "roleMembershipRef": [{"oid": role, "type": "RoleType"} for role in roles],
+        }
+
+    def _apply(self, oid: str, operation: Optional[str], role_ref: Optional[str]) -> None:
+        # Called with the lock held.
+        view = self._user(oid)
+        user = self.users[oid]
+        user["effective"] = (
+            view["activation"]["effectiveStatus"],
+            [ref["oid"] for ref in view["roleMembershipRef"]],
+        )
+        delay = self.propagation_seconds * (0.5 + zlib.crc32(oid.encode("utf-8")) % 1000 / 1000)
+        user["due"] = float("inf") if oid in self.failing else time.time() + delay
+        if operation in ("disable", "enable"):
+            user["status"] = f"{operation}d"
+        elif operation == "remove_role" and role_ref in user["roles"]:
+            user["roles"].remove(role_ref)
+        elif operation == "assign_role" and role_ref not in user["roles"]:
+            user["roles"].append(role_ref)
+
+    def _script_result(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        pipeline = body.get("executeScript", {}).get("pipeline", [])
+        oids = pipeline[0]["searchFilter"]["inOid"]["value"] if pipeline else []
+        action = pipeline[1] if len(pipeline) > 1 else {}
+        parameters = {p.get("name"): p.get("value") for p in action.get("parameter", [])}
+        operation = {"disable": "disable", "unassign": "remove_role"}.get(action.get("@element"))
+        with self.lock:
+            for oid in oids:
+                if oid not in self.failing:
+                    self._apply(oid, operation, parameters.get("role"))
+        subresults = [
+            {
+                "operation": "execute",
+                "status": "fatal_error" if oid in self.failing else "success",
+                "params": {"entry": [{"key": "oid", "paramValue": oid}]},
+            }
+            for oid in oids
+        ]
+        overall = "partial_error" if any(r["status"] != "success" for r in subresults) else "success"
+        return {"status": overall, "partialResults": subresults}
+
+
+def _serve(latency: float, failing: List[str], task_seconds: float, propagation_seconds: float, ready: Any) -> None:
+    state = _State(latency, failing, task_seconds, propagation_seconds)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:  # noqa: N802
+            length = int(self.headers.get("Content-Length") or "0")
+            body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+            self._send(*state.handle("POST", self.path, body))
+
+        def do_GET(self) -> None:  # noqa: N802
+            self._send(*state.handle("GET", self.path, None))
+
+        def _send(self, status: int, payload: Optional[Dict[str, Any]], headers: Dict[str, str]) -> None:
+            data = json.dumps(payload).encode("utf-8") if payload is not None else b""
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A003
+            return
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 256  # listen backlog; the default of 5 resets bursts of connections
+
+    server = Server(("127.0.0.1", 0), Handler)
+    ready.send(server.server_address[1])
+    server.serve_forever()
+
+
+class MidPointStub:
+    """`with MidPointStub(latency=0.02) as stub: stub.base_url ...`"""
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        failing: Optional[List[str]] = None,
+        task_seconds: float = 0.0,
+        propagation_seconds: float = 0.0,
+    ) -> None:
+        self.latency = latency
+        self.failing = list(failing or [])
+        self.task_seconds = task_seconds
+        self.propagation_seconds = propagation_seconds
+        self._port: Optional[int] = None
+        self._process: Optional[multiprocessing.Process] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._port}"
+
+    def __enter__(self) -> "MidPointStub":
+        parent, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve,
+            args=(self.latency, self.failing, self.task_seconds, self.propagation_seconds, child),
+            daemon=True,
+        )
+        self._process.start()
+        self._port = parent.recv()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+
+    def stats(self) -> Dict[str, Any]:
+        with urllib.request.urlopen(f"{self.base_url}/__stats") as resp:
+            return json.loads(resp.read())
+
+    def outage(
+        self, status: int, *, seconds: float = 0.0, count: Optional[int] = None, retry_after: Optional[int] = None
+    ) -> None:
+        body = json.dumps({"status": status, "seconds": seconds, "count": count, "retry_after": retry_after})
+        request = urllib.request.Request(f"{self.base_url}/__outage", data=body.encode("utf-8"), method="POST")
+        urllib.request.urlopen(request).close()
+
+    def users(self) -> Dict[str, Any]:
+        with urllib.request.urlopen(f"{self.base_url}/__users") as resp:
+            return json.loads(resp.read())
+
+    def reset(self) -> None:
+        urllib.request.urlopen(urllib.request.Request(f"{self.base_url}/__reset", data=b"{}", method="POST")).close()
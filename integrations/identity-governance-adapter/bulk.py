@@ -0,0 +1,173 @@
+"""midPoint bulk actions for batches of containment actions.
+
+Instead of one REST call per identity, a batch of identities that share an
+action is sent as one midPoint bulk action (`POST /ws/rest/rpc/executeScript`):
+a `search` of the users by OID piped into the action. Run asynchronously,
+midPoint answers with the task it started (`Location: .../tasks/<oid>`),
+which is polled until it closes.
+
+Per-object outcomes are read from the operation result: every subresult that
+names a processed object (by an `oid`/`object`/`objectOid` parameter, or an
+output item with `value.oid`) gives that object's status. If the result has
+no per-object entries at all, every object inherits the overall status.
+
+The bulk action per `action_id` is configuration-driven like the single-call
+paths: `BULK_ACTIONS` holds the defaults, and `parameters["midpoint_bulk_action"]`
+replaces the action element for a request. Actions with neither (by default
+`revoke_sessions`) are not sent as bulk actions.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+EXECUTE_SCRIPT_PATH = "/ws/rest/rpc/executeScript"
+TASK_PATH = "/ws/rest/tasks/{oid}"
+TASK_SUSPEND_PATH = "/ws/rest/tasks/{oid}/suspend"
+
+# action_id -> midPoint bulk action element; "{role_ref}" is filled from parameters.
+BULK_ACTIONS: Dict[str, Dict[str, Any]] = {
+    "disable_identity": {"@element": "disable"},
+    "remove_role": {
+        "@element": "unassign",
+        "parameter": [{"name": "role", "value": "{role_ref}"}],
+    },
+    # No built-in midPoint bulk action invalidates sessions, so `revoke_sessions`
+    # has no default: it runs per identity unless the request carries a
+    # `midpoint_bulk_action`, e.g. an `execute` action whose script calls the
+    # deployment's own session-invalidation function for `input`.
+}
+
+# Operation result statuses that count as the action having been applied; any
+# other status (handled_error, not_applicable, partial/fatal errors) fails it.
+SUCCESS_STATUSES = frozenset({"success", "warning"})
+
+_OBJECT_PARAMS = ("oid", "objectOid", "object")
+
+
+def bulk_key(action_id: str, parameters: Dict[str, Any]) -> Tuple[str, str]:
+    """Requests with equal keys can share one bulk action."""
+    return action_id, json.dumps(parameters, sort_keys=True, default=str)
+
+
+def bulk_action(action_id: str, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The bulk action element for a request, or None when it has to run per identity."""
+    return parameters.get("midpoint_bulk_action") or BULK_ACTIONS.get(action_id)
+
+
+def build_script(action_id: str, parameters: Dict[str, Any], identity_refs: List[str]) -> Dict[str, Any]:
+    """`executeScript` body applying `action_id` to the users `identity_refs`."""
+    action = bulk_action(action_id, parameters)
+    if action is None:
+        raise ValueError(f"no bulk action for action_id: {action_id}")
+    action = _fill(copy.deepcopy(action), parameters)
+    return {
+        "executeScript": {
+            "pipeline": [
+                {
+                    "@element": "search",
+                    "type": "UserType",
+                    "searchFilter": {"inOid": {"value": list(identity_refs)}},
+                },
+                action,
+            ],
+            "options": {"continueOnAnyError": True},
+        }
+    }
+
+
+def task_oid(headers: Dict[str, str], payload: Dict[str, Any]) -> Optional[str]:
+    """OID of the task an asynchronous `executeScript` started."""
+    location = headers.get("Location") or headers.get("location")
+    if location:
+        return location.rstrip("/").rsplit("/", 1)[-1]
+    task = payload.get("task") if isinstance(payload, dict) else None
+    if isinstance(task, dict) and task.get("oid"):
+        return str(task["oid"])
+    return None
+
+
+def task_state(payload: Dict[str, Any]) -> Tuple[bool, Optional[str], Dict[str, Any]]:
+    """`(closed, overall status, operation result)` of a `GET /tasks/<oid>` response."""
+    task = payload.get("task", payload) if isinstance(payload, dict) else {}
+    closed = str(task.get("executionState") or task.get("executionStatus") or "").lower() in ("closed", "suspended")
+    result = task.get("result") if isinstance(task.get("result"), dict) else {}
+    status = task.get("resultStatus") or result.get("status")
+    return closed, (str(status).lower() if status else None), result
+
+
+def script_status(payload: Dict[str, Any]) -> Optional[str]:
+    """Overall status of a synchronous `executeScript` response."""
+    response = payload.get("executeScriptResponse", payload) if isinstance(payload, dict) else {}
+    result = response.get("result")
+    status = result.get("status") if isinstance(result, dict) else None
+    return str(status).lower() if status else None
+
+
+def outcome_status(identity_ref: str, outcomes: Dict[str, str], overall: Optional[str]) -> str:
+    """Contract status (`success`/`failed`) of one object of a bulk action.
+
+    An object missing from non-empty per-object outcomes was not processed
+    (e.g. the search did not find it) and counts as failed; with no per-object
+    outcomes at all, every object inherits the overall status.
+    """
+    if outcomes:
+        status = outcomes.get(identity_ref)
+    else:
+        status = overall
+    return "success" if status in SUCCESS_STATUSES else "failed"
+
+
+def object_outcomes(payload: Dict[str, Any]) -> Dict[str, str]:
+    """Per-object status (`oid -> status`) found anywhere in a result or script output."""
+    outcomes: Dict[str, str] = {}
+    for node in _walk(payload):
+        status = node.get("status")
+        result = node.get("result")
+        value = node.get("value")
+        if isinstance(value, dict) and value.get("oid") and isinstance(result, dict) and result.get("status"):
+            outcomes[str(value["oid"])] = str(result["status"]).lower()
+        elif status and isinstance(node.get("params"), (dict, list)):
+            oid = _object_param(node["params"])
+            if oid:
+                outcomes[oid] = str(status).lower()
+    return outcomes
+
+
+def _fill(action: Any, parameters: Dict[str, Any]) -> Any:
+    if isinstance(action, dict):
+        return {key: _fill(value, parameters) for key, value in action.items()}
+    if isinstance(action, list):
+        return [_fill(value, parameters) for value in action]
+    if action == "{role_ref}":
+        return parameters.get("role_ref")
+    return action
+
+
+def _walk(node: Any) -> Iterator[Dict[str, Any]]:
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            yield current
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(current)
+
+
+def _object_param(params: Any) -> Optional[str]:
+    # midPoint serializes result params as {"entry": [{"key": ..., "paramValue": ...}]} or as a plain map.
+    if isinstance(params, dict) and "entry" in params:
+        params = params["entry"]
+    if isinstance(params, list):
+        for entry in params:
+            if isinstance(entry, dict) and entry.get("key") in _OBJECT_PARAMS:
+                value = entry.get("paramValue") or entry.get("value")
+                return str(value) if value else None
+        return None
+    for name in _OBJECT_PARAMS:
+        if params.get(name):
+            return str(params[name])
+    return None
@@ -8,14 +8,47 @@ Returns execution result metadata only.
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import importlib.util
 import json
 import os
+import queue
+import sys
+import threading
 import time
 import urllib.error
 import urllib.parse
 import urllib.request
 import uuid
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def _load_sibling(module_name: str):
+    """Load a module that lives next to this file (the adapter is not a package)."""
+    qualified = f"identity_governance_adapter_{module_name}"
+    module = sys.modules.get(qualified)
+    if module is not None:
+        return module
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"{module_name}.py")
+    spec = importlib.util.spec_from_file_location(qualified, path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"failed to load module: {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[qualified] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+_journal = _load_sibling("journal")
+_bulk = _load_sibling("bulk")
+_resilience = _load_sibling("resilience")
+_revert = _load_sibling("revert")
+_verify = _load_sibling("verify")
+ExecutionJournal = _journal.ExecutionJournal
+CircuitOpenError = _resilience.CircuitOpenError
 
 
 class IdentityGovernanceAdapter:
@@ -25,8 +58,43 @@ class IdentityGovernanceAdapter:
     - `identity_ref` is opaque to the rest of the system.
       The adapter treats it as an engine-resolvable reference (e.g., an object identifier).
     - This module intentionally does not persist anything except execution result metadata.
+    - Results are appended to an execution journal (journal.py) at
+      `<storage_path>l`, e.g. data/executions.jsonl. A legacy
+      `storage_path` JSON file is migrated into it on first use.
+    - At most `max_concurrency` requests are in flight to one midPoint
+      (`base_url`) per process, shared by all adapters; the first adapter
+      created for a midPoint sets the cap.
+    - Failed requests (connection errors, timeouts, 429/5xx) are retried up to
+      `max_attempts` times with jittered exponential backoff, waiting as long
+      as `Retry-After` asks when midPoint sends it, and never past
+      `deadline_seconds` from the start of the execution.
+    - A circuit breaker per midPoint (resilience.py) opens after
+      `breaker_threshold` consecutive failures: calls then fail at once
+      (`CircuitOpenError`) until a probe after `breaker_reset_seconds`
+      succeeds. Like the concurrency cap, it is shared per `base_url`;
+      `metrics()` reports its state and the retry counters.
+    - Executions are idempotent by content: a request equal to one that
+      already succeeded, or whose outcome is `unknown` (same
+      `idempotency_key`), returns the recorded result without calling
+      midPoint, and identical requests running at the same time in this
+      process wait for the first one and share its result.
+    - Before `disable_identity` and `remove_role` change a user, the user is
+      read and the state the action changes is kept in `revert_hint`
+      (revert.py); `revert_execution`/`revert_many` restore it.
+    - Executions carry `executed_at`; `verify_executions` polls midPoint until
+      their effect is observable (verify.py) and records the outcome in a
+      verification journal next to the execution journal.
     """
 
+    _migration_lock = threading.Lock()
+    _host_slots: Dict[str, threading.BoundedSemaphore] = {}
+    _host_breakers: Dict[str, "_resilience.CircuitBreaker"] = {}
+    _host_metrics: Dict[str, "_resilience.TransportMetrics"] = {}
+    _host_effect_latency: Dict[str, Dict[str, "_verify.LatencyHistogram"]] = {}
+    _host_slots_lock = threading.Lock()
+    _in_flight: Dict[str, "_Flight"] = {}
+    _in_flight_lock = threading.Lock()
+
     def __init__(
         self,
         *,
@@ -34,17 +102,44 @@ class IdentityGovernanceAdapter:
         username: str,
         password: str,
         timeout_seconds: int = 30,
-        max_attempts: int = 1,
+        max_attempts: int = 4,
         storage_path: Optional[str] = None,
+        max_concurrency: int = 8,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        deadline_seconds: Optional[float] = 120.0,
+        breaker_threshold: int = 5,
+        breaker_reset_seconds: float = 30.0,
     ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
         self.base_url = base_url.rstrip("/")
         self.username = username
         self.password = password
         self.timeout_seconds = timeout_seconds
         self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.deadline_seconds = deadline_seconds
         if storage_path is None:
             storage_path = os.path.join(os.path.dirname(__file__), "data", "executions.json")
         self.storage_path = storage_path
+        self.journal_path = f"{storage_path}l" if storage_path.endswith(".json") else storage_path
+        self.verification_path = f"{os.path.splitext(self.journal_path)[0]}.verifications.jsonl"
+        self._journal: Optional[ExecutionJournal] = None
+        self.max_concurrency = max_concurrency
+        with self._host_slots_lock:
+            self._slots = self._host_slots.setdefault(self.base_url, threading.BoundedSemaphore(max_concurrency))
+            self._breaker = self._host_breakers.setdefault(
+                self.base_url,
+                _resilience.CircuitBreaker(
+                    self.base_url, failure_threshold=breaker_threshold, reset_timeout=breaker_reset_seconds
+                ),
+            )
+            self._metrics = self._host_metrics.setdefault(self.base_url, _resilience.TransportMetrics())
+            self._effect_latency = self._host_effect_latency.setdefault(
+                self.base_url, {action_id: _verify.LatencyHistogram() for action_id in _verify.VERIFIABLE}
+            )
 
     def execute(
         self,
@@ -59,40 +154,474 @@ class IdentityGovernanceAdapter:
         Contract-oriented I/O:
         Input: incident_id, action_id, identity_ref (opaque), parameters (opaque map)
         Output: execution_id, status, reversible, revert_hint
+
+        Repeating a request that already succeeded returns the original result
+        (same execution_id) without calling midPoint.
         """
         if not isinstance(parameters, dict):
             raise ValueError("parameters must be a dict")
 
+        key = idempotency_key(incident_id, action_id, identity_ref, parameters)
+        result, flight = self._execute_once(
+            key,
+            functools.partial(self._run_action, action_id=action_id, identity_ref=identity_ref, parameters=parameters),
+        )
+        if flight is not None:
+            try:
+                self._record_execution_result(
+                    incident_id=incident_id,
+                    action_id=action_id,
+                    identity_ref=identity_ref,
+                    parameters=parameters,
+                    execution_result=result,
+                    idempotency_key=key,
+                    executed_at=_utc_now_iso(),
+                )
+            finally:
+                self._release([flight])
+        return result
+
+    def execute_many(self, requests: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Execute many approved actions concurrently; yields results as they complete.
+
+        Each request is a dict with the `execute` keyword arguments. Actions for
+        the same `identity_ref` run one after another, in request order; actions
+        for different identities run in parallel, at most `max_concurrency` at a
+        time against this midPoint.
+
+        Yields `{"index", "incident_id", "action_id", "identity_ref", "result"}`
+        per request (`index` is its position in `requests`). All results are
+        recorded with one journal write once the batch is done, or when the
+        caller stops iterating (actions not yet started are then skipped and
+        not recorded). Requests that already succeeded, or duplicates of one in
+        flight, get the original result, as with `execute`, and are not
+        recorded again.
+        """
+        requests = _validate_requests(requests)
+        chains: Dict[str, List[int]] = {}
+        for index, request in enumerate(requests):
+            chains.setdefault(request["identity_ref"], []).append(index)
+
+        def run(index: int) -> Dict[str, Any]:
+            request = requests[index]
+            parameters = request.get("parameters") or {}
+            key = idempotency_key(request["incident_id"], request["action_id"], request["identity_ref"], parameters)
+            result, flight = self._execute_once(
+                key,
+                functools.partial(
+                    self._run_action,
+                    action_id=request["action_id"],
+                    identity_ref=request["identity_ref"],
+                    parameters=parameters,
+                ),
+            )
+            return {
+                "index": index,
+                "incident_id": request["incident_id"],
+                "action_id": request["action_id"],
+                "identity_ref": request["identity_ref"],
+                "parameters": parameters,
+                "result": result,
+                "idempotency_key": key,
+                "executed_at": _utc_now_iso(),
+                "flight": flight,
+            }
+
+        records: List[Dict[str, Any]] = []
+        completed = self._run_chains(chains.values(), run, records, name="midpoint-execute")
+        try:
+            for record in completed:
+                yield _batch_item(record)
+        finally:
+            completed.close()
+            self._record_batch(records)
+
+    def execute_bulk(
+        self,
+        requests: Iterable[Dict[str, Any]],
+        *,
+        batch_size: int = 500,
+        asynchronous: bool = True,
+        poll_interval: float = 1.0,
+        timeout: float = 600.0,
+    ) -> Iterator[Dict[str, Any]]:
+        """Execute many approved actions as midPoint bulk actions (bulk.py).
+
+        Requests with the same `action_id` and `parameters` are sent together,
+        up to `batch_size` identities per `executeScript` call, instead of one
+        call per identity. With `asynchronous` (default) midPoint runs each
+        batch as a task, which is polled every `poll_interval` seconds until it
+        closes or `timeout` expires; the task's operation result gives each
+        identity's outcome.
+
+        The k-th request of every `identity_ref` goes into the k-th wave, and
+        waves run one after another, so per-identity request order holds.
+        Yields the same `{"index", "incident_id", "action_id", "identity_ref",
+        "result"}` items as `execute_many`, a batch at a time, and records
+        them with one journal write at the end. A batch midPoint certainly
+        did not run (script not built, call rejected with a 4xx or never
+        sent) fails as a whole; a batch whose submission failed otherwise, or
+        returned no task, is `unknown`. A task that does not close in time is
+        suspended: identities it processed keep their outcome, the others
+        fail, and all are `unknown` when the suspension cannot be confirmed.
+        Actions without a bulk action (`revoke_sessions` unless
+        `parameters["midpoint_bulk_action"]` is set) run one call per identity
+        within their wave, as in `execute_many`.
+        Requests that already succeeded are answered first, from the journal;
+        duplicates of requests in flight are answered last, once those finish.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        requests = _validate_requests(requests)
+        keys = [
+            idempotency_key(r["incident_id"], r["action_id"], r["identity_ref"], r.get("parameters") or {})
+            for r in requests
+        ]
+        waves: List[List[int]] = []
+        position: Dict[str, int] = {}
+        flights: Dict[int, _Flight] = {}
+        followers: List[Tuple[int, _Flight]] = []
+        records: List[Dict[str, Any]] = []
+
+        def make_record(index: int, result: Dict[str, Any]) -> Dict[str, Any]:
+            request = requests[index]
+            flights[index].settle(result)
+            return {
+                "index": index,
+                "incident_id": request["incident_id"],
+                "action_id": request["action_id"],
+                "identity_ref": request["identity_ref"],
+                "parameters": request.get("parameters") or {},
+                "result": result,
+                "idempotency_key": keys[index],
+                "executed_at": _utc_now_iso(),
+            }
+
+        def run_single(index: int) -> Dict[str, Any]:
+            request = requests[index]
+            return make_record(
+                index,
+                self._run_action(
+                    action_id=request["action_id"],
+                    identity_ref=request["identity_ref"],
+                    parameters=request.get("parameters") or {},
+                ),
+            )
+
+        try:
+            for index, request in enumerate(requests):
+                previous = self.journal().by_idempotency_key(keys[index])
+                if previous is not None:
+                    yield _batch_item({"index": index, **request, "result": previous["result"]})
+                    continue
+                flight, leader = self._claim(keys[index])
+                if not leader:
+                    followers.append((index, flight))
+                    continue
+                # Recorded between the lookup and the claim by a flight that has since been released.
+                previous = self.journal().by_idempotency_key(keys[index])
+                if previous is not None:
+                    flight.settle(previous["result"])
+                    self._release([flight])
+                    yield _batch_item({"index": index, **request, "result": previous["result"]})
+                    continue
+                flights[index] = flight
+                wave = position.get(request["identity_ref"], 0)
+                position[request["identity_ref"]] = wave + 1
+                if wave == len(waves):
+                    waves.append([])
+                waves[wave].append(index)
+
+            for wave in waves:
+                groups: Dict[Any, List[int]] = {}
+                single: List[List[int]] = []
+                for index in wave:
+                    request = requests[index]
+                    parameters = request.get("parameters") or {}
+                    if _bulk.bulk_action(request["action_id"], parameters) is None:
+                        single.append([index])
+                        continue
+                    groups.setdefault(_bulk.bulk_key(request["action_id"], parameters), []).append(index)
+                batches = [
+                    indices[start : start + batch_size]
+                    for indices in groups.values()
+                    for start in range(0, len(indices), batch_size)
+                ]
+                for indices, statuses, hints in self._run_bulk_wave(
+                    requests, batches, asynchronous=asynchronous, poll_interval=poll_interval, timeout=timeout
+                ):
+                    for index in indices:
+                        identity_ref = requests[index]["identity_ref"]
+                        status = statuses[identity_ref]
+                        hint = hints[identity_ref] if status == "success" else None
+                        record = make_record(
+                            index,
+                            {
+                                "execution_id": str(uuid.uuid4()),
+                                "status": status,
+                                "reversible": hint is not None,
+                                "revert_hint": hint or {},
+                            },
+                        )
+                        records.append(record)
+                        yield _batch_item(record)
+                # Actions without a bulk action (see bulk.py) run one call per identity.
+                completed = self._run_chains(single, run_single, records, name="midpoint-execute")
+                try:
+                    for record in completed:
+                        yield _batch_item(record)
+                finally:
+                    completed.close()
+
+            for index, flight in followers:
+                yield _batch_item({"index": index, **requests[index], "result": flight.wait()})
+        finally:
+            for flight in flights.values():
+                flight.abandon()
+            try:
+                self.journal().append_many([_journal_entry(r) for r in records])
+            finally:
+                self._release(flights.values())
+
+    def _run_bulk_wave(
+        self,
+        requests: List[Dict[str, Any]],
+        batches: List[List[int]],
+        *,
+        asynchronous: bool,
+        poll_interval: float,
+        timeout: float,
+    ) -> Iterator[Any]:
+        """Submit every batch of a wave, then yield `(indices, statuses, revert hints)` as batches finish.
+
+        Statuses and revert hints are keyed by identity_ref.
+        """
+        path = _bulk.EXECUTE_SCRIPT_PATH + ("?asynchronous=true" if asynchronous else "")
+        running: Dict[str, Tuple[List[int], Dict[str, Any]]] = {}
+        for indices in batches:
+            first = requests[indices[0]]
+            parameters = first.get("parameters") or {}
+            identity_refs = [requests[index]["identity_ref"] for index in indices]
+            hints = self._capture_bulk_revert_hints(first["action_id"], parameters, identity_refs)
+            try:
+                body = _bulk.build_script(first["action_id"], parameters, identity_refs)
+            except Exception:
+                yield indices, dict.fromkeys(identity_refs, "failed"), hints
+                continue
+            headers: Dict[str, str] = {}
+            try:
+                payload = self._request(path, method="POST", body=body, response_headers=headers)
+            except Exception as exc:
+                # Unless midPoint certainly turned the script away, it may have run it.
+                status = "failed" if _resilience.unprocessed(exc) else "unknown"
+                yield indices, dict.fromkeys(identity_refs, status), hints
+                continue
+            if not asynchronous:
+                outcomes, overall = _bulk.object_outcomes(payload), _bulk.script_status(payload)
+                yield indices, {ref: _bulk.outcome_status(ref, outcomes, overall) for ref in identity_refs}, hints
+                continue
+            task_oid = _bulk.task_oid(headers, payload)
+            if task_oid is None:
+                # Accepted, but with no task to follow: the outcome is for verification to settle.
+                yield indices, dict.fromkeys(identity_refs, "unknown"), hints
+                continue
+            running[task_oid] = (indices, hints)
+
+        deadline = time.monotonic() + timeout
+        while running:
+            for task_oid in list(running):
+                indices, hints = running[task_oid]
+                identity_refs = [requests[index]["identity_ref"] for index in indices]
+                try:
+                    task = self._request(
+                        _bulk.TASK_PATH.format(oid=urllib.parse.quote(task_oid, safe="")) + "?include=result",
+                        method="GET",
+                    )
+                except Exception:
+                    continue  # transient; retried next round until the deadline
+                closed, overall, result = _bulk.task_state(task)
+                if closed:
+                    del running[task_oid]
+                    outcomes = _bulk.object_outcomes(result)
+                    yield indices, {ref: _bulk.outcome_status(ref, outcomes, overall) for ref in identity_refs}, hints
+            if running and time.monotonic() + poll_interval > deadline:
+                for task_oid, (indices, hints) in running.items():
+                    identity_refs = [requests[index]["identity_ref"] for index in indices]
+                    yield indices, self._suspend_bulk_task(task_oid, identity_refs), hints
+                return
+            if running:
+                time.sleep(poll_interval)
+
+    def _suspend_bulk_task(self, task_oid: str, identity_refs: List[str]) -> Dict[str, str]:
+        """Suspend a bulk task that outlived its timeout; returns statuses keyed by identity_ref.
+
+        Once midPoint reports the task suspended, objects it processed keep
+        their outcome and the others fail. A task that cannot be confirmed
+        stopped may still apply the action, so its identities are `unknown`
+        rather than failed, for `verify_executions` to settle.
+        """
+        quoted = urllib.parse.quote(task_oid, safe="")
+        try:
+            self._request(_bulk.TASK_SUSPEND_PATH.format(oid=quoted), method="POST", idempotent=True)
+            task = self._request(_bulk.TASK_PATH.format(oid=quoted) + "?include=result", method="GET")
+        except Exception:
+            return dict.fromkeys(identity_refs, "unknown")
+        stopped, overall, result = _bulk.task_state(task)
+        if not stopped:
+            return dict.fromkeys(identity_refs, "unknown")
+        outcomes = _bulk.object_outcomes(result)
+        return {ref: _bulk.outcome_status(ref, outcomes, overall) for ref in identity_refs}
+
+    def _run_chains(
+        self,
+        chains: Iterable[List[int]],
+        run: Callable[[int], Dict[str, Any]],
+        records: List[Dict[str, Any]],
+        *,
+        name: str,
+    ) -> Iterator[Dict[str, Any]]:
+        """Run `run(index)` over each chain in order, chains in parallel; yield records as they complete.
+
+        At most `max_concurrency` chains run at once. Every record produced is
+        appended to `records`, including those still queued when the caller
+        stops iterating (collected when the generator is closed; chains not
+        yet started are skipped).
+        """
+        chains = [indices for indices in chains if indices]
+        if not chains:
+            return
+        done: "queue.Queue[Any]" = queue.Queue()
+        cancelled = threading.Event()
+
+        def run_chain(indices: List[int]) -> None:
+            for index in indices:
+                if cancelled.is_set():
+                    return
+                try:
+                    record = run(index)
+                except BaseException as exc:
+                    done.put(exc)  # wake the consumer instead of leaving it waiting
+                    raise
+                done.put(record)
+
+        total = sum(len(indices) for indices in chains)
+        produced = 0
+        pool = ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(chains)), thread_name_prefix=name)
+        try:
+            for indices in chains:
+                pool.submit(run_chain, indices)
+            while produced < total:
+                record = done.get()
+                if isinstance(record, BaseException):
+                    raise record
+                produced += 1
+                records.append(record)
+                yield record
+        finally:
+            cancelled.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+            while not done.empty():
+                record = done.get_nowait()
+                if not isinstance(record, BaseException):
+                    records.append(record)
+
+    def _record_batch(self, records: List[Dict[str, Any]]) -> None:
+        """Record the executions a batch ran (those holding a flight) with one journal write."""
+        flights = [r["flight"] for r in records if r.get("flight") is not None]
+        try:
+            self.journal().append_many([_journal_entry(r) for r in records if r.get("flight") is not None])
+        finally:
+            self._release(flights)
+
+    def _capture_bulk_revert_hints(
+        self, action_id: str, parameters: Dict[str, Any], identity_refs: List[str]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Pre-action state of a batch's users, read with one search call (see `_capture_revert_hint`)."""
+        users: Dict[str, Dict[str, Any]] = {}
+        if action_id in _revert.NEEDS_USER:
+            try:
+                payload = self._request(
+                    _revert.USER_SEARCH_PATH, method="POST", body=_revert.search_body(identity_refs), idempotent=True
+                )
+                users = _revert.users_by_oid(payload)
+            except Exception:
+                users = {}
+        return {ref: _revert.capture_hint(action_id, parameters, users.get(ref)) for ref in identity_refs}
+
+    def _execute_once(
+        self, key: str, run: Callable[[], Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], Optional["_Flight"]]:
+        """Result for the request with idempotency `key`, calling `run()` only if needed.
+
+        Returns the flight when this call ran it: the caller must record the
+        result and then `_release` it. Returns None when the result is an
+        earlier one (recorded, or shared with a concurrent duplicate).
+        """
+        previous = self.journal().by_idempotency_key(key)
+        if previous is not None:
+            return previous["result"], None
+        flight, leader = self._claim(key)
+        if not leader:
+            return flight.wait(), None
+        try:
+            # Recorded between the lookup and the claim by a flight that has since been released.
+            previous = self.journal().by_idempotency_key(key)
+            if previous is not None:
+                flight.settle(previous["result"])
+                self._release([flight])
+                return previous["result"], None
+            result = run()
+        except BaseException:
+            flight.abandon()
+            self._release([flight])
+            raise
+        flight.settle(result)
+        return result, flight
+
+    def _claim(self, key: str) -> Tuple["_Flight", bool]:
+        """The in-flight execution for `key` and whether this call just started (and leads) it."""
+        with self._in_flight_lock:
+            flight = self._in_flight.get(key)
+            if flight is not None:
+                return flight, False
+            flight = self._in_flight[key] = _Flight(key)
+            return flight, True
+
+    def _release(self, flights: Iterable["_Flight"]) -> None:
+        """Forget settled flights once their results are recorded (or abandoned)."""
+        with self._in_flight_lock:
+            for flight in flights:
+                if self._in_flight.get(flight.key) is flight:
+                    del self._in_flight[flight.key]
+
+    def _run_action(self, *, action_id: str, identity_ref: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Call midPoint for one action; returns the execution result (not recorded)."""
         execution_id = str(uuid.uuid4())
+        deadline = time.monotonic() + self.deadline_seconds if self.deadline_seconds is not None else None
 
         # Map action_id -> midPoint call.
         try:
             if action_id == "revoke_sessions":
-                self._call_midpoint_revoke_sessions(identity_ref=identity_ref, parameters=parameters)
-                result = {
-                    "execution_id": execution_id,
-                    "status": "success",
-                    "reversible": True,
-                    "revert_hint": {},
-                }
+                hint = _revert.capture_hint(action_id, parameters, None)
+                self._call_midpoint_revoke_sessions(
+                    identity_ref=identity_ref, parameters=parameters, deadline=deadline
+                )
             elif action_id == "disable_identity":
-                self._call_midpoint_disable_identity(identity_ref=identity_ref, parameters=parameters)
-                result = {
-                    "execution_id": execution_id,
-                    "status": "success",
-                    "reversible": True,
-                    "revert_hint": {},
-                }
+                hint = self._capture_revert_hint(action_id, identity_ref, parameters, deadline)
+                self._call_midpoint_disable_identity(
+                    identity_ref=identity_ref, parameters=parameters, deadline=deadline
+                )
             elif action_id == "remove_role":
-                self._call_midpoint_remove_role(identity_ref=identity_ref, parameters=parameters)
-                result = {
-                    "execution_id": execution_id,
-                    "status": "success",
-                    "reversible": True,
-                    "revert_hint": {},
-                }
+                hint = self._capture_revert_hint(action_id, identity_ref, parameters, deadline)
+                self._call_midpoint_remove_role(identity_ref=identity_ref, parameters=parameters, deadline=deadline)
             else:
                 raise ValueError(f"unsupported action_id: {action_id}")
+            result = {
+                "execution_id": execution_id,
+                "status": "success",
+                "reversible": hint is not None,
+                "revert_hint": hint or {},
+            }
         except Exception:
             result = {
                 "execution_id": execution_id,
@@ -100,49 +629,341 @@ class IdentityGovernanceAdapter:
                 "reversible": False,
                 "revert_hint": {},
             }
-
-        self._record_execution_result(
-            incident_id=incident_id,
-            action_id=action_id,
-            identity_ref=identity_ref,
-            parameters=parameters,
-            execution_result=result,
-        )
         return result
 
+    def _capture_revert_hint(
+        self, action_id: str, identity_ref: str, parameters: Dict[str, Any], deadline: Optional[float]
+    ) -> Optional[Dict[str, Any]]:
+        """Pre-action state for the revert; None (not reversible) when the user cannot be read."""
+        path = _revert.USER_PATH.format(oid=urllib.parse.quote(identity_ref, safe=""))
+        try:
+            user = _revert.user_of(self._request(path, method="GET", deadline=deadline))
+        except Exception:
+            user = None  # contain anyway; only the revert is lost
+        return _revert.capture_hint(action_id, parameters, user)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Transport metrics for this midPoint, shared by every adapter for `base_url` in the process.
+
+        `breaker` holds the circuit state (closed/open/half_open), consecutive
+        failures and how often it opened, rejected calls or probed; the other
+        keys count requests, attempts, retries, Retry-After waits, failed
+        requests and requests cut short by the execution deadline.
+        `time_to_effect` holds a latency histogram (seconds) per verifiable
+        action, filled by `verify_executions`.
+        """
+        return {
+            "base_url": self.base_url,
+            "breaker": self._breaker.stats(),
+            **self._metrics.snapshot(),
+            "time_to_effect": {action_id: h.snapshot() for action_id, h in sorted(self._effect_latency.items())},
+        }
+
+    def get_execution(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """Recorded execution (incident_id, action_id, identity_ref, parameters, result) or None."""
+        return self.journal().get(execution_id)
+
+    def list_executions(self, incident_id: str) -> List[Dict[str, Any]]:
+        """Recorded executions of an incident, oldest first."""
+        return self.journal().by_incident(incident_id)
+
+    def journal(self) -> ExecutionJournal:
+        """The shared execution journal, after migrating a legacy executions.json."""
+        if self._journal is None:
+            journal = ExecutionJournal.shared(self.journal_path)
+            if self.journal_path != self.storage_path and os.path.exists(self.storage_path):
+                with self._migration_lock:
+                    _journal.migrate_legacy_json(self.storage_path, journal)
+            self._journal = journal
+        return self._journal
+
     def revert_execution(self, execution_id: str) -> Dict[str, Any]:
-        """Rollback placeholder.
+        """Undo a recorded execution with the pre-action state in its `revert_hint` (revert.py).
+
+        The execution is looked up by execution_id in the journal index. The
+        revert is recorded as an execution of its own (action_id
+        `revert_execution`) and returns its result, with
+        `reverted_execution_id`. Reverting again after a successful revert
+        returns that result without calling midPoint; after a successful
+        revert, executing the original request again runs it again.
 
-        Not implemented in this phase; rollback is execution-engine dependent.
+        Raises ValueError for unknown executions and executions that are not
+        reversible (failed, pre-action state not captured, or `revoke_sessions`
+        without a `midpoint_revert_path` hook).
         """
-        raise NotImplementedError("revert_execution is execution-engine dependent and not implemented")
+        record, key = self._revert_plan(execution_id)
+        result, flight = self._execute_once(key, functools.partial(self._run_revert, record))
+        if flight is not None:
+            try:
+                self.journal().append(_journal_entry(_revert_record(record, result, key)))
+            finally:
+                self._release([flight])
+        return result
+
+    def revert_many(self, execution_ids: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Revert many executions in parallel; yields `{"index", "execution_id", "result"}` as each completes.
+
+        Reverts of the same identity run one after another, newest execution
+        first (in reverse of `execution_ids` order, which should be oldest
+        first, as `list_executions` returns them); different identities run in
+        parallel, at most `max_concurrency` at a time. All ids are checked
+        before anything is reverted (ValueError as in `revert_execution`), and
+        the reverts are recorded with one journal write.
+        """
+        plans = [self._revert_plan(execution_id) for execution_id in execution_ids]
+        chains: Dict[str, List[int]] = {}
+        for index in reversed(range(len(plans))):
+            chains.setdefault(plans[index][0]["identity_ref"], []).append(index)
+
+        def run(index: int) -> Dict[str, Any]:
+            record, key = plans[index]
+            result, flight = self._execute_once(key, functools.partial(self._run_revert, record))
+            return {"index": index, **_revert_record(record, result, key), "flight": flight}
+
+        records: List[Dict[str, Any]] = []
+        completed = self._run_chains(chains.values(), run, records, name="midpoint-revert")
+        try:
+            for record in completed:
+                yield {
+                    "index": record["index"],
+                    "execution_id": record["result"]["reverted_execution_id"],
+                    "result": record["result"],
+                }
+        finally:
+            completed.close()
+            self._record_batch(records)
+
+    def _revert_plan(self, execution_id: str) -> Tuple[Dict[str, Any], str]:
+        """The execution record to revert and the revert's idempotency key."""
+        record = self.journal().get(execution_id)
+        if record is None:
+            raise ValueError(f"unknown execution_id: {execution_id}")
+        result = record.get("result") or {}
+        if (
+            record.get("action_id") not in _revert.REVERTIBLE
+            or result.get("status") != "success"
+            or not result.get("reversible")
+            or not _revert.can_revert(record["action_id"], result.get("revert_hint") or {})
+        ):
+            raise ValueError(f"execution {execution_id} is not reversible")
+        key = idempotency_key(
+            record["incident_id"], "revert_execution", record["identity_ref"], {"execution_id": execution_id}
+        )
+        return record, key
+
+    def _run_revert(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Call midPoint to restore the pre-action state; returns the revert result (not recorded)."""
+        deadline = time.monotonic() + self.deadline_seconds if self.deadline_seconds is not None else None
+        try:
+            call = _revert.revert_call(
+                record["action_id"],
+                record["identity_ref"],
+                record.get("parameters") or {},
+                record["result"].get("revert_hint") or {},
+            )
+            if call is not None:
+                path, body = call
+                self._request(path, method="POST", body=body, deadline=deadline)
+            status = "success"
+        except Exception:
+            status = "failed"
+        return {
+            "execution_id": str(uuid.uuid4()),
+            "status": status,
+            "reversible": False,
+            "revert_hint": {},
+            "reverted_execution_id": record["result"]["execution_id"],
+        }
+
+    def verify_executions(
+        self,
+        execution_ids: Iterable[str],
+        *,
+        batch_size: int = 200,
+        max_requests_per_second: float = 5.0,
+        interval: float = 1.0,
+        max_interval: float = 30.0,
+        timeout: float = 600.0,
+    ) -> Iterator[Dict[str, Any]]:
+        """Poll midPoint until the executions' effects are observable (verify.py).
+
+        Yields `{"index", "execution_id", "verification"}` as executions settle;
+        `verification` is `{"execution_id", "status": "verified" | "failed",
+        "reason", "checked_at", "polls", "time_to_effect_seconds"}`.
+
+        Each round reads the pending executions' users with one
+        `POST /ws/rest/users/search` per `batch_size` identities, at most
+        `max_requests_per_second` searches per second. Rounds start
+        `interval` seconds apart; the gap doubles (up to `max_interval`) after
+        rounds that verify nothing and halves again after rounds that do.
+        Executions still unverified after `timeout` seconds fail with reason
+        `timeout`; failed executions fail at once (`execution_failed`).
+        Executions with status `unknown` (bulk submissions or tasks whose
+        outcome midPoint did not report) are polled like successful ones.
+        `revoke_sessions` has no observable state and is verified by its
+        execution's success, without a time-to-effect.
+
+        Outcomes are recorded in the verification journal (one write per
+        round); an execution already verified is answered from it without
+        polling. Time-to-effect (from `executed_at` to the poll that observed
+        the effect) feeds the `time_to_effect` histograms of `metrics()`.
+        Raises ValueError for unknown executions and actions that are not
+        containment actions, before polling anything.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        execution_ids = list(execution_ids)
+        records = [self._verification_plan(execution_id) for execution_id in execution_ids]
+        journal = self.verification_journal()
+        limiter = _verify.RateLimiter(max_requests_per_second)
+        pacing = _verify.AdaptiveInterval(interval, max_interval)
+        deadline = time.monotonic() + timeout
+        pending: Dict[int, Dict[str, Any]] = {}
+        settled: List[Dict[str, Any]] = []
+        for index, record in enumerate(records):
+            previous = journal.get(execution_ids[index])
+            if previous is not None and previous["result"]["status"] == "verified":
+                yield {"index": index, "execution_id": execution_ids[index], "verification": previous["result"]}
+            elif record["result"].get("status") == "success" and record["action_id"] not in _verify.VERIFIABLE:
+                settled.append(self._verification_record(index, record, "verified", "no_observable_state", 0))
+            elif record["result"].get("status") in ("success", "unknown") and record["action_id"] in _verify.VERIFIABLE:
+                pending[index] = record
+            else:
+                settled.append(self._verification_record(index, record, "failed", "execution_failed", 0))
+
+        polls = 0
+        while True:
+            if settled:
+                journal.append_many([_journal_entry(r) for r in settled])
+                for record in settled:
+                    yield {
+                        "index": record["index"],
+                        "execution_id": record["result"]["execution_id"],
+                        "verification": record["result"],
+                    }
+                settled = []
+            if not pending:
+                return
+            polls += 1
+            by_identity: Dict[str, List[int]] = {}
+            for index, record in pending.items():
+                by_identity.setdefault(record["identity_ref"], []).append(index)
+            identity_refs = list(by_identity)
+            for start in range(0, len(identity_refs), batch_size):
+                batch = identity_refs[start : start + batch_size]
+                limiter.acquire()
+                try:
+                    search = _revert.search_body(batch)
+                    users = _revert.users_by_oid(
+                        self._request(_revert.USER_SEARCH_PATH, method="POST", body=search, idempotent=True)
+                    )
+                except Exception:
+                    continue  # transient; these identities are read again next round
+                for identity_ref in batch:
+                    for index in by_identity[identity_ref]:
+                        record = pending[index]
+                        parameters = record.get("parameters") or {}
+                        if _verify.effect_observed(record["action_id"], parameters, users.get(identity_ref)):
+                            del pending[index]
+                            settled.append(self._verification_record(index, record, "verified", "observed", polls))
+            if pending and time.monotonic() >= deadline:
+                for index, record in pending.items():
+                    settled.append(self._verification_record(index, record, "failed", "timeout", polls))
+                pending = {}
+            elif pending:
+                time.sleep(min(pacing.next(bool(settled)), max(0.0, deadline - time.monotonic())))
+
+    def get_verification(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """Latest recorded verification of `execution_id` (the `verification` of `verify_executions`), or None."""
+        record = self.verification_journal().get(execution_id)
+        return record["result"] if record is not None else None
+
+    def verification_journal(self) -> ExecutionJournal:
+        """The shared verification journal (`<journal>.verifications.jsonl`), indexed by execution_id."""
+        return ExecutionJournal.shared(self.verification_path)
+
+    def _verification_plan(self, execution_id: str) -> Dict[str, Any]:
+        record = self.journal().get(execution_id)
+        if record is None:
+            raise ValueError(f"unknown execution_id: {execution_id}")
+        if record.get("action_id") not in _verify.ACTIONS:
+            raise ValueError(f"execution {execution_id} is not a containment action")
+        return record
+
+    def _verification_record(
+        self, index: int, record: Dict[str, Any], status: str, reason: str, polls: int
+    ) -> Dict[str, Any]:
+        """Verification journal entry for an execution; observes time-to-effect when it was measured."""
+        checked_at = time.time()
+        executed_at = _epoch_seconds(record.get("executed_at"))
+        time_to_effect = None
+        if reason == "observed" and executed_at is not None:
+            time_to_effect = max(0.0, checked_at - executed_at)
+            self._effect_latency[record["action_id"]].observe(time_to_effect)
+        return {
+            "index": index,
+            "incident_id": record["incident_id"],
+            "action_id": record["action_id"],
+            "identity_ref": record["identity_ref"],
+            "result": {
+                "execution_id": record["result"]["execution_id"],
+                "status": status,
+                "reason": reason,
+                "checked_at": datetime.fromtimestamp(checked_at, timezone.utc).isoformat(),
+                "polls": polls,
+                "time_to_effect_seconds": time_to_effect,
+            },
+        }
 
     # --- midPoint calls (minimal) ---
 
-    def _call_midpoint_revoke_sessions(self, *, identity_ref: str, parameters: Dict[str, Any]) -> None:
+    def _call_midpoint_revoke_sessions(
+        self, *, identity_ref: str, parameters: Dict[str, Any], deadline: Optional[float] = None
+    ) -> None:
         # Implementation intentionally minimal and configuration-driven.
         # Calls a generic endpoint that can be adapted to the deployed engine configuration.
         path = parameters.get("midpoint_path") or "/ws/rest/rpc/invalidateSessions"
         body = {"identity_ref": identity_ref}
-        self._request(path, method="POST", body=body)
+        self._request(path, method="POST", body=body, deadline=deadline)
 
-    def _call_midpoint_disable_identity(self, *, identity_ref: str, parameters: Dict[str, Any]) -> None:
+    def _call_midpoint_disable_identity(
+        self, *, identity_ref: str, parameters: Dict[str, Any], deadline: Optional[float] = None
+    ) -> None:
         # Treat identity_ref as engine-side identifier.
         oid = urllib.parse.quote(identity_ref, safe="")
         path = parameters.get("midpoint_path") or f"/ws/rest/users/{oid}"
         body = parameters.get("midpoint_body") or {"operation": "disable"}
-        self._request(path, method="POST", body=body)
+        self._request(path, method="POST", body=body, deadline=deadline)
 
-    def _call_midpoint_remove_role(self, *, identity_ref: str, parameters: Dict[str, Any]) -> None:
+    def _call_midpoint_remove_role(
+        self, *, identity_ref: str, parameters: Dict[str, Any], deadline: Optional[float] = None
+    ) -> None:
         oid = urllib.parse.quote(identity_ref, safe="")
         role_ref = parameters.get("role_ref")
         path = parameters.get("midpoint_path") or f"/ws/rest/users/{oid}"
         body = parameters.get("midpoint_body") or {"operation": "remove_role", "role_ref": role_ref}
-        self._request(path, method="POST", body=body)
+        self._request(path, method="POST", body=body, deadline=deadline)
 
     # --- http + persistence ---
 
-    def _request(self, path: str, *, method: str, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def _request(
+        self,
+        path: str,
+        *,
+        method: str,
+        body: Optional[Dict[str, Any]] = None,
+        response_headers: Optional[Dict[str, str]] = None,
+        deadline: Optional[float] = None,
+        idempotent: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """One midPoint call with retries; `deadline` is a `time.monotonic()` value.
+
+        Idempotent calls (by default GETs only) are retried after timeouts,
+        connection errors and retryable statuses. Other calls are repeated only
+        when midPoint cannot have processed them: the connection was never
+        made, or a 429/503 came with Retry-After. A Retry-After longer than
+        `backoff_max` is not waited for; the call fails at once.
+        """
         url = f"{self.base_url}{path}"
         headers = {"Content-Type": "application/json"}
         # Basic auth (midPoint commonly supports it); secrets come from config.
@@ -152,18 +973,71 @@ class IdentityGovernanceAdapter:
         data_bytes = json.dumps(body).encode("utf-8") if body is not None else None
         req = urllib.request.Request(url, data=data_bytes, headers=headers, method=method)
 
-        last_exc: Optional[Exception] = None
-        for attempt in range(1, max(1, self.max_attempts) + 1):
+        if idempotent is None:
+            idempotent = method == "GET"
+        attempts = max(1, self.max_attempts)
+        self._metrics.incr("requests")
+        for attempt in range(1, attempts + 1):
+            timeout = self.timeout_seconds
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.monotonic())
+                if timeout <= 0:
+                    self._metrics.incr("deadline_exceeded")
+                    self._metrics.incr("failures")
+                    raise TimeoutError(f"execution deadline exceeded before {method} {path}")
             try:
-                with urllib.request.urlopen(req, timeout=self.timeout_seconds) as resp:
+                self._breaker.before_call()
+            except _resilience.CircuitOpenError:
+                self._metrics.incr("failures")
+                raise
+            self._metrics.incr("attempts")
+            retry_after: Optional[float] = None
+            try:
+                with self._slots, urllib.request.urlopen(req, timeout=timeout) as resp:
+                    if response_headers is not None:
+                        response_headers.update(resp.headers.items())
                     resp_body = resp.read().decode("utf-8")
-                    return json.loads(resp_body) if resp_body else {}
-            except (urllib.error.HTTPError, urllib.error.URLError, TimeoutError) as exc:
-                last_exc = exc
-                if attempt >= max(1, self.max_attempts):
+            except urllib.error.HTTPError as exc:
+                if exc.code not in _resilience.RETRYABLE_STATUSES:
+                    self._breaker.record_success()  # midPoint is up; the request itself was rejected
+                    self._metrics.incr("failures")
                     raise
-                time.sleep(0.5)
-        raise RuntimeError("request failed") from last_exc
+                if exc.code == 429:
+                    self._breaker.record_success()  # throttled, not down: back off instead of opening
+                else:
+                    self._breaker.record_failure()
+                retry_after = _resilience.retry_after_seconds(exc.headers.get("Retry-After"))
+                failure: BaseException = exc
+                retryable = idempotent or (exc.code in _resilience.RETRY_AFTER_STATUSES and retry_after is not None)
+            except OSError as exc:  # URLError, timeouts, connection resets
+                self._breaker.record_failure()
+                failure = exc
+                retryable = idempotent or _resilience.not_sent(exc)
+            except BaseException:
+                self._breaker.record_failure()
+                raise
+            else:
+                self._breaker.record_success()
+                return json.loads(resp_body) if resp_body else {}
+
+            delay = (
+                retry_after
+                if retry_after is not None
+                else _resilience.backoff_delay(attempt, base=self.backoff_base, cap=self.backoff_max)
+            )
+            if not retryable or (retry_after is not None and retry_after > self.backoff_max):
+                self._metrics.incr("failures")
+                raise failure
+            if attempt >= attempts or (deadline is not None and time.monotonic() + delay >= deadline):
+                if attempt < attempts:
+                    self._metrics.incr("deadline_exceeded")
+                self._metrics.incr("failures")
+                raise failure
+            self._metrics.incr("retries")
+            if retry_after is not None:
+                self._metrics.incr("retry_after_waits")
+            time.sleep(delay)
+        raise RuntimeError("request failed")  # not reached: the last attempt returns or raises
 
     def _record_execution_result(
         self,
@@ -173,29 +1047,104 @@ class IdentityGovernanceAdapter:
         identity_ref: str,
         parameters: Dict[str, Any],
         execution_result: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+        executed_at: Optional[str] = None,
     ) -> None:
-        os.makedirs(os.path.dirname(self.storage_path), exist_ok=True)
-        existing = {}
-        if os.path.exists(self.storage_path):
-            with open(self.storage_path, "r", encoding="utf-8") as f:
-                existing = json.load(f)
-                if not isinstance(existing, dict):
-                    existing = {}
-
-        existing.setdefault(incident_id, []).append(
-            {
-                "incident_id": incident_id,
-                "action_id": action_id,
-                "identity_ref": identity_ref,
-                "parameters": parameters,
-                "result": execution_result,
-            }
-        )
+        entry = {
+            "incident_id": incident_id,
+            "action_id": action_id,
+            "identity_ref": identity_ref,
+            "parameters": parameters,
+            "result": execution_result,
+        }
+        if idempotency_key is not None:
+            entry["idempotency_key"] = idempotency_key
+        if executed_at is not None:
+            entry["executed_at"] = executed_at
+        self.journal().append(entry)
+
+
+class _Flight:
+    """An execution in progress; identical concurrent requests wait for its result."""
+
+    __slots__ = ("key", "_done", "_result", "_error")
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self._done = threading.Event()
+        self._result: Optional[Dict[str, Any]] = None
+        self._error: Optional[BaseException] = None
+
+    def settle(self, result: Dict[str, Any]) -> None:
+        self._result = result
+        self._done.set()
+
+    def abandon(self) -> None:
+        """Wake waiters of a flight that will not produce a result (no-op once settled)."""
+        if not self._done.is_set():
+            self._error = RuntimeError(f"execution {self.key} was abandoned before it completed")
+            self._done.set()
+
+    def wait(self) -> Dict[str, Any]:
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        assert self._result is not None
+        return self._result
+
+
+def idempotency_key(incident_id: str, action_id: str, identity_ref: str, parameters: Dict[str, Any]) -> str:
+    """Content hash of an execution request; equal requests get equal keys."""
+    canonical = json.dumps(
+        [incident_id, action_id, identity_ref, parameters], sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _revert_record(record: Dict[str, Any], result: Dict[str, Any], key: str) -> Dict[str, Any]:
+    entry = {
+        "incident_id": record["incident_id"],
+        "action_id": "revert_execution",
+        "identity_ref": record["identity_ref"],
+        "parameters": {"execution_id": result["reverted_execution_id"]},
+        "result": result,
+        "idempotency_key": key,
+        "executed_at": _utc_now_iso(),
+    }
+    if record.get("idempotency_key"):
+        # A successful revert frees the original request to be executed again (journal.py).
+        entry["reverted_idempotency_key"] = record["idempotency_key"]
+    return entry
+
+
+def _batch_item(record: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: record[key] for key in ("index", "incident_id", "action_id", "identity_ref", "result")}
+
+
+def _journal_entry(record: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in record.items() if k not in ("index", "flight")}
+
+
+def _validate_requests(requests: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    requests = list(requests)
+    for request in requests:
+        for key in ("incident_id", "action_id", "identity_ref"):
+            if not isinstance(request.get(key), str) or not request[key]:
+                raise ValueError(f"{key} must be a non-empty string")
+        if not isinstance(request.get("parameters", {}), dict):
+            raise ValueError("parameters must be a dict")
+    return requests
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
 
-        tmp_path = f"{self.storage_path}.tmp"
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(existing, f, indent=2, sort_keys=True)
-        os.replace(tmp_path, self.storage_path)
+def _epoch_seconds(timestamp: Any) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(timestamp).timestamp()
+    except (TypeError, ValueError):
+        return None
 
 
 def _b64(data: bytes) -> str:
@@ -0,0 +1,339 @@
+"""Append-only execution journal for the identity governance adapter.
+
+Execution results are appended to a JSON-lines file (one record per line)
+instead of rewriting a single JSON document per execution:
+
+- Writes are appends of whole lines through an `O_APPEND` descriptor, under an
+  advisory file lock where the platform has one (`fcntl`), so concurrent
+  executors in several processes never lose each other's records.
+- Appends are group-committed: records that arrive while a write is in
+  progress are written and fsync'ed together by the next writer, so N
+  concurrent appends cost far fewer than N fsyncs. `append_many` writes a whole
+  batch with one write and one fsync.
+- An in-memory index maps execution_id, incident_id and idempotency_key to
+  record offsets. It is built by one scan on first use and then extended
+  incrementally, including records appended by other processes. Successful
+  records, and `unknown` ones (the action may have been applied), are indexed
+  by idempotency_key. A successful record carrying `reverted_idempotency_key`
+  (a revert) drops that key, so the reverted request is no longer answered
+  from the journal.
+
+A torn last line (crash mid-write) is skipped when indexing; the next append
+starts on a fresh line.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from array import array
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: appends are still single writes
+    fcntl = None
+
+
+class ExecutionJournal:
+    """JSON-lines execution log with execution_id / incident_id lookup.
+
+    - `path`: the journal file (created on first append).
+    - `fsync`: make every commit durable before `append` returns (default).
+
+    Use `ExecutionJournal.shared(path)` to let every adapter in the process
+    share one journal, so their appends are group-committed together.
+    """
+
+    _registry: Dict[str, "ExecutionJournal"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, path: str, *, fsync: bool = True) -> None:
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._commit = threading.Condition(threading.Lock())
+        self._pending: List[bytes] = []
+        self._enqueued = 0
+        self._committed = 0
+        self._committing = False
+        self._failures: Dict[int, BaseException] = {}
+        self._fd: Optional[int] = None
+        # Index: record number -> (offset, length); ids -> record numbers.
+        self._offsets = array("q")
+        self._lengths = array("l")
+        self._by_execution: Dict[str, int] = {}
+        self._by_incident: Dict[str, List[int]] = {}
+        self._by_key: Dict[str, int] = {}
+        self._scanned = 0
+        self._skipped = 0
+        self._stats = {"appends": 0, "commits": 0, "fsyncs": 0}
+
+    @classmethod
+    def shared(cls, path: str) -> "ExecutionJournal":
+        """The process-wide journal for `path` (created on first use)."""
+        key = os.path.abspath(path)
+        with cls._registry_lock:
+            journal = cls._registry.get(key)
+            if journal is None:
+                journal = cls._registry[key] = cls(path)
+            return journal
+
+    def close(self) -> None:
+        with self._commit:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def __enter__(self) -> "ExecutionJournal":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # --- writes ---
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Append one record; returns once it is written (and fsync'ed)."""
+        self._commit_lines([_encode(entry)])
+
+    def append_many(self, entries: List[Dict[str, Any]]) -> None:
+        """Append several records with a single write and fsync."""
+        if entries:
+            self._commit_lines([_encode(entry) for entry in entries])
+
+    def _commit_lines(self, lines: List[bytes]) -> None:
+        with self._commit:
+            self._pending.extend(lines)
+            self._enqueued += 1
+            ticket = self._enqueued
+            # Group commit: whoever finds no commit in progress writes everything queued so far.
+            while self._committed < ticket:
+                if not self._committing:
+                    self._write_pending()
+                else:
+                    self._commit.wait()
+            failure = self._failures.pop(ticket, None)
+        if failure is not None:
+            raise failure
+
+    def _write_pending(self) -> None:
+        # Called with `_commit` held; releases it during I/O so more appends can queue.
+        batch, self._pending = self._pending, []
+        first, last = self._committed + 1, self._enqueued
+        self._committing = True
+        self._commit.release()
+        failure: Optional[BaseException] = None
+        try:
+            self._write(b"".join(batch))
+        except BaseException as exc:
+            failure = exc
+        finally:
+            self._commit.acquire()
+            self._committing = False
+            self._committed = last
+            if failure is not None:
+                for ticket in range(first, last + 1):
+                    self._failures[ticket] = failure
+            self._stats["appends"] += len(batch)
+            self._stats["commits"] += 1
+            self._commit.notify_all()
+
+    def _write(self, data: bytes) -> None:
+        if self._fd is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        fd = self._fd
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            size = os.fstat(fd).st_size
+            if size and os.pread(fd, 1, size - 1) != b"\n":
+                data = b"\n" + data  # a writer crashed mid-line; do not glue onto its torn record
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+            if self.fsync:
+                os.fsync(fd)
+                self._stats["fsyncs"] += 1
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    # --- reads ---
+
+    def get(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """The record of `execution_id`, or None."""
+        with self._lock:
+            self._refresh()
+            record = self._by_execution.get(execution_id)
+            return self._read_records([record])[0] if record is not None else None
+
+    def by_idempotency_key(self, key: str) -> Optional[Dict[str, Any]]:
+        """The latest successful (or `unknown`) record with `idempotency_key == key`, or None."""
+        with self._lock:
+            self._refresh()
+            record = self._by_key.get(key)
+            return self._read_records([record])[0] if record is not None else None
+
+    def by_incident(self, incident_id: str) -> List[Dict[str, Any]]:
+        """Records of `incident_id`, in append order."""
+        with self._lock:
+            self._refresh()
+            return self._read_records(self._by_incident.get(incident_id, []))
+
+    def incident_ids(self) -> List[str]:
+        with self._lock:
+            self._refresh()
+            return list(self._by_incident)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._offsets)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """All records in append order, streamed from disk."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            for line in f:
+                entry = _decode(line)
+                if entry is not None:
+                    yield entry
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refresh()
+            indexed = {"records": len(self._offsets), "skipped_lines": self._skipped, "bytes": self._scanned}
+        with self._commit:
+            return {**self._stats, **indexed}
+
+    def _refresh(self) -> None:
+        """Index complete lines appended since the last scan (by any process)."""
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return
+        if size <= self._scanned:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._scanned)
+            chunk = f.read(size - self._scanned)
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return  # only a partial line so far
+        offset = self._scanned
+        for line in chunk[: end + 1].splitlines(keepends=True):
+            entry = _decode(line)
+            if entry is None:
+                self._skipped += 1 if line.strip() else 0
+            else:
+                self._index(entry, offset, len(line))
+            offset += len(line)
+        self._scanned = offset
+
+    def _index(self, entry: Dict[str, Any], offset: int, length: int) -> None:
+        record = len(self._offsets)
+        self._offsets.append(offset)
+        self._lengths.append(length)
+        result = entry.get("result")
+        execution_id = result.get("execution_id") if isinstance(result, dict) else None
+        if isinstance(execution_id, str):
+            self._by_execution[execution_id] = record
+        if isinstance(result, dict) and result.get("status") in ("success", "unknown"):
+            key = entry.get("idempotency_key")
+            if isinstance(key, str):
+                self._by_key[key] = record
+        if isinstance(result, dict) and result.get("status") == "success":
+            reverted = entry.get("reverted_idempotency_key")
+            if isinstance(reverted, str):
+                self._by_key.pop(reverted, None)
+        incident_id = entry.get("incident_id")
+        if isinstance(incident_id, str):
+            self._by_incident.setdefault(incident_id, []).append(record)
+
+    def _read_records(self, records: List[int]) -> List[Dict[str, Any]]:
+        if not records:
+            return []
+        entries = []
+        with open(self.path, "rb") as f:
+            fd = f.fileno()
+            for record in records:
+                entries.append(json.loads(os.pread(fd, self._lengths[record], self._offsets[record])))
+        return entries
+
+
+def migrate_legacy_json(legacy_path: str, journal: ExecutionJournal) -> int:
+    """Copy `{incident_id: [entry, ...]}` from the old executions.json into `journal`.
+
+    One-shot: the legacy file is renamed to `<legacy_path>.migrated` afterwards,
+    so running it again (or from another process) is a no-op. Returns the
+    number of records copied.
+    """
+    if not os.path.exists(legacy_path):
+        return 0
+    with open(f"{legacy_path}.lock", "a") as lock:
+        # Serializes migrations across processes; the loser finds the file gone.
+        if fcntl is not None:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        if not os.path.exists(legacy_path):
+            return 0
+        return _migrate(legacy_path, journal)
+
+
+def _migrate(legacy_path: str, journal: ExecutionJournal) -> int:
+    with open(legacy_path, "r", encoding="utf-8") as f:
+        legacy = json.load(f)
+    if not isinstance(legacy, dict):
+        raise ValueError(f"{legacy_path}: expected an object keyed by incident_id")
+    entries = [
+        entry
+        for incident_entries in legacy.values()
+        if isinstance(incident_entries, list)
+        for entry in incident_entries
+        if isinstance(entry, dict)
+    ]
+    known = {
+        entry["result"].get("execution_id") for entry in journal if isinstance(entry.get("result"), dict)
+    }
+    # Skip records a previous, interrupted migration already copied.
+    entries = [e for e in entries if (e.get("result") or {}).get("execution_id") not in known]
+    journal.append_many(entries)
+    os.replace(legacy_path, f"{legacy_path}.migrated")
+    return len(entries)
+
+
+def _encode(entry: Dict[str, Any]) -> bytes:
+    return (json.dumps(entry, sort_keys=True, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _decode(line: bytes) -> Optional[Dict[str, Any]]:
+    if not line.endswith(b"\n"):
+        return None
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Migrate executions.json into the append-only journal")
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+    parser.add_argument("--legacy", default=os.path.join(data_dir, "executions.json"))
+    parser.add_argument("--journal", default=os.path.join(data_dir, "executions.jsonl"))
+    args = parser.parse_args()
+    with ExecutionJournal(args.journal) as journal:
+        copied = migrate_legacy_json(args.legacy, journal)
+        print(json.dumps({"migrated": copied, "journal": args.journal, "records": len(journal)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Retry and circuit-breaker policy for the midPoint transport.
+
+- `backoff_delay`: full-jitter exponential backoff (`uniform(0, min(cap, base * 2**n))`),
+  so clients retrying after the same outage do not return in lockstep.
+- `retry_after_seconds`: the delay a 429/503 response asks for, in either
+  `Retry-After` form (seconds or an HTTP date).
+- `not_sent`: whether a failed call never reached midPoint, which is the only
+  transport failure after which a non-idempotent call is safe to repeat.
+- `unprocessed`: whether a failed call certainly left midPoint unchanged (not
+  sent, refused by the breaker, rejected with a 4xx, or turned away with
+  Retry-After); after any other failure the call may have taken effect.
+- `CircuitBreaker`: one per midPoint host. After `failure_threshold`
+  consecutive failures it opens and rejects calls at once (`CircuitOpenError`)
+  for `reset_timeout` seconds; then it lets a single probe through
+  (half-open). The probe's success closes it, a failure opens it again.
+- `TransportMetrics`: per-host request, retry and failure counters.
+"""
+
+from __future__ import annotations
+
+import email.utils
+import random
+import socket
+import threading
+import time
+import urllib.error
+from typing import Any, Callable, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# HTTP statuses worth retrying; other 4xx are the caller's error. All but 429 count against the breaker.
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Statuses that, sent with Retry-After, mean the request was turned away unprocessed.
+RETRY_AFTER_STATUSES = frozenset({429, 503})
+
+
+class CircuitOpenError(RuntimeError):
+    """The host's circuit breaker is open; the call was not attempted."""
+
+    def __init__(self, host: str, retry_in: float) -> None:
+        super().__init__(f"circuit open for {host}; next probe in {retry_in:.1f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with half-open probing (thread-safe)."""
+
+    def __init__(
+        self,
+        host: str,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be >= 1")
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._counters = {"opened": 0, "rejected": 0, "probes": 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def before_call(self) -> None:
+        """Admit a call or raise `CircuitOpenError`; pair with `record_success`/`record_failure`."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                self._counters["probes"] += 1
+                return
+            self._counters["rejected"] += 1
+            retry_in = max(0.0, self._opened_at + self.reset_timeout - self._clock())
+            raise CircuitOpenError(self.host, retry_in)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._counters["opened"] += 1
+            self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self._current_state(), "consecutive_failures": self._failures, **self._counters}
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return self._state
+
+
+class TransportMetrics:
+    """Thread-safe counters for one midPoint host."""
+
+    FIELDS = ("requests", "attempts", "retries", "retry_after_waits", "failures", "deadline_exceeded")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(self.FIELDS, 0)
+
+    def incr(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+
+def backoff_delay(attempt: int, *, base: float, cap: float, rng: Callable[[], float] = random.random) -> float:
+    """Full-jitter delay before retry number `attempt` (1-based)."""
+    return rng() * min(cap, base * (2 ** (attempt - 1)))
+
+
+def retry_after_seconds(value: Optional[str], *, now: Optional[float] = None) -> Optional[float]:
+    """Seconds to wait from a `Retry-After` header value, or None when absent or malformed."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - (time.time() if now is None else now))
+
+
+def not_sent(exc: BaseException) -> bool:
+    """True when a call failed before its request reached midPoint (refused or unresolvable host)."""
+    reason = exc.reason if isinstance(exc, urllib.error.URLError) else exc
+    return isinstance(reason, (ConnectionRefusedError, socket.gaierror))
+
+
+def unprocessed(exc: BaseException) -> bool:
+    """True when a failed call certainly did not change anything in midPoint."""
+    if isinstance(exc, CircuitOpenError):
+        return True
+    if isinstance(exc, urllib.error.HTTPError):
+        if exc.code not in RETRYABLE_STATUSES:
+            return 400 <= exc.code < 500
+        return exc.code in RETRY_AFTER_STATUSES and retry_after_seconds(exc.headers.get("Retry-After")) is not None
+    return not_sent(exc)
@@ -0,0 +1,123 @@
+"""Pre-action state capture and reverts for containment actions.
+
+Before an action changes a user, the adapter reads the user and keeps what
+the action is about to change in the execution's `revert_hint`:
+
+- `disable_identity`: `{"administrative_status": <status before>}`. The revert
+  enables the user again, unless it was already disabled before.
+- `remove_role`: `{"role_ref": ..., "had_role": <bool>}`. The revert assigns the
+  role again, only if the user had it.
+- `revoke_sessions`: revoked sessions cannot be restored; signing in again
+  creates new ones. The execution is reversible only when a deployment hook
+  was configured (`parameters["midpoint_revert_path"]`, kept in the hint as
+  `revert_path`), which the revert calls.
+
+`revert_call` turns a hint into the midPoint call that restores the state (or
+None when there is nothing to restore). It uses the same request shapes as
+the execution calls, so deployments that override `midpoint_path` for an
+action can override `midpoint_revert_path`/`midpoint_revert_body` alike.
+"""
+
+from __future__ import annotations
+
+import urllib.parse
+from typing import Any, Dict, List, Optional, Tuple
+
+USER_PATH = "/ws/rest/users/{oid}"
+USER_SEARCH_PATH = "/ws/rest/users/search"
+
+# Actions whose revert needs the user's state from before the action.
+NEEDS_USER = frozenset({"disable_identity", "remove_role"})
+REVERTIBLE = frozenset({"disable_identity", "remove_role", "revoke_sessions"})
+
+
+def capture_hint(
+    action_id: str, parameters: Dict[str, Any], user: Optional[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """`revert_hint` for `action_id` given the user as read before it; None if it cannot be captured."""
+    if action_id == "revoke_sessions":
+        path = parameters.get("midpoint_revert_path")
+        return {"revert_path": path} if path else None  # nothing would restore the sessions
+    if user is None:
+        return None
+    if action_id == "disable_identity":
+        return {"administrative_status": administrative_status(user)}
+    if action_id == "remove_role":
+        role_ref = parameters.get("role_ref")
+        return {"role_ref": role_ref, "had_role": has_role(user, role_ref)}
+    return None
+
+
+def can_revert(action_id: str, hint: Dict[str, Any]) -> bool:
+    """Whether a successful `action_id` with `hint` has a revert (older records may lack one)."""
+    if action_id == "revoke_sessions":
+        return bool(hint.get("revert_path"))
+    return action_id in REVERTIBLE
+
+
+def revert_call(
+    action_id: str, identity_ref: str, parameters: Dict[str, Any], hint: Dict[str, Any]
+) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """`(path, body)` of the midPoint call that undoes the action, or None when nothing changed."""
+    oid = urllib.parse.quote(identity_ref, safe="")
+    path = parameters.get("midpoint_revert_path") or USER_PATH.format(oid=oid)
+    body = parameters.get("midpoint_revert_body")
+    if action_id == "disable_identity":
+        if hint.get("administrative_status") == "disabled":
+            return None
+        return path, body or {"operation": "enable"}
+    if action_id == "remove_role":
+        if not hint.get("had_role"):
+            return None
+        return path, body or {"operation": "assign_role", "role_ref": hint.get("role_ref")}
+    if action_id == "revoke_sessions":
+        if not hint.get("revert_path"):
+            return None
+        return hint["revert_path"], body or {"identity_ref": identity_ref}
+    raise ValueError(f"unsupported action_id: {action_id}")
+
+
+def search_body(oids: List[str]) -> Dict[str, Any]:
+    """`POST /ws/rest/users/search` body selecting the users `oids`."""
+    return {"query": {"filter": {"inOid": {"value": list(oids)}}}}
+
+
+def users_by_oid(payload: Any) -> Dict[str, Dict[str, Any]]:
+    """Users of a search response (`{"object": {"object": [...]}}` or a plain list), by OID."""
+    if isinstance(payload, dict):
+        payload = payload.get("object", payload)
+        if isinstance(payload, dict):
+            payload = payload.get("object", [])
+    users = payload if isinstance(payload, list) else [payload]
+    found = {}
+    for user in users:
+        if isinstance(user, dict):
+            user = user.get("user", user)
+            if user.get("oid"):
+                found[str(user["oid"])] = user
+    return found
+
+
+def user_of(payload: Any) -> Optional[Dict[str, Any]]:
+    """The user of a `GET /ws/rest/users/<oid>` response."""
+    if not isinstance(payload, dict):
+        return None
+    user = payload.get("user", payload)
+    return user if isinstance(user, dict) else None
+
+
+def administrative_status(user: Dict[str, Any]) -> str:
+    activation = user.get("activation")
+    status = activation.get("administrativeStatus") if isinstance(activation, dict) else None
+    return str(status).lower() if status else "enabled"  # midPoint's default when unset
+
+
+def has_role(user: Dict[str, Any], role_ref: Optional[str]) -> bool:
+    assignments = user.get("assignment") or []
+    if isinstance(assignments, dict):
+        assignments = [assignments]
+    for assignment in assignments:
+        target = assignment.get("targetRef") if isinstance(assignment, dict) else None
+        if isinstance(target, dict) and target.get("oid") == role_ref:
+            return True
+    return False
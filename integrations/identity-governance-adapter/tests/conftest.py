@@ -0,0 +1,57 @@
+"""Fixtures: the adapter loaded from `client.py`, run against the benchmarks' midPoint stub."""
+
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from bench_execute_many import _load_adapter  # noqa: E402
+from midpoint_stub import MidPointStub  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def mod():
+    return _load_adapter()
+
+
+@pytest.fixture
+def stub():
+    with MidPointStub() as stub:
+        yield stub
+
+
+@pytest.fixture
+def make_adapter(mod, stub, tmp_path):
+    """`make_adapter(**overrides)`: an adapter on `stub` with its own journal under `tmp_path`."""
+
+    def make(**overrides):
+        options = {
+            "base_url": stub.base_url,
+            "username": "u",
+            "password": "p",
+            "storage_path": str(tmp_path / "executions.json"),
+            "backoff_base": 0.01,
+            "backoff_max": 0.05,
+        }
+        options.update(overrides)
+        return mod.IdentityGovernanceAdapter(**options)
+
+    return make
+
+
+@pytest.fixture
+def adapter(make_adapter):
+    return make_adapter()
+
+
+def calls(stub, path=None):
+    """midPoint calls the stub received (to `path` only, if given)."""
+    return [call for call in stub.stats()["calls"] if path is None or call["path"] == path]
+
+
+def request(identity_ref, action_id="disable_identity", incident_id="inc-1", **parameters):
+    return {"incident_id": incident_id, "action_id": action_id, "identity_ref": identity_ref, "parameters": parameters}
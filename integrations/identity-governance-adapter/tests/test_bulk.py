@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import pytest
+
+from conftest import calls, request
+from midpoint_stub import MidPointStub
+
+EXECUTE_SCRIPT = "/ws/rest/rpc/executeScript"
+# A deployment's session invalidation as a bulk action: no pre-action read, so
+# the stub's outages hit the executeScript call itself.
+REVOKE = {"midpoint_bulk_action": {"@element": "execute", "parameter": [{"name": "script", "value": "revoke"}]}}
+
+
+def _results(items):
+    return {item["identity_ref"]: item["result"] for item in items}
+
+
+@pytest.mark.parametrize("asynchronous", [False, True])
+def test_bulk_outcomes_per_identity(make_adapter, asynchronous):
+    with MidPointStub(failing=["user-2"], task_seconds=0.05) as stub:
+        adapter = make_adapter(base_url=stub.base_url)
+        identities = [f"user-{i}" for i in range(5)]
+        results = _results(
+            adapter.execute_bulk(
+                [request(identity) for identity in identities], asynchronous=asynchronous, poll_interval=0.01
+            )
+        )
+
+        assert {ref: r["status"] for ref, r in results.items()} == {
+            ref: "failed" if ref == "user-2" else "success" for ref in identities
+        }
+        assert results["user-0"]["revert_hint"] == {"administrative_status": "enabled"}
+        assert len(calls(stub, EXECUTE_SCRIPT)) == 1
+        assert stub.users()["user-0"]["activation"]["administrativeStatus"] == "disabled"
+        assert len(adapter.list_executions("inc-1")) == len(identities)
+
+
+def test_bulk_keeps_per_identity_order(adapter, stub):
+    requests = [request("user-1"), request("user-1", "remove_role", role_ref="r1"), request("user-2")]
+    results = {item["index"]: item["result"] for item in adapter.execute_bulk(requests, asynchronous=False)}
+
+    assert all(result["status"] == "success" for result in results.values())
+    scripts = [call["body"]["executeScript"]["pipeline"][1]["@element"] for call in calls(stub, EXECUTE_SCRIPT)]
+    assert scripts == ["disable", "unassign"]
+
+
+def test_ambiguous_submission_is_unknown_and_not_resubmitted(adapter, stub):
+    stub.outage(500, count=1)
+    first = _results(adapter.execute_bulk([request("user-1", "revoke_sessions", **REVOKE)], asynchronous=False))
+    assert first["user-1"]["status"] == "unknown"
+    stub.reset()
+
+    again = _results(adapter.execute_bulk([request("user-1", "revoke_sessions", **REVOKE)], asynchronous=False))
+    assert again == first
+    assert calls(stub, EXECUTE_SCRIPT) == []
+
+
+@pytest.mark.parametrize("status, retry_after", [(400, None), (503, 60)])
+def test_rejected_submission_fails_and_runs_again(adapter, stub, status, retry_after):
+    stub.outage(status, count=1, retry_after=retry_after)
+    first = _results(adapter.execute_bulk([request("user-1", "revoke_sessions", **REVOKE)], asynchronous=False))
+    assert first["user-1"]["status"] == "failed"
+
+    again = _results(adapter.execute_bulk([request("user-1", "revoke_sessions", **REVOKE)], asynchronous=False))
+    assert again["user-1"]["status"] == "success"
+    assert len(calls(stub, EXECUTE_SCRIPT)) == 2
+
+
+def test_task_past_timeout_is_suspended(make_adapter):
+    with MidPointStub(task_seconds=5) as stub:
+        adapter = make_adapter(base_url=stub.base_url)
+        results = _results(adapter.execute_bulk([request("user-1")], poll_interval=0.01, timeout=0.1))
+
+        assert results["user-1"]["status"] == "success"  # the stub processed it before the suspension
+        assert [call["method"] for call in calls(stub) if call["path"].endswith("/suspend")] == ["POST"]
+
+
+def test_bulk_replays_recorded_requests(adapter, stub):
+    first = _results(adapter.execute_bulk([request("user-1"), request("user-2")], asynchronous=False))
+    stub.reset()
+
+    again = _results(adapter.execute_bulk([request("user-1"), request("user-2")], asynchronous=False))
+    assert again == first
+    assert calls(stub) == []
+
+
+def test_bulk_rechecks_the_journal_after_claiming(make_adapter, stub):
+    adapter, other = make_adapter(), make_adapter()
+    claim = adapter._claim
+    recorded = {}
+
+    def racing_claim(key):
+        # Another worker finishes the same request between the journal lookup and the claim.
+        del adapter._claim
+        recorded.update(other.execute(**request("user-1")))
+        return claim(key)
+
+    adapter._claim = racing_claim
+    results = _results(adapter.execute_bulk([request("user-1")], asynchronous=False))
+
+    assert results["user-1"] == recorded
+    assert calls(stub, EXECUTE_SCRIPT) == []
+    assert len(adapter.list_executions("inc-1")) == 1
+
+
+def test_unprocessed_tells_rejections_from_ambiguous_failures(mod):
+    import email.message
+    import socket
+    import urllib.error
+
+    def http_error(code, retry_after=None):
+        headers = email.message.Message()
+        if retry_after is not None:
+            headers["Retry-After"] = retry_after
+        return urllib.error.HTTPError("http://midpoint", code, "error", headers, None)
+
+    unprocessed = mod._resilience.unprocessed
+    assert unprocessed(http_error(400))
+    assert unprocessed(http_error(503, "5"))
+    assert unprocessed(urllib.error.URLError(ConnectionRefusedError()))
+    assert not unprocessed(http_error(500))
+    assert not unprocessed(http_error(503))
+    assert not unprocessed(socket.timeout())
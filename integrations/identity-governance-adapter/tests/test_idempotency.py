@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import threading
+
+from conftest import calls, request
+from midpoint_stub import MidPointStub
+
+
+def test_replay_returns_original_result_without_calling_midpoint(adapter, stub):
+    first = adapter.execute(**request("user-1"))
+    assert first["status"] == "success"
+    stub.reset()
+
+    assert adapter.execute(**request("user-1")) == first
+    assert [item["result"] for item in adapter.execute_many([request("user-1")])] == [first]
+    assert calls(stub) == []
+    assert len(adapter.list_executions("inc-1")) == 1
+
+
+def test_replay_survives_a_new_adapter(make_adapter, stub):
+    first = make_adapter().execute(**request("user-1", "remove_role", role_ref="r1"))
+    stub.reset()
+
+    assert make_adapter().execute(**request("user-1", "remove_role", role_ref="r1")) == first
+    assert calls(stub) == []
+
+
+def test_different_parameters_are_a_different_execution(adapter, stub):
+    first = adapter.execute(**request("user-1", "remove_role", role_ref="r1"))
+    second = adapter.execute(**request("user-1", "remove_role", role_ref="r2"))
+    assert first["execution_id"] != second["execution_id"]
+
+
+def test_failed_execution_runs_again(adapter, stub):
+    stub.outage(500, count=1)
+    failed = adapter.execute(**request("user-1", "revoke_sessions"))
+    assert failed["status"] == "failed"
+
+    retried = adapter.execute(**request("user-1", "revoke_sessions"))
+    assert retried["status"] == "success"
+    assert retried["execution_id"] != failed["execution_id"]
+    assert len(calls(stub, "/ws/rest/rpc/invalidateSessions")) == 2
+
+
+def test_concurrent_duplicates_change_midpoint_once(make_adapter):
+    with MidPointStub(latency=0.05) as slow:
+        adapter = make_adapter(base_url=slow.base_url, max_concurrency=16)
+        workers = 8
+        start = threading.Barrier(workers)
+        results = [None] * workers
+
+        def worker(n):
+            start.wait()
+            results[n] = adapter.execute(**request("user-1", "revoke_sessions"))
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert all(result == results[0] for result in results)
+        assert len(calls(slow, "/ws/rest/rpc/invalidateSessions")) == 1
+        assert len(adapter.list_executions("inc-1")) == 1
+
+
+def test_idempotency_key_ignores_parameter_order(mod):
+    a = mod.idempotency_key("inc-1", "remove_role", "user-1", {"role_ref": "r1", "reason": "x"})
+    b = mod.idempotency_key("inc-1", "remove_role", "user-1", {"reason": "x", "role_ref": "r1"})
+    assert a == b
+    assert a != mod.idempotency_key("inc-2", "remove_role", "user-1", {"role_ref": "r1", "reason": "x"})
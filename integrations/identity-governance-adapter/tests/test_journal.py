@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import threading
+
+from conftest import request
+
+
+def _entry(n, status="success", incident_id="inc-1", key=None):
+    return {
+        "incident_id": incident_id,
+        "action_id": "disable_identity",
+        "identity_ref": f"user-{n}",
+        "parameters": {},
+        "result": {"execution_id": f"exec-{n}", "status": status, "reversible": False, "revert_hint": {}},
+        "idempotency_key": key or f"key-{n}",
+    }
+
+
+def _append_from_process(mod, path, writer, count):
+    journal = mod.ExecutionJournal(path)
+    for n in range(count):
+        journal.append(_entry(f"{writer}-{n}", incident_id=f"inc-{writer}"))
+    journal.close()
+
+
+def test_lookups_by_execution_incident_and_key(mod, tmp_path):
+    path = str(tmp_path / "executions.jsonl")
+    with mod.ExecutionJournal(path) as journal:
+        journal.append(_entry(1))
+        journal.append_many([_entry(2, incident_id="inc-2"), _entry(3)])
+
+        assert journal.get("exec-2")["incident_id"] == "inc-2"
+        assert journal.get("exec-9") is None
+        assert [e["result"]["execution_id"] for e in journal.by_incident("inc-1")] == ["exec-1", "exec-3"]
+        assert journal.by_idempotency_key("key-3")["result"]["execution_id"] == "exec-3"
+        assert len(journal) == 3
+
+    with mod.ExecutionJournal(path) as reopened:  # the index is rebuilt from the file
+        assert reopened.get("exec-1") == _entry(1)
+        assert sorted(reopened.incident_ids()) == ["inc-1", "inc-2"]
+
+
+def test_idempotency_index_keeps_success_and_unknown_only(mod, tmp_path):
+    with mod.ExecutionJournal(str(tmp_path / "executions.jsonl")) as journal:
+        journal.append_many(
+            [_entry("a", "failed", key="k-failed"), _entry("b", "unknown", key="k-unknown"), _entry("c", key="k-ok")]
+        )
+        assert journal.by_idempotency_key("k-failed") is None
+        assert journal.by_idempotency_key("k-unknown")["result"]["status"] == "unknown"
+        assert journal.by_idempotency_key("k-ok")["result"]["status"] == "success"
+
+        journal.append(_entry("d", key="k-failed"))
+        assert journal.by_idempotency_key("k-failed")["result"]["execution_id"] == "exec-d"
+
+
+def test_successful_revert_frees_the_reverted_key(mod, tmp_path):
+    with mod.ExecutionJournal(str(tmp_path / "executions.jsonl")) as journal:
+        journal.append(_entry(1, key="k-1"))
+        journal.append({**_entry("revert", key="k-revert"), "reverted_idempotency_key": "k-1"})
+        assert journal.by_idempotency_key("k-1") is None
+
+
+def test_sees_appends_from_another_journal_on_the_same_file(mod, tmp_path):
+    path = str(tmp_path / "executions.jsonl")
+    with mod.ExecutionJournal(path) as reader, mod.ExecutionJournal(path) as writer:
+        assert reader.get("exec-1") is None
+        writer.append(_entry(1))
+        assert reader.get("exec-1") == _entry(1)
+
+
+def test_concurrent_appends_lose_nothing(mod, tmp_path):
+    path = str(tmp_path / "executions.jsonl")
+    thread_count, process_count, per_writer = 4, 3, 25
+    journal = mod.ExecutionJournal(path)
+
+    def append(n):
+        for i in range(per_writer):
+            journal.append(_entry(f"t{n}-{i}"))
+
+    workers = [threading.Thread(target=append, args=(n,)) for n in range(thread_count)] + [
+        multiprocessing.Process(target=_append_from_process, args=(mod, path, n, per_writer))
+        for n in range(process_count)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    journal.close()
+
+    with open(path, "rb") as f:
+        lines = [json.loads(line) for line in f]
+    assert len(lines) == (thread_count + process_count) * per_writer
+    with mod.ExecutionJournal(path) as reopened:
+        assert len({e["result"]["execution_id"] for e in reopened}) == len(lines)
+
+
+def test_legacy_json_is_migrated_once(make_adapter, tmp_path):
+    legacy = tmp_path / "executions.json"
+    legacy.write_text(json.dumps({"inc-1": [_entry(1)], "inc-2": [_entry(2, incident_id="inc-2")]}))
+
+    adapter = make_adapter(storage_path=str(legacy))
+    assert adapter.get_execution("exec-1") == _entry(1)
+    assert [e["identity_ref"] for e in adapter.list_executions("inc-2")] == ["user-2"]
+    assert not legacy.exists() and os.path.exists(f"{legacy}.migrated")
+
+    assert len(make_adapter(storage_path=str(legacy)).journal()) == 2
+
+
+def test_adapter_records_every_execution(adapter):
+    adapter.execute(**request("user-1"))
+    list(adapter.execute_many([request("user-2"), request("user-3", "revoke_sessions")]))
+
+    recorded = adapter.list_executions("inc-1")
+    assert recorded[0]["identity_ref"] == "user-1"
+    assert sorted(e["identity_ref"] for e in recorded[1:]) == ["user-2", "user-3"]  # batch: completion order
+    for entry in recorded:
+        assert entry["idempotency_key"] and entry["executed_at"]
+        assert adapter.get_execution(entry["result"]["execution_id"]) == entry
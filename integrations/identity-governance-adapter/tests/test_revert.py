@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import pytest
+
+from conftest import calls, request
+
+
+def _status(stub, identity_ref):
+    return stub.users()[identity_ref]["activation"]["administrativeStatus"]
+
+
+def _roles(stub, identity_ref):
+    return [assignment["targetRef"]["oid"] for assignment in stub.users()[identity_ref]["assignment"]]
+
+
+def test_revert_disable_enables_again(adapter, stub):
+    executed = adapter.execute(**request("user-1"))
+    assert executed["reversible"] and executed["revert_hint"] == {"administrative_status": "enabled"}
+    assert _status(stub, "user-1") == "disabled"
+
+    reverted = adapter.revert_execution(executed["execution_id"])
+    assert reverted["status"] == "success"
+    assert reverted["reverted_execution_id"] == executed["execution_id"]
+    assert _status(stub, "user-1") == "enabled"
+
+
+def test_revert_keeps_a_user_disabled_before_the_action(adapter, stub):
+    adapter._request("/ws/rest/users/user-1", method="POST", body={"operation": "disable"})
+    executed = adapter.execute(**request("user-1"))
+    assert executed["revert_hint"] == {"administrative_status": "disabled"}
+
+    assert adapter.revert_execution(executed["execution_id"])["status"] == "success"
+    assert _status(stub, "user-1") == "disabled"
+
+
+def test_revert_remove_role_assigns_it_again(adapter, stub):
+    executed = adapter.execute(**request("user-1", "remove_role", role_ref="r1"))
+    assert _roles(stub, "user-1") == []
+
+    adapter.revert_execution(executed["execution_id"])
+    assert _roles(stub, "user-1") == ["r1"]
+
+
+def test_revert_again_is_answered_from_the_journal(adapter, stub):
+    executed = adapter.execute(**request("user-1"))
+    reverted = adapter.revert_execution(executed["execution_id"])
+    stub.reset()
+
+    assert adapter.revert_execution(executed["execution_id"]) == reverted
+    assert [item["result"] for item in adapter.revert_many([executed["execution_id"]])] == [reverted]
+    assert calls(stub) == []
+
+
+def test_reverted_request_executes_again(adapter, stub):
+    executed = adapter.execute(**request("user-1"))
+    adapter.revert_execution(executed["execution_id"])
+
+    again = adapter.execute(**request("user-1"))
+    assert again["status"] == "success"
+    assert again["execution_id"] != executed["execution_id"]
+    assert _status(stub, "user-1") == "disabled"
+
+
+def test_revoke_sessions_without_hook_is_not_reversible(adapter):
+    executed = adapter.execute(**request("user-1", "revoke_sessions"))
+    assert executed["status"] == "success"
+    assert not executed["reversible"] and executed["revert_hint"] == {}
+
+    with pytest.raises(ValueError):
+        adapter.revert_execution(executed["execution_id"])
+
+
+def test_revoke_sessions_with_hook_is_reversible(adapter):
+    executed = adapter.execute(**request("user-1", "revoke_sessions", midpoint_revert_path="/ws/rest/rpc/restore"))
+    assert executed["reversible"]
+    assert executed["revert_hint"] == {"revert_path": "/ws/rest/rpc/restore"}
+
+
+def test_revert_rejects_unknown_and_failed_executions(adapter, stub):
+    with pytest.raises(ValueError):
+        adapter.revert_execution("no-such-execution")
+
+    stub.outage(500, count=1)
+    failed = adapter.execute(**request("user-1", "revoke_sessions"))
+    assert failed["status"] == "failed"
+    with pytest.raises(ValueError):
+        adapter.revert_execution(failed["execution_id"])
+
+
+def test_revert_many_restores_every_identity(adapter, stub):
+    identities = [f"user-{i}" for i in range(6)]
+    executed = [
+        item["result"]
+        for item in sorted(
+            adapter.execute_many(
+                [request(identity) for identity in identities]
+                + [request(identity, "remove_role", role_ref="r1") for identity in identities]
+            ),
+            key=lambda item: item["index"],
+        )
+    ]
+
+    reverted = list(adapter.revert_many([result["execution_id"] for result in executed]))
+    assert all(item["result"]["status"] == "success" for item in reverted)
+    for identity in identities:
+        assert _status(stub, identity) == "enabled"
+        assert _roles(stub, identity) == ["r1"]
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import time
+import urllib.error
+
+import pytest
+
+from conftest import calls, request
+
+USER_PATH = "/ws/rest/users/user-1"
+REVOKE_PATH = "/ws/rest/rpc/invalidateSessions"
+
+
+def test_reads_are_retried_through_an_outage(adapter, stub):
+    stub.outage(503, count=2)
+    assert adapter._request(USER_PATH, method="GET")["user"]["oid"] == "user-1"
+    assert len(calls(stub, USER_PATH)) == 3
+    assert adapter.metrics()["retries"] == 2
+
+
+def test_changes_are_not_repeated_after_a_server_error(adapter, stub):
+    stub.outage(500, count=1)
+    assert adapter.execute(**request("user-1", "revoke_sessions"))["status"] == "failed"
+    assert len(calls(stub, REVOKE_PATH)) == 1
+
+
+def test_changes_are_repeated_when_throttled_with_retry_after(adapter, stub):
+    stub.outage(429, count=1, retry_after=0)
+    assert adapter.execute(**request("user-1", "revoke_sessions"))["status"] == "success"
+    assert len(calls(stub, REVOKE_PATH)) == 2
+    assert adapter.metrics()["retry_after_waits"] == 1
+
+
+def test_retry_after_beyond_backoff_max_fails_at_once(adapter, stub):
+    stub.outage(429, count=5, retry_after=60)
+    with pytest.raises(urllib.error.HTTPError):
+        adapter._request(USER_PATH, method="GET")
+    assert len(calls(stub, USER_PATH)) == 1
+
+
+def test_breaker_opens_and_recovers_after_a_probe(make_adapter, stub):
+    adapter = make_adapter(breaker_threshold=2, breaker_reset_seconds=0.2)
+    stub.outage(500, seconds=60)
+    for _ in range(2):
+        assert adapter.execute(**request("user-1", "revoke_sessions"))["status"] == "failed"
+    assert adapter.metrics()["breaker"]["state"] == "open"
+
+    assert adapter.execute(**request("user-1", "revoke_sessions"))["status"] == "failed"
+    assert len(calls(stub, REVOKE_PATH)) == 2  # rejected without a call
+    assert adapter.metrics()["breaker"]["rejected"] == 1
+
+    stub.reset()  # midPoint is back
+    time.sleep(0.25)
+    assert adapter.execute(**request("user-1", "revoke_sessions"))["status"] == "success"
+    breaker = adapter.metrics()["breaker"]
+    assert breaker["state"] == "closed" and breaker["probes"] == 1
+
+
+def test_no_attempt_past_the_deadline(make_adapter, stub):
+    adapter = make_adapter(deadline_seconds=0)
+    assert adapter.execute(**request("user-1", "revoke_sessions"))["status"] == "failed"
+    assert calls(stub) == []
+    assert adapter.metrics()["deadline_exceeded"] == 1
@@ -0,0 +1,140 @@
+"""Verification of containment actions against midPoint state.
+
+A successful execution only means midPoint accepted the change; it reaches the
+target systems (e.g. Entra ID) when midPoint recomputes and provisions. The
+verification stage polls the users of many executions and moves each one to
+`verified` once its effect is observable, or to `failed` when it is not
+observed in time:
+
+- `disable_identity`: the user's `activation.effectiveStatus` is `disabled`.
+- `remove_role`: the role is gone from the user's `roleMembershipRef`
+  (falling back to `assignment` when midPoint does not return memberships).
+- `revoke_sessions`: midPoint exposes no session state, so the execution's
+  success is taken as its effect; it is verified without a time-to-effect.
+
+Polling is batched (one user search for many executions), rate-limited
+(`RateLimiter`) and paced by `AdaptiveInterval`: rounds that verify something
+shorten the interval, idle rounds lengthen it. Time-to-effect (from the
+execution's `executed_at` to the first poll that observed the effect) goes
+into a `LatencyHistogram`.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Upper bounds of the time-to-effect buckets, in seconds (the last bucket is unbounded).
+DEFAULT_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+ACTIONS = frozenset({"revoke_sessions", "disable_identity", "remove_role"})
+# Actions with an observable effect; the others are verified by their execution's success.
+VERIFIABLE = frozenset({"disable_identity", "remove_role"})
+
+
+def effect_observed(action_id: str, parameters: Dict[str, Any], user: Optional[Dict[str, Any]]) -> bool:
+    """Whether `user` (as returned by midPoint) shows the effect of `action_id`."""
+    if user is None:
+        return False
+    if action_id == "disable_identity":
+        activation = user.get("activation") if isinstance(user.get("activation"), dict) else {}
+        status = activation.get("effectiveStatus") or activation.get("administrativeStatus")
+        return str(status).lower() == "disabled"
+    if action_id == "remove_role":
+        role_ref = parameters.get("role_ref")
+        refs = user.get("roleMembershipRef")
+        if refs is None:
+            refs = [a.get("targetRef") for a in _as_list(user.get("assignment")) if isinstance(a, dict)]
+        return all(not (isinstance(ref, dict) and ref.get("oid") == role_ref) for ref in _as_list(refs))
+    raise ValueError(f"unsupported action_id: {action_id}")
+
+
+class LatencyHistogram:
+    """Cumulative latency histogram (Prometheus-style buckets), thread-safe."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self._sum += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        """`{"buckets": {"<le>": cumulative count, ..., "+Inf": count}, "count", "sum"}` (seconds)."""
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        cumulative, running = {}, 0
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], counts):
+            running += count
+            cumulative[bound] = running
+        return {"buckets": cumulative, "count": running, "sum": total}
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the `q` quantile (None when empty or unbounded)."""
+        with self._lock:
+            counts = list(self._counts)
+        target = q * sum(counts)
+        running = 0
+        for index, count in enumerate(counts):
+            running += count
+            if count and running >= target:
+                return self.buckets[index] if index < len(self.buckets) else None
+        return None
+
+
+class RateLimiter:
+    """Token bucket: at most `rate` acquisitions per second, bursts of up to `burst`."""
+
+    def __init__(
+        self,
+        rate: float,
+        *,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            self._sleep(wait)
+
+
+class AdaptiveInterval:
+    """Poll interval that halves after a round with progress and doubles after an idle one."""
+
+    def __init__(self, initial: float, maximum: float, *, minimum: Optional[float] = None) -> None:
+        self.minimum = initial if minimum is None else minimum
+        self.maximum = max(maximum, self.minimum)
+        self.current = min(max(initial, self.minimum), self.maximum)
+
+    def next(self, progressed: bool) -> float:
+        factor = 0.5 if progressed else 2.0
+        self.current = min(self.maximum, max(self.minimum, self.current * factor))
+        return self.current
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
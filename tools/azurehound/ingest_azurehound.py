@@ -0,0 +1,511 @@
+"""Stream AzureHound collector output into BloodHound CE through the file-upload API.
+
+Replaces the manual drag-and-drop import for large tenants:
+- parses each AzureHound JSON file as a stream (the `data` array is read item
+  by item; the file is never loaded whole);
+- re-packs items into bounded chunks (object count and byte size), each a
+  valid AzureHound JSON document;
+- uploads chunks in parallel into one BloodHound upload job;
+- records completed chunks in a state file and resumes from it after a failure;
+- reports throughput (objects/sec, MB/sec) and peak memory.
+
+Usage:
+  python ingest_azurehound.py C:\\temp\\azurehound-output \\
+      --bloodhound-url http://localhost:8080 --username admin [--workers 4]
+
+The password is read from BLOODHOUND_PASSWORD or prompted for; it is never stored.
+Standard library only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import codecs
+import getpass
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+
+DEFAULT_CHUNK_OBJECTS = 5_000
+DEFAULT_CHUNK_BYTES = 16 * 1024 * 1024
+_READ_SIZE = 1024 * 1024
+
+
+class IngestError(RuntimeError):
+    pass
+
+
+# --- streaming parse ---
+
+
+class _ByteCounter:
+    def __init__(self, raw: BinaryIO) -> None:
+        self.raw = raw
+        self.bytes_read = 0
+
+    def read(self, size: int) -> bytes:
+        data = self.raw.read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def iter_collector_items(stream: BinaryIO, *, array_key: str = "data") -> Iterator[Dict[str, Any]]:
+    """Yield the items of the top-level `array_key` array of a JSON document.
+
+    Only the current item (plus one read buffer) is held in memory.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = stream.read(_READ_SIZE)
+        if not chunk:
+            eof = True
+            buffer = buffer[pos:] + text_decoder.decode(b"", final=True)
+        else:
+            buffer = buffer[pos:] + text_decoder.decode(chunk)
+        pos = 0
+        return True
+
+    # Locate `"<array_key>": [` at depth 1, skipping over strings and nested values.
+    depth = 0
+    in_string = False
+    escaped = False
+    text: List[str] = []
+    last_string: Optional[str] = None
+    expecting_array = False
+    while True:
+        if pos >= len(buffer):
+            if not fill():
+                return
+            continue
+        ch = buffer[pos]
+        pos += 1
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+                if depth == 1:
+                    last_string = "".join(text)
+                continue
+            if depth == 1:
+                text.append(ch)
+            continue
+        if ch == '"':
+            in_string = True
+            text = []
+        elif ch == ":" and depth == 1:
+            expecting_array = last_string == array_key
+        elif ch == "[" and depth == 1 and expecting_array:
+            break
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+        elif ch == "," and depth == 1:
+            expecting_array = False
+
+    # Decode array items one at a time.
+    while True:
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer) or not fill():
+                break
+        if pos >= len(buffer):
+            raise IngestError(f"unterminated '{array_key}' array")
+        if buffer[pos] == "]":
+            return
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+                break
+            except json.JSONDecodeError:
+                if not fill():
+                    raise
+        pos = end
+        if isinstance(item, dict):
+            yield item
+
+
+@dataclass
+class Chunk:
+    index: int
+    body: bytes
+    objects: int
+
+
+def iter_chunks(
+    paths: List[str],
+    *,
+    chunk_objects: int = DEFAULT_CHUNK_OBJECTS,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    meta_type: str = "azure",
+    progress: Optional["Progress"] = None,
+) -> Iterator[Chunk]:
+    """Re-pack collector items into AzureHound JSON documents of bounded size.
+
+    Chunk boundaries depend only on the inputs and limits, so a resumed run
+    produces the same chunk indices.
+    """
+    index = 0
+    items: List[bytes] = []
+    size = 0
+
+    def flush() -> Chunk:
+        nonlocal index, items, size
+        meta = json.dumps({"type": meta_type, "version": 5, "count": len(items), "methods": 0})
+        body = b'{"meta": ' + meta.encode("utf-8") + b', "data": [' + b",".join(items) + b"]}"
+        chunk = Chunk(index=index, body=body, objects=len(items))
+        index += 1
+        items, size = [], 0
+        return chunk
+
+    for path in paths:
+        with open(path, "rb") as raw:
+            counter = _ByteCounter(raw)
+            for item in iter_collector_items(counter):
+                encoded = json.dumps(item, separators=(",", ":")).encode("utf-8")
+                if items and (len(items) >= chunk_objects or size + len(encoded) > chunk_bytes):
+                    yield flush()
+                items.append(encoded)
+                size += len(encoded) + 1
+                if progress is not None:
+                    progress.parsed_bytes = progress.base_bytes + counter.bytes_read
+            if progress is not None:
+                progress.base_bytes += counter.bytes_read
+    if items:
+        yield flush()
+
+
+# --- BloodHound upload API ---
+
+
+def _load_transport():
+    """The access-graph adapter's transport, imported from the adapter loaded as the `access_graph_adapter` package."""
+    if "access_graph_adapter" not in sys.modules:
+        repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+        directory = os.path.join(repo_root, "integrations", "access-graph-adapter")
+        spec = importlib.util.spec_from_file_location(
+            "access_graph_adapter", os.path.join(directory, "__init__.py"), submodule_search_locations=[directory]
+        )
+        if spec is None or spec.loader is None:
+            raise RuntimeError(f"failed to load package: {directory}")
+        package = importlib.util.module_from_spec(spec)
+        sys.modules["access_graph_adapter"] = package
+        spec.loader.exec_module(package)
+    return importlib.import_module("access_graph_adapter.transport")
+
+
+class BloodHoundUploader:
+    """Minimal client for `/api/v2/file-upload/*` (start, upload file, end)."""
+
+    def __init__(self, base_url: str, username: str, password: str, *, pool_size: int, timeout: float) -> None:
+        transport_mod = _load_transport()
+        self._transport_error = transport_mod.TransportError
+        self.transport = transport_mod.KeepAliveTransport(base_url, pool_size=pool_size, timeout=timeout)
+        self.username = username
+        self.password = password
+        self.session_token: Optional[str] = None
+
+    def login(self) -> None:
+        body = {"login_method": "secret", "username": self.username, "secret": self.password}
+        data = self._call("POST", "/api/v2/login", json.dumps(body).encode("utf-8"))
+        self.session_token = data["data"]["session_token"]
+
+    def start_job(self) -> int:
+        data = self._call("POST", "/api/v2/file-upload/start", None)
+        return int(data["data"]["id"])
+
+    def upload(self, job_id: int, body: bytes) -> None:
+        self._call("POST", f"/api/v2/file-upload/{job_id}", body)
+
+    def end_job(self, job_id: int) -> None:
+        self._call("POST", f"/api/v2/file-upload/{job_id}/end", None)
+
+    def close(self) -> None:
+        self.transport.close()
+
+    def _call(self, method: str, path: str, body: Optional[bytes]) -> Dict[str, Any]:
+        headers = {"Content-Type": "application/json"}
+        if self.session_token:
+            headers["Authorization"] = f"Bearer {self.session_token}"
+        try:
+            resp = self.transport.request(method, path, body=body, headers=headers)
+        except self._transport_error as exc:
+            raise UploadError(f"BloodHound API unreachable for {path}: {exc}", None) from exc
+        if resp.status >= 400:
+            raise UploadError(f"BloodHound API error {resp.status} for {path}: {resp.reason}", resp.status)
+        return json.loads(resp.body.decode("utf-8")) if resp.body else {}
+
+
+class UploadError(IngestError):
+    def __init__(self, message: str, status: Optional[int]) -> None:
+        super().__init__(message)
+        self.status = status
+
+    @property
+    def retryable(self) -> bool:
+        return self.status is None or self.status == 429 or self.status >= 500
+
+
+# --- resumable state ---
+
+
+def _source_signature(paths: List[str], chunk_objects: int, chunk_bytes: int) -> str:
+    digest = hashlib.sha256(f"{chunk_objects}:{chunk_bytes}".encode("utf-8"))
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f"{os.path.abspath(path)}:{stat.st_size}:{int(stat.st_mtime)}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class IngestState:
+    """Completed-chunk ledger persisted after every chunk (atomic replace)."""
+
+    def __init__(self, path: str, signature: str) -> None:
+        self.path = path
+        self.signature = signature
+        self.job_id: Optional[int] = None
+        self.completed: Set[int] = set()
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved.get("signature") == signature:
+                self.job_id = saved.get("job_id")
+                self.completed = set(saved.get("completed") or [])
+
+    def set_job(self, job_id: int) -> None:
+        # Chunks recorded so far landed in the previous job, not in this one.
+        with self._lock:
+            self.job_id = job_id
+            self.completed = set()
+            self._save()
+
+    def mark_done(self, index: int, job_id: int) -> bool:
+        """Record a chunk uploaded into `job_id`; ignored (False) once the job was replaced."""
+        with self._lock:
+            if job_id != self.job_id:
+                return False
+            self.completed.add(index)
+            self._save()
+            return True
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _save(self) -> None:
+        payload = {"signature": self.signature, "job_id": self.job_id, "completed": sorted(self.completed)}
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, self.path)
+
+
+# --- pipeline ---
+
+
+@dataclass
+class Progress:
+    started: float = field(default_factory=time.perf_counter)
+    base_bytes: int = 0
+    parsed_bytes: int = 0
+    objects: int = 0
+    uploaded_bytes: int = 0
+    chunks_uploaded: int = 0
+    chunks_skipped: int = 0
+    job_restarts: int = 0
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "objects": self.objects,
+            "input_mb": round(self.parsed_bytes / 1e6, 3),
+            "uploaded_mb": round(self.uploaded_bytes / 1e6, 3),
+            "chunks_uploaded": self.chunks_uploaded,
+            "chunks_skipped": self.chunks_skipped,
+            "job_restarts": self.job_restarts,
+            "objects_per_sec": round(self.objects / elapsed, 1),
+            "mb_per_sec": round(self.parsed_bytes / 1e6 / elapsed, 3),
+            "peak_rss_mb": _peak_rss_mb(),
+        }
+
+
+def ingest(
+    paths: List[str],
+    uploader: BloodHoundUploader,
+    *,
+    state_path: str,
+    workers: int = 4,
+    chunk_objects: int = DEFAULT_CHUNK_OBJECTS,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    max_attempts: int = 3,
+) -> Dict[str, Any]:
+    """Upload all collector files; returns the throughput summary.
+
+    At most `2 * workers` chunks are buffered, bounding memory to roughly
+    `2 * workers * chunk_bytes` regardless of input size. When BloodHound no
+    longer knows the upload job (404) or it is no longer accepting files (409),
+    a fresh job is started and the inputs are streamed again from the first
+    chunk, since the chunks sent so far went into the old job.
+    """
+    files = _expand_inputs(paths)
+    if not files:
+        raise IngestError("no AzureHound JSON files found")
+    state = IngestState(state_path, _source_signature(files, chunk_objects, chunk_bytes))
+    progress = Progress()
+
+    uploader.login()
+    if state.job_id is None:
+        state.set_job(uploader.start_job())
+    job_lock = threading.Lock()
+
+    def upload(chunk: Chunk) -> Tuple[Chunk, int]:
+        for attempt in range(1, max_attempts + 1):
+            job_id = state.job_id
+            try:
+                uploader.upload(job_id, chunk.body)
+                return chunk, job_id
+            except UploadError as exc:
+                if attempt >= max_attempts:
+                    raise
+                if exc.status == 401:
+                    with job_lock:
+                        uploader.login()
+                elif exc.status in (404, 409):
+                    # The saved job is gone or closed server-side (e.g. resumed
+                    # after it timed out): continue in a fresh job. A 400 is a
+                    # rejected chunk and fails the run below.
+                    with job_lock:
+                        if state.job_id == job_id:
+                            state.set_job(uploader.start_job())
+                            progress.job_restarts += 1
+                elif exc.retryable:
+                    time.sleep(min(2**attempt, 10))
+                else:
+                    raise
+        raise IngestError(f"chunk {chunk.index} was not uploaded")
+
+    in_flight: Set[Future] = set()
+    failure: Optional[BaseException] = None
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest") as pool:
+
+        def drain(block_until: int) -> None:
+            nonlocal in_flight, failure
+            while len(in_flight) > block_until:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is not None:
+                        failure = failure or future.exception()
+                        continue
+                    chunk, job_id = future.result()
+                    progress.uploaded_bytes += len(chunk.body)
+                    if state.mark_done(chunk.index, job_id):
+                        progress.chunks_uploaded += 1
+
+        while True:
+            pass_job = state.job_id
+            progress.objects = progress.base_bytes = progress.parsed_bytes = progress.chunks_skipped = 0
+            chunks = iter_chunks(files, chunk_objects=chunk_objects, chunk_bytes=chunk_bytes, progress=progress)
+            for chunk in chunks:
+                progress.objects += chunk.objects
+                if chunk.index in state.completed:
+                    progress.chunks_skipped += 1
+                    continue
+                drain(2 * workers - 1)
+                if failure is not None:
+                    break
+                in_flight.add(pool.submit(upload, chunk))
+            # Record every chunk that did land before reporting a failure, so a
+            # resumed run only re-sends what is actually missing.
+            drain(0)
+            if failure is not None or state.job_id == pass_job:
+                break
+    if failure is not None:
+        raise failure
+
+    uploader.end_job(state.job_id)
+    state.clear()
+    return progress.summary()
+
+
+def _expand_inputs(paths: List[str]) -> List[str]:
+    files: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path)) if name.lower().endswith(".json")
+            )
+        else:
+            files.append(path)
+    return files
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stream AzureHound output into BloodHound CE")
+    parser.add_argument("inputs", nargs="+", help="AzureHound JSON files or output directories")
+    parser.add_argument("--bloodhound-url", default=os.environ.get("BLOODHOUND_URL", "http://localhost:8080"))
+    parser.add_argument("--username", default=os.environ.get("BLOODHOUND_USERNAME", "admin"))
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-objects", type=int, default=DEFAULT_CHUNK_OBJECTS)
+    parser.add_argument("--chunk-mb", type=float, default=DEFAULT_CHUNK_BYTES / (1024 * 1024))
+    parser.add_argument("--timeout", type=float, default=300.0, help="per-request deadline (seconds)")
+    parser.add_argument("--state", help="resume state file (default: <first input>.ingest-state.json)")
+    args = parser.parse_args(argv)
+
+    password = os.environ.get("BLOODHOUND_PASSWORD") or getpass.getpass("BloodHound password: ")
+    state_path = args.state or f"{os.path.abspath(args.inputs[0]).rstrip(os.sep)}.ingest-state.json"
+    uploader = BloodHoundUploader(
+        args.bloodhound_url, args.username, password, pool_size=args.workers, timeout=args.timeout
+    )
+    try:
+        summary = ingest(
+            args.inputs,
+            uploader,
+            state_path=state_path,
+            workers=args.workers,
+            chunk_objects=args.chunk_objects,
+            chunk_bytes=int(args.chunk_mb * 1024 * 1024),
+        )
+    except IngestError as exc:
+        print(f"ingestion stopped: {exc}", file=sys.stderr)
+        print(f"re-run the same command to resume (state: {state_path})", file=sys.stderr)
+        return 1
+    finally:
+        uploader.close()
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())